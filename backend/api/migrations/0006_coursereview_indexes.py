@@ -0,0 +1,21 @@
+# Generated by Django for api
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_alter_assessment_category_alter_assessment_mode'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursereview',
+            index=models.Index(fields=['course', 'created_at', 'id'], name='api_review_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursereview',
+            index=models.Index(fields=['course', 'review', 'id'], name='api_review_rating_idx'),
+        ),
+    ]
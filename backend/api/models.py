@@ -88,6 +88,11 @@ class CourseReview(models.Model):
 
     class Meta:
         unique_together = [("user", "course")]
+        # Keyset pagination of a course's reviews, in either direction
+        indexes = [
+            models.Index(fields=["course", "created_at", "id"], name="api_review_created_idx"),
+            models.Index(fields=["course", "review", "id"], name="api_review_rating_idx"),
+        ]
 
 
 class CoursePrerequisite(models.Model):
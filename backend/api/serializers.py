@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.rows import RowMapper
 from .models import Course, Profile, Program, PlannedCourse, CourseReview
 
 class CourseSerializer(serializers.ModelSerializer):
@@ -8,6 +10,21 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class CourseListQuerySerializer(serializers.Serializer):
+    study_area = serializers.ChoiceField(choices=Course.StudyArea.choices, required=False)
+    level = serializers.IntegerField(min_value=0, required=False)
+    credits = serializers.IntegerField(min_value=0, required=False)
+    assessment_type = serializers.ChoiceField(choices=Course.AssessmentType.choices, required=False)
+    offered_sem_1 = serializers.BooleanField(required=False, default=None, allow_null=True)
+    offered_sem_2 = serializers.BooleanField(required=False, default=None, allow_null=True)
+    offered_summer = serializers.BooleanField(required=False, default=None, allow_null=True)
+    code_prefix = serializers.CharField(max_length=32, required=False, trim_whitespace=True)
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = Profile
@@ -76,3 +93,27 @@ class CourseReviewSerializer(serializers.ModelSerializer):
         model = CourseReview
         fields = ["id", "review", "description", "created_at", "user"]
         read_only_fields = ["user", "created_at"]
+
+
+class CourseReviewQuerySerializer(serializers.Serializer):
+    # Keyset orderings, each ending in ``id`` and backed by a CourseReview index
+    SORTS = {
+        "newest": ["-created_at", "-id"],
+        "highest": ["-review", "-id"],
+        "lowest": ["review", "id"],
+    }
+
+    sort = serializers.ChoiceField(choices=list(SORTS), default="newest")
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
+
+
+# Fast paths for bulk reads. A planned course row carries its course id;
+# views nest the course row themselves.
+COURSE_ROWS = RowMapper(Course)
+PLANNED_COURSE_ROWS = RowMapper(PlannedCourse, ["id", "course", "semester"])
+REVIEW_ROWS = RowMapper(
+    CourseReview, ["id", "review", "description", "created_at"], extra={"user": "user__username"}
+)
@@ -4,8 +4,13 @@ from rest_framework import status, permissions
 from django.contrib.auth import authenticate
 from django.db import models
 from rest_framework_simplejwt.tokens import RefreshToken
+from backend.pagination import encode_cursor, paginate_keyset
+from coursessvc.filters import filter_courses
 from .models import Course, Program, PlannedCourse, CourseReview
-from .serializers import CourseSerializer, RegisterSerializer, ProfileSerializer, ProgramSerializer, PlannedCourseSerializer, CourseReviewSerializer
+from .serializers import COURSE_ROWS, PLANNED_COURSE_ROWS, REVIEW_ROWS, CourseSerializer, RegisterSerializer, ProfileSerializer, ProgramSerializer, PlannedCourseSerializer, CourseReviewSerializer, CourseReviewQuerySerializer, CourseListQuerySerializer
+
+# Newest reviews embedded in CourseDetail; the rest are paged through CourseReviews
+DETAIL_REVIEW_LIMIT = 10
 
 class HealthCheck(APIView):
     permission_classes = [permissions.AllowAny]
@@ -16,15 +21,16 @@ class HealthCheck(APIView):
 class CourseDetail(APIView):
     def get(self, request, course_id):
         try:
-            course = Course.objects.select_related().prefetch_related(
-                'assessments', 'reviews__user'
-            ).get(id=course_id)
-            
-            # Calculate average rating
-            reviews = course.reviews.all()
-            average_rating = reviews.aggregate(
-                avg_rating=models.Avg('review')
-            )['avg_rating'] or 0
+            course = Course.objects.select_related().prefetch_related('assessments').get(id=course_id)
+
+            # Aggregate stats over every review, but only the newest embedded
+            stats = course.reviews.aggregate(
+                avg_rating=models.Avg('review'), total=models.Count('id')
+            )
+            average_rating = stats['avg_rating'] or 0
+            reviews = list(
+                course.reviews.select_related('user').order_by('-created_at', '-id')[:DETAIL_REVIEW_LIMIT + 1]
+            )
             
             # Get prerequisites
             prerequisites = course.prerequisites.values_list('code', flat=True)
@@ -52,10 +58,13 @@ class CourseDetail(APIView):
                     'created_at': review.created_at.isoformat(),
                     'user': {'username': review.user.username}
                 }
-                for review in reviews
+                for review in reviews[:DETAIL_REVIEW_LIMIT]
             ]
+            # Same cursor as CourseReviews' "newest" sort after the last embedded review
+            last = reviews[DETAIL_REVIEW_LIMIT - 1] if len(reviews) > DETAIL_REVIEW_LIMIT else None
+            course_data['reviews_next_cursor'] = encode_cursor([last.created_at, last.id]) if last else None
             course_data['average_rating'] = round(average_rating, 1)
-            course_data['total_reviews'] = reviews.count()
+            course_data['total_reviews'] = stats['total']
             course_data['prerequisites'] = list(prerequisites)
             
             return Response(course_data)
@@ -67,9 +76,21 @@ class CourseDetail(APIView):
 
 class CourseList(APIView):
     def get(self, request):
-        queryset = Course.objects.all().order_by("code")
-        data = CourseSerializer(queryset, many=True).data
-        return Response(data)
+        query = CourseListQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+
+        queryset = filter_courses(Course.objects.all(), params)
+        try:
+            ids, next_cursor = paginate_keyset(
+                queryset.values("id", "code"), ["code"], params.get("cursor"), params["limit"]
+            )
+        except ValueError:
+            return Response({"cursor": ["Invalid cursor."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        page = Course.objects.filter(id__in=[row["id"] for row in ids]).order_by("code")
+        return Response({"results": COURSE_ROWS.rows(page), "next_cursor": next_cursor})
 
 class AssessmentTypes(APIView):
     def get(self, request):
@@ -151,9 +172,14 @@ class PlannedCoursesView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        qs = PlannedCourse.objects.filter(user=request.user).select_related("course")
-        data = PlannedCourseSerializer(qs, many=True).data
-        return Response(data)
+        rows = PLANNED_COURSE_ROWS.rows(PlannedCourse.objects.filter(user=request.user))
+        courses = {
+            course["id"]: course
+            for course in COURSE_ROWS.rows(Course.objects.filter(id__in=[row["course"] for row in rows]))
+        }
+        for row in rows:
+            row["course"] = courses[row["course"]]
+        return Response(rows)
 
     def post(self, request):
         serializer = PlannedCourseSerializer(data=request.data)
@@ -194,13 +220,24 @@ class CourseReviews(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, course_id):
-        try:
-            course = Course.objects.get(id=course_id)
-            reviews = CourseReview.objects.filter(course=course).select_related('user')
-            serializer = CourseReviewSerializer(reviews, many=True)
-            return Response(serializer.data)
-        except Course.DoesNotExist:
+        query = CourseReviewQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+
+        if not Course.objects.filter(id=course_id).exists():
             return Response({"detail": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
+        reviews = CourseReview.objects.filter(course_id=course_id)
+        try:
+            page, next_cursor = REVIEW_ROWS.page(
+                reviews,
+                CourseReviewQuerySerializer.SORTS[params["sort"]],
+                params.get("cursor"),
+                params["limit"],
+            )
+        except ValueError:
+            return Response({"cursor": ["Invalid cursor."]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": page, "next_cursor": next_cursor})
 
     def post(self, request, course_id):
         try:
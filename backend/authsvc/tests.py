@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authsvc.models import Profile
+from backend.query_budget import QueryBudgetTestMixin
+
+
+class AuthQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Every budgeted auth-svc endpoint"""
+
+    def authenticate(self, user):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(user)}"
+
+    def test_register(self):
+        response = self.client.post(reverse("register"), {
+            "username": "student",
+            "email": "student@uq.edu.au",
+            "password": "password123",
+            "program_level": "UNDERGRAD",
+            "program": "Bachelor of Computer Science",
+            "year_intake": "SEM2",
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(AccessToken(response.json()["access"])["year_intake"], "SEM2")
+
+    def test_me_and_profile(self):
+        user = get_user_model().objects.create_user("student", "student@uq.edu.au", "password123")
+        self.authenticate(user)
+        response = self.client.get(reverse("me"))
+        self.assertIsNone(response.json()["profile"])
+        self.assertWithinQueryBudget(response)
+        response = self.client.patch(reverse("update-profile"), {"program": "BE"}, content_type="application/json")
+        self.assertEqual(response.status_code, 404)
+        self.assertWithinQueryBudget(response)
+
+        Profile.objects.create(user=user, program_level="UNDERGRAD", program="BCompSc", year_intake="SEM1")
+        response = self.client.get(reverse("me"))
+        self.assertEqual(response.json()["profile"]["program"], "BCompSc")
+        self.assertWithinQueryBudget(response)
+        response = self.client.patch(
+            reverse("update-profile"), {"program": "Bachelor of Engineering"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
@@ -0,0 +1,28 @@
+"""
+JWT issuance for authsvc.
+
+Tokens carry the user's ``program`` and ``year_intake`` so other services
+can attribute activity to a program, and validate plans, without reading
+authsvc's tables. Access tokens obtained by refresh copy the claims from
+the refresh token.
+"""
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+def add_profile_claims(token, user):
+    profile = getattr(user, "profile", None)
+    token["program"] = profile.program if profile else ""
+    token["year_intake"] = profile.year_intake if profile else ""
+    return token
+
+
+def tokens_for(user):
+    """Refresh token (and, through it, access token) for a newly registered user"""
+    return add_profile_claims(RefreshToken.for_user(user), user)
+
+
+class ProfileTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_profile_claims(super().get_token(user), user)
@@ -1,10 +1,11 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from backend.query_budget import query_budget
 from authsvc.models import Profile
+from authsvc.tokens import tokens_for
 from .serializers import RegisterSerializer, ProfileSerializer
 
 
@@ -19,11 +20,12 @@ class HealthCheck(APIView):
 class Register(APIView):
     permission_classes = [permissions.AllowAny]
 
+    @query_budget(4)
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = tokens_for(user)
             return Response(
                 {
                     "access": str(refresh.access_token),
@@ -37,6 +39,7 @@ class Register(APIView):
 class Me(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @query_budget(2)
     def get(self, request):
         profile = getattr(request.user, "profile", None)
         data = {
@@ -50,6 +53,7 @@ class Me(APIView):
 class UpdateProfile(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @query_budget(3)
     def patch(self, request):
         try:
             profile = request.user.profile
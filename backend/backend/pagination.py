@@ -0,0 +1,95 @@
+"""
+Keyset (cursor) pagination shared by the microservices.
+
+Pages are addressed by the sort key of the last row returned instead of an
+OFFSET, so every page is a single indexed range scan regardless of depth.
+"""
+import base64
+import json
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values):
+    """Encode the sort key of the last row of a page as an opaque token"""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Decode a token produced by ``encode_cursor``; raises ValueError if malformed"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _after(ordering, values):
+    """Build the row-value comparison ``(f1, f2, ...) > (v1, v2, ...)`` as a Q"""
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        term = Q(**{f"{name}__{lookup}": values[i]})
+        for prev, value in zip(ordering[:i], values[:i]):
+            term &= Q(**{prev.lstrip("-"): value})
+        condition |= term
+    return condition
+
+
+def paginate_keyset(queryset, ordering, cursor=None, limit=DEFAULT_PAGE_SIZE, key=None):
+    """
+    Return ``(rows, next_cursor)`` for one page of ``queryset``.
+
+    ``ordering`` must end in a unique column so the sort is total. ``key``
+    extracts the sort values from a row; by default rows are assumed to be
+    model instances or dicts keyed by field name.
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(ordering):
+            raise ValueError("Invalid cursor")
+        queryset = queryset.filter(_after(ordering, values))
+
+    rows = list(queryset.order_by(*ordering)[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    key = key or _default_key(ordering, last)
+    return rows, encode_cursor(key(last))
+
+
+def iterate_keyset(queryset, ordering, batch_size=1000, key=None):
+    """
+    Yield ``queryset`` in lists of up to ``batch_size`` rows, one indexed
+    range query per batch. Unlike ``QuerySet.iterator()``, memory stays
+    bounded on MySQL, whose default cursors buffer the whole result set.
+    ``ordering`` and ``key`` are as for ``paginate_keyset``.
+    """
+    values = None
+    while True:
+        page = queryset if values is None else queryset.filter(_after(ordering, values))
+        rows = list(page.order_by(*ordering)[:batch_size])
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        key = key or _default_key(ordering, rows[-1])
+        values = key(rows[-1])
+
+
+def _default_key(ordering, row):
+    """Sort-value extractor for model instances or dicts keyed by field name"""
+    names = [field.lstrip("-") for field in ordering]
+    if isinstance(row, dict):
+        return lambda row: [row[name] for name in names]
+    return lambda row: [getattr(row, name) for name in names]
@@ -0,0 +1,150 @@
+"""
+Per-view SQL query budgets.
+
+Views declare how many queries a request may issue with ``@query_budget``;
+``QueryBudgetMiddleware`` counts the queries and database time of every
+request, keeps per-view totals, and logs (or, with ``QUERY_BUDGET_STRICT``,
+raises) when a view goes over its budget so N+1 regressions fail tests.
+"""
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.test.utils import override_settings
+
+logger = logging.getLogger(__name__)
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries):
+    """Declare the maximum number of queries a view method may issue"""
+    def decorator(func):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+
+# Transaction control is timed but not counted, so budgets are the same on
+# backends that issue BEGIN through the cursor (SQLite) and those that don't.
+TRANSACTION_STATEMENTS = ("BEGIN", "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class QueryRecorder:
+    """Database execute wrapper counting queries and their wall time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            if not sql.lstrip().upper().startswith(TRANSACTION_STATEMENTS):
+                self.count += 1
+                self.statements.append(sql)
+
+
+@contextmanager
+def record_queries():
+    """Record every query issued on any database connection inside the block"""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def resolve_budget(view_func, method):
+    """Return ``(view name, budget)`` for a resolved class-based view"""
+    view_class = getattr(view_func, "view_class", None)
+    if view_class is None:
+        return None, None
+    handler = getattr(view_class, method.lower(), None)
+    name = f"{view_class.__module__}.{view_class.__name__}.{method.lower()}"
+    return name, getattr(handler, "query_budget", None)
+
+
+def get_stats():
+    """Snapshot of per-view totals recorded by this process"""
+    with _stats_lock:
+        return {name: dict(entry) for name, entry in _stats.items()}
+
+
+def _record(name, recorder):
+    with _stats_lock:
+        entry = _stats.setdefault(
+            name, {"requests": 0, "queries": 0, "db_time": 0.0, "max_queries": 0}
+        )
+        entry["requests"] += 1
+        entry["queries"] += recorder.count
+        entry["db_time"] += recorder.duration
+        entry["max_queries"] = max(entry["max_queries"], recorder.count)
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        name, budget = getattr(request, "_query_budget", (None, None))
+        if name is None:
+            return response
+
+        _record(name, recorder)
+        response.db_queries = recorder.count
+        response.db_time = recorder.duration
+        response.query_budget = budget
+        if settings.DEBUG:
+            response["Server-Timing"] = (
+                f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"'
+            )
+
+        if budget is not None and recorder.count > budget:
+            message = f"{name} issued {recorder.count} queries (budget {budget})"
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(message + ":\n" + "\n".join(recorder.statements))
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = resolve_budget(view_func, request.method)
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin: every request made through the test client fails the
+    test when its view exceeds its declared budget.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._query_budget_override = override_settings(QUERY_BUDGET_STRICT=True)
+        cls._query_budget_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._query_budget_override.disable()
+        super().tearDownClass()
+
+    def assertWithinQueryBudget(self, response, max_queries=None):
+        """Assert a test client response stayed within ``max_queries`` or its view's budget"""
+        budget = max_queries if max_queries is not None else getattr(response, "query_budget", None)
+        self.assertIsNotNone(budget, "View has no declared query budget")
+        self.assertLessEqual(response.db_queries, budget)
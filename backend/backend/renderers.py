@@ -0,0 +1,31 @@
+"""
+orjson-backed drop-in for DRF's ``JSONRenderer``.
+
+Selected through ``REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"]`` (the
+``JSON_RENDERER`` environment variable in the service settings). Output
+matches the stock renderer: values orjson does not handle natively, and
+datetimes, go through DRF's own encoder.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            # orjson only indents by two; the browsable API asks for more
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_encoder.default, option=OPTIONS)
+        # Same escaping as JSONRenderer: these are valid JSON but not valid
+        # JavaScript string literals.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
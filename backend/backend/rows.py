@@ -0,0 +1,152 @@
+"""
+Fast read path for bulk list endpoints.
+
+``RowMapper`` fetches plain tuples with ``values_list`` and turns them into
+dicts with converters compiled once per field list, skipping model
+instantiation and DRF field machinery. Rows carry the same values a
+``ModelSerializer`` over the same fields would produce: foreign keys as
+primary keys, many-to-many fields as lists of primary keys, and dates and
+decimals formatted by the matching DRF fields. ``extra`` maps further keys
+to raw lookups such as ``"user__username"``.
+"""
+from django.core.exceptions import ValidationError
+from django.db import models
+from rest_framework import serializers
+
+from backend.pagination import iterate_keyset, paginate_keyset
+
+# Primary keys per IN clause when loading many-to-many links by primary key
+LINK_BATCH_SIZE = 1000
+
+
+def _converter(field):
+    """DRF representation function for a model field, or None if values pass through"""
+    if isinstance(field, models.DateTimeField):
+        return serializers.DateTimeField().to_representation
+    if isinstance(field, models.DateField):
+        return serializers.DateField().to_representation
+    if isinstance(field, models.TimeField):
+        return serializers.TimeField().to_representation
+    if isinstance(field, models.DecimalField):
+        return serializers.DecimalField(
+            max_digits=field.max_digits, decimal_places=field.decimal_places
+        ).to_representation
+    if isinstance(field, models.UUIDField):
+        return str
+    return None
+
+
+class RowMapper:
+    """Compiled ``values_list`` to dict mapping for a fixed set of model fields"""
+
+    def __init__(self, model, fields="__all__", extra=None):
+        opts = model._meta
+        if fields == "__all__":
+            fields = [field.name for field in opts.concrete_fields]
+            fields += [field.name for field in opts.many_to_many]
+
+        self.model = model
+        self.names = []
+        self.columns = []
+        self.converters = []
+        self.many_to_many = []
+        for name in fields:
+            field = opts.get_field(name)
+            if field.many_to_many:
+                self.many_to_many.append(field)
+                continue
+            self.names.append(field.name)
+            self.columns.append(field.attname)
+            convert = _converter(field)
+            if convert is not None:
+                self.converters.append((field.name, convert))
+
+        for name, lookup in (extra or {}).items():
+            self.names.append(name)
+            self.columns.append(lookup)
+
+        self.pk_name = opts.pk.name
+        if self.many_to_many and self.pk_name not in self.names:
+            raise ValueError("Many-to-many fields need the primary key among the fields")
+
+    def map(self, values):
+        """Dict for one ``values_list`` tuple (many-to-many fields not included)"""
+        row = dict(zip(self.names, values))
+        for name, convert in self.converters:
+            value = row[name]
+            if value is not None:
+                row[name] = convert(value)
+        return row
+
+    def rows(self, queryset):
+        """Every row of ``queryset`` as a dict"""
+        rows = [self.map(values) for values in queryset.values_list(*self.columns)]
+        if self.many_to_many and rows:
+            # Unsliced, possibly the whole table: let the database join on
+            # the queryset rather than send every primary key back
+            self._attach_many_to_many(rows, None if queryset.query.is_sliced else queryset)
+        return rows
+
+    def _keyset(self, ordering):
+        """Column ordering and tuple sort-key extractor for field-name ``ordering``"""
+        positions = []
+        column_ordering = []
+        for field in ordering:
+            position = self.names.index(field.lstrip("-"))
+            positions.append(position)
+            descending = "-" if field.startswith("-") else ""
+            column_ordering.append(descending + self.columns[position])
+        key = lambda values: [values[position] for position in positions]  # noqa: E731
+        return column_ordering, key
+
+    def page(self, queryset, ordering, cursor=None, limit=50):
+        """
+        ``(rows, next_cursor)`` for one keyset page of ``queryset``, as
+        ``paginate_keyset`` with ``ordering`` given as this mapper's field
+        names. Raises ValueError for a malformed cursor.
+        """
+        column_ordering, key = self._keyset(ordering)
+        values_list = queryset.values_list(*self.columns)
+        try:
+            page, next_cursor = paginate_keyset(values_list, column_ordering, cursor, limit, key)
+        except ValidationError as exc:
+            # Well-formed token whose values do not fit the columns
+            raise ValueError("Invalid cursor") from exc
+        rows = [self.map(values) for values in page]
+        if self.many_to_many and rows:
+            self._attach_many_to_many(rows)
+        return rows, next_cursor
+
+    def batches(self, queryset, ordering, batch_size=1000):
+        """
+        Yield the rows of ``queryset`` as lists of dicts, fetched in keyset
+        batches along ``ordering`` (field names among this mapper's fields,
+        ending in a unique one).
+        """
+        column_ordering, key = self._keyset(ordering)
+        values_list = queryset.values_list(*self.columns)
+        for batch in iterate_keyset(values_list, column_ordering, batch_size, key):
+            rows = [self.map(values) for values in batch]
+            if self.many_to_many:
+                self._attach_many_to_many(rows)
+            yield rows
+
+    def _attach_many_to_many(self, rows, queryset=None):
+        """Fill in the many-to-many fields of mapped rows, filtering links by ``queryset`` if given"""
+        by_pk = {row[self.pk_name]: row for row in rows}
+        if queryset is None:
+            pks = list(by_pk)
+            batches = [pks[i:i + LINK_BATCH_SIZE] for i in range(0, len(pks), LINK_BATCH_SIZE)]
+        else:
+            batches = [queryset.values("pk")]
+
+        for field in self.many_to_many:
+            through = field.remote_field.through
+            source = through._meta.get_field(field.m2m_field_name()).attname
+            target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+            for row in rows:
+                row[field.name] = []
+            for batch in batches:
+                links = through.objects.filter(**{f"{source}__in": batch}).values_list(source, target)
+                for source_id, target_id in links:
+                    by_pk[source_id][field.name].append(target_id)
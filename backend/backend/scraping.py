@@ -0,0 +1,194 @@
+"""
+Polite HTTP fetching for the scraper commands.
+
+``Fetcher`` is safe to share between worker threads. Every request, retries
+included, first takes a slot from one ``RateLimiter``, so the server sees at
+most ``rate`` requests per second however many workers run. One
+``requests.Session`` with a connection pool as large as the worker count
+keeps connections to each host alive between requests. Connection errors,
+timeouts, 429s and 5xx responses are retried with exponential backoff,
+honouring ``Retry-After`` when the server sends one, up to
+``max_retry_after`` seconds.
+
+Given a cache directory, the fetcher keeps each response that carries an
+``ETag`` or ``Last-Modified`` validator on disk and revalidates it with a
+conditional GET on the next run. A 304 costs no body transfer and comes
+back as the cached response with ``from_cache`` set. ``content_hash``
+fingerprints parsed records so callers can also skip unchanged rows.
+"""
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Longest ``Retry-After`` honoured, in seconds; a server asking for more
+# is retried after this long instead of stalling a worker for hours
+MAX_RETRY_AFTER = 60
+
+
+class RateLimiter:
+    """Spaces calls to ``wait`` at least ``1 / rate`` seconds apart across threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def content_hash(*records):
+    """Stable SHA-256 of JSON-serialisable records, for storing next to what they produced"""
+    encoded = json.dumps(records, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class HTTPCache:
+    """Response bodies and their validators on disk, one ``<sha256 of URL>.json``/``.body`` pair per URL"""
+
+    # Response headers kept with the body
+    HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url, suffix):
+        return self.directory / (hashlib.sha256(url.encode()).hexdigest() + suffix)
+
+    def _write(self, path, data):
+        # Write-then-rename, so concurrent workers never read half a file
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+        os.replace(temporary, path)
+
+    def load(self, url):
+        """``(headers, body)`` stored for ``url``, or None"""
+        try:
+            headers = json.loads(self._path(url, ".json").read_text())
+            body = self._path(url, ".body").read_bytes()
+        except (OSError, ValueError):
+            return None
+        return headers, body
+
+    def store(self, url, response):
+        headers = {name: response.headers[name] for name in self.HEADERS if name in response.headers}
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            return
+        self._write(self._path(url, ".body"), response.content)
+        self._write(self._path(url, ".json"), json.dumps(headers).encode())
+
+    @staticmethod
+    def validators(headers):
+        """Conditional request headers for a cached entry"""
+        conditional = {}
+        if "ETag" in headers:
+            conditional["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            conditional["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional
+
+    @staticmethod
+    def response(url, headers, body):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+
+class Fetcher:
+    def __init__(
+        self, rate=2.0, workers=8, retries=3, backoff=1.0, timeout=30, cache_dir=None, max_retry_after=MAX_RETRY_AFTER,
+    ):
+        self.cache = HTTPCache(cache_dir) if cache_dir else None
+        # "fetched" (bodies downloaded) and "not_modified" (served from the cache)
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), self.max_retry_after)
+        # Jitter keeps workers that failed together from retrying together
+        return self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def get(self, url, **kwargs):
+        """
+        GET ``url`` and return the response, with ``from_cache`` set when the
+        server answered 304 to a conditional GET. Raises
+        ``requests.RequestException`` once the retries are spent; other 4xx
+        responses are returned as is.
+        """
+        cached = self.cache.load(url) if self.cache else None
+        response = self._get(url, cached, **kwargs)
+        if cached is not None and response.status_code == 304:
+            self._count("not_modified")
+            response = self.cache.response(url, *cached)
+            response.from_cache = True
+            return response
+        self._count("fetched")
+        if self.cache is not None and response.status_code == 200:
+            self.cache.store(url, response)
+        response.from_cache = False
+        return response
+
+    def _get(self, url, cached, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        if cached is not None:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **self.cache.validators(cached[0])}
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self._delay(attempt))
+                continue
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt == self.retries:
+                response.raise_for_status()
+            time.sleep(self._delay(attempt, response))
+
+    def close(self):
+        self.session.close()
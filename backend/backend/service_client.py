@@ -0,0 +1,102 @@
+"""
+HTTP client for calls between the services.
+
+``ServiceClient`` keeps one ``requests.Session`` per process, whose pool
+holds keep-alive connections to the other service open between requests.
+Every call has a strict connect and read timeout and is never retried, so a
+slow dependency costs a caller at most the timeout.
+
+Calls go through a ``CircuitBreaker``. After ``threshold`` consecutive
+failures it opens and calls fail at once with ``ServiceUnavailable`` for
+``reset_timeout`` seconds. Then a single trial call is let through: success
+closes the breaker and failure opens it again. Callers catch
+``ServiceUnavailable`` and fall back to whatever data they already hold.
+"""
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceUnavailable(Exception):
+    """The call failed, or was not attempted because the circuit is open"""
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, name, threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go ahead now: one trial per ``reset_timeout`` unless closed"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.opened_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != self.OPEN:
+                    logger.warning("Circuit %s opened after %d failures", self.name, self.failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class ServiceClient:
+    """Pooled, time-limited JSON GETs against ``base_url``, behind a circuit breaker"""
+
+    def __init__(self, name, base_url, connect_timeout=0.5, read_timeout=2.0, pool_size=10, breaker=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = breaker or CircuitBreaker(name)
+        self.session = requests.Session()
+        self.session.headers["Accept"] = "application/json"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, path, params=None, headers=None):
+        """The response to ``GET base_url + path``; raises ``ServiceUnavailable`` on any failure"""
+        if not self.breaker.allow():
+            raise ServiceUnavailable(f"Circuit {self.breaker.name} is open")
+        try:
+            response = self.session.get(self.base_url + path, params=params, headers=headers, timeout=self.timeout)
+        except requests.RequestException as exc:
+            self.breaker.record_failure()
+            raise ServiceUnavailable(str(exc)) from exc
+        # A 4xx is the caller's mistake, not the service failing
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if not response.ok:
+            raise ServiceUnavailable(f"{response.status_code} from {response.url}")
+        return response
+
+    def close(self):
+        self.session.close()
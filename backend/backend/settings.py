@@ -138,6 +138,9 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# On-disk HTTP cache the scraper commands revalidate with conditional GETs
+SCRAPE_CACHE_DIR = os.environ.get('SCRAPE_CACHE_DIR', str(BASE_DIR / '.scrape-cache'))
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = os.environ.get('CORS_ALLOWED_ORIGINS', 'http://localhost:3000,http://localhost:8000').split(',')
 CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
@@ -145,5 +148,11 @@ CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
 REST_FRAMEWORK = {
   "DEFAULT_AUTHENTICATION_CLASSES": [
     "rest_framework_simplejwt.authentication.JWTAuthentication",
-  ]
+  ],
+  # Set JSON_RENDERER=rest_framework.renderers.JSONRenderer to fall back to
+  # the stdlib encoder
+  "DEFAULT_RENDERER_CLASSES": [
+    os.environ.get("JSON_RENDERER", "backend.renderers.ORJSONRenderer"),
+    "rest_framework.renderers.BrowsableAPIRenderer",
+  ],
 }
\ No newline at end of file
@@ -26,6 +26,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'backend.query_budget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -73,6 +74,8 @@ DATABASES = {
 SIMPLE_JWT = {
   "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
   "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+  # Adds the ``program`` claim read by coursessvc's review rollups
+  "TOKEN_OBTAIN_SERIALIZER": "authsvc.tokens.ProfileTokenObtainPairSerializer",
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -92,11 +95,20 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Raise instead of logging when a view exceeds its declared query budget
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'False').lower() == 'true'
+
 CORS_ALLOWED_ORIGINS = os.environ.get('CORS_ALLOWED_ORIGINS', '').split(',')
 CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
 
 REST_FRAMEWORK = {
   "DEFAULT_AUTHENTICATION_CLASSES": [
     "rest_framework_simplejwt.authentication.JWTAuthentication",
-  ]
+  ],
+  # Set JSON_RENDERER=rest_framework.renderers.JSONRenderer to fall back to
+  # the stdlib encoder
+  "DEFAULT_RENDERER_CLASSES": [
+    os.environ.get("JSON_RENDERER", "backend.renderers.ORJSONRenderer"),
+    "rest_framework.renderers.BrowsableAPIRenderer",
+  ],
 }
@@ -26,6 +26,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'backend.query_budget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -92,11 +93,29 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Raise instead of logging when a view exceeds its declared query budget
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'False').lower() == 'true'
+
+# On-disk HTTP cache the scraper commands revalidate with conditional GETs
+SCRAPE_CACHE_DIR = os.environ.get('SCRAPE_CACHE_DIR', str(BASE_DIR / '.scrape-cache'))
+
+# Seconds browsers may reuse the /catalog/bootstrap/ redirect before asking for the current bundle
+BOOTSTRAP_MAX_AGE = int(os.environ.get('BOOTSTRAP_MAX_AGE', '300'))
+
+# Seconds a worker serves its program typeahead index before rechecking the version stamp
+PROGRAM_INDEX_CHECK_INTERVAL = float(os.environ.get('PROGRAM_INDEX_CHECK_INTERVAL', '5'))
+
 CORS_ALLOWED_ORIGINS = os.environ.get('CORS_ALLOWED_ORIGINS', '').split(',')
 CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
 
 REST_FRAMEWORK = {
   "DEFAULT_AUTHENTICATION_CLASSES": [
     "rest_framework_simplejwt.authentication.JWTAuthentication",
-  ]
+  ],
+  # Set JSON_RENDERER=rest_framework.renderers.JSONRenderer to fall back to
+  # the stdlib encoder
+  "DEFAULT_RENDERER_CLASSES": [
+    os.environ.get("JSON_RENDERER", "backend.renderers.ORJSONRenderer"),
+    "rest_framework.renderers.BrowsableAPIRenderer",
+  ],
 }
@@ -26,6 +26,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'backend.query_budget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -92,11 +93,34 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Raise instead of logging when a view exceeds its declared query budget
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'False').lower() == 'true'
+
+# courses-svc API root the planner reads course records from
+COURSES_SERVICE_URL = os.environ.get('COURSES_SERVICE_URL', 'http://localhost:8002/api')
+
+# Seconds to wait for courses-svc before serving planned courses without course records
+COURSES_SERVICE_TIMEOUT = float(os.environ.get('COURSES_SERVICE_TIMEOUT', '1'))
+
+# Seconds between conditional requests confirming cached course records are
+# still the current catalog version
+COURSE_CACHE_CHECK_INTERVAL = float(os.environ.get('COURSE_CACHE_CHECK_INTERVAL', '5'))
+# Seconds a worker keeps a course record, which bounds how stale records
+# served while courses-svc cannot be asked get; and how many it keeps
+COURSE_CACHE_TTL = float(os.environ.get('COURSE_CACHE_TTL', '300'))
+COURSE_CACHE_SIZE = int(os.environ.get('COURSE_CACHE_SIZE', '5000'))
+
 CORS_ALLOWED_ORIGINS = os.environ.get('CORS_ALLOWED_ORIGINS', '').split(',')
 CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
 
 REST_FRAMEWORK = {
   "DEFAULT_AUTHENTICATION_CLASSES": [
     "rest_framework_simplejwt.authentication.JWTAuthentication",
-  ]
+  ],
+  # Set JSON_RENDERER=rest_framework.renderers.JSONRenderer to fall back to
+  # the stdlib encoder
+  "DEFAULT_RENDERER_CLASSES": [
+    os.environ.get("JSON_RENDERER", "backend.renderers.ORJSONRenderer"),
+    "rest_framework.renderers.BrowsableAPIRenderer",
+  ],
 }
@@ -0,0 +1,31 @@
+"""
+Streaming JSON array responses.
+
+Rows are produced in batches (``RowMapper.batches``); each batch is rendered
+and handed to the WSGI server before the next one is fetched, so memory per
+request is bounded by the batch size rather than by the size of the result.
+Queries issued while streaming run after the view has returned and are not
+counted by ``QueryBudgetMiddleware``.
+"""
+from django.http import StreamingHttpResponse
+from rest_framework.settings import api_settings
+
+
+def render_array(batches, renderer=None):
+    """Yield the bytes of one JSON array holding every row of ``batches``"""
+    renderer = renderer or api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    yield b"["
+    first = True
+    for batch in batches:
+        if not batch:
+            continue
+        body = renderer.render(batch)[1:-1]
+        yield body if first else b"," + body
+        first = False
+    yield b"]"
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    def __init__(self, batches, renderer=None, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(render_array(batches, renderer), **kwargs)
@@ -0,0 +1,35 @@
+"""
+Named version counters for data that changes only when loaders run.
+
+Each service keeps its own counter table (a concrete subclass of
+``VersionCounter``); signal handlers bump a counter on every write to the
+rows it covers, and views derive ETags and cache keys from it.
+"""
+from django.db import models
+
+
+class VersionCounter(models.Model):
+    name = models.CharField(max_length=32, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self) -> str:
+        return f"{self.name} v{self.version}"
+
+    @classmethod
+    def bump(cls, name):
+        """Increment the named counter, creating it on first use"""
+        increment = {"version": models.F("version") + 1}
+        if not cls.objects.filter(name=name).update(**increment):
+            _, created = cls.objects.get_or_create(name=name, defaults={"version": 1})
+            if not created:
+                # Lost a race with another first bump
+                cls.objects.filter(name=name).update(**increment)
+
+    @classmethod
+    def current(cls, *names):
+        """Current values of the named counters (0 if never bumped), in order"""
+        versions = dict(cls.objects.filter(name__in=names).values_list("name", "version"))
+        return tuple(versions.get(name, 0) for name in names)
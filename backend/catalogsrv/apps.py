@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CatalogSrvConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'catalogsrv'
+
+    def ready(self):
+        # Register signal handlers that keep the catalog version current
+        from . import signals  # noqa: F401
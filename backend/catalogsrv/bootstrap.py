@@ -0,0 +1,87 @@
+"""
+The bootstrap bundle: every piece of static catalog metadata the frontend
+needs on startup, in one JSON document.
+
+The bundle is rendered to bytes once per process and ``programs`` version,
+and is served at a URL carrying its content hash. Since the bytes at a hash
+never change, that URL is cached by browsers as immutable. The unhashed
+``/catalog/bootstrap/`` redirects to the current one, and only that small
+redirect has to be revalidated.
+"""
+import json
+import threading
+
+from django.conf import settings
+
+from backend.etag import content_etag
+from catalogsrv.models import CatalogVersion, Program
+
+ASSESSMENT_TYPES = [
+    {"value": "EXAM", "label": "Exam"},
+    {"value": "PROJECT", "label": "Project"},
+    {"value": "ASSIGNMENT", "label": "Assignment"},
+    {"value": "MIX", "label": "Mix"},
+]
+
+STUDY_AREAS = [
+    {"value": "BEL", "label": "Business, Economics & Law"},
+    {"value": "EAIT", "label": "Engineering, Architecture & Information Technology"},
+    {"value": "HABS", "label": "Health & Behavioural Sciences"},
+    {"value": "HMB", "label": "Health, Medicine and Behavioural Sciences"},
+    {"value": "HASS", "label": "Humanities, Arts & Social Sciences"},
+    {"value": "SCI", "label": "Science"},
+]
+
+PROGRAM_LEVELS = [
+    {"value": choice[0], "label": choice[1]} for choice in Program.ProgramLevel.choices
+]
+
+DEFAULT_REDIRECT_MAX_AGE = 300
+
+# A year: the bytes at a hashed URL never change
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Year levels are the first digit of a course code; credits are UQ units
+COURSE_LEVELS = {"min": 1, "max": 7}
+COURSE_CREDITS = {"min": 1, "max": 8}
+
+_lock = threading.Lock()
+_state = {"version": None, "hash": None, "body": None}
+
+
+def redirect_max_age():
+    return getattr(settings, "BOOTSTRAP_MAX_AGE", DEFAULT_REDIRECT_MAX_AGE)
+
+
+def render(version):
+    """``(content hash, JSON bytes)`` of the bundle at ``programs`` version ``version``"""
+    bundle = {
+        "assessment_types": ASSESSMENT_TYPES,
+        "study_areas": STUDY_AREAS,
+        "program_levels": PROGRAM_LEVELS,
+        "course_levels": COURSE_LEVELS,
+        "course_credits": COURSE_CREDITS,
+        "programs_version": version,
+    }
+    return content_etag(bundle), json.dumps(bundle, separators=(",", ":")).encode()
+
+
+def current():
+    """``(content hash, JSON bytes)`` of the current bundle, re-rendered when the version moves"""
+    (version,) = CatalogVersion.current(CatalogVersion.PROGRAMS)
+    with _lock:
+        if _state["version"] != version:
+            _state["hash"], _state["body"] = render(version)
+            _state["version"] = version
+        return _state["hash"], _state["body"]
+
+
+def cached(content_hash):
+    """The bytes for ``content_hash`` if this process has rendered it, else None"""
+    with _lock:
+        return _state["body"] if _state["hash"] == content_hash else None
+
+
+def clear():
+    with _lock:
+        _state.update(version=None, hash=None, body=None)
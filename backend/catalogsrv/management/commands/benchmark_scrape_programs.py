@@ -0,0 +1,106 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalogsrv.models import Program
+from catalogsrv.programs import LISTS, PARSER, parse_programs, sync_programs
+
+
+class Rollback(Exception):
+    pass
+
+
+def synthetic_page(programs):
+    """A browse page with ``programs`` rows of undergraduate and postgraduate names"""
+    rows = "".join(
+        f"<tr><td><a href='/program.html?acad_prog={i}'>Bachelor of Benchmark {i}</a></td>"
+        f"<td><a href='/program.html?acad_prog=p{i}'>Master of Benchmark {i}</a></td></tr>\n"
+        for i in range(programs)
+    )
+    # Navigation and script noise around the table, like the real page
+    chrome = "<div class='nav'>" + "<a href='#'>link</a>" * 500 + "</div><script>var x = 1;</script>"
+    return (
+        f"<html><head><title>Browse</title></head><body>{chrome}<table>"
+        f"<tr><th>Undergraduate Program</th><th>Postgraduate Program</th></tr>\n{rows}</table>{chrome}</body></html>"
+    ).encode()
+
+
+class Command(BaseCommand):
+    help = (
+        "Time scrape_programs parsing per HTML parser and its set-based sync against "
+        "per-row get_or_create. Writes run in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fixture',
+            help='Recorded browse page to parse (default: a synthetic page)',
+        )
+        parser.add_argument(
+            '--programs',
+            type=int,
+            default=5000,
+            help='Rows per column of the synthetic page',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per variant; the best one is reported',
+        )
+
+    def best(self, func, repeat, setup=None):
+        """Best time of ``func`` over ``repeat`` runs, each after ``setup`` in a rolled-back transaction"""
+        best = None
+        for _ in range(repeat):
+            try:
+                with transaction.atomic():
+                    if setup:
+                        setup()
+                    start = time.perf_counter()
+                    func()
+                    elapsed = time.perf_counter() - start
+                    raise Rollback
+            except Rollback:
+                pass
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        page = Path(options['fixture']).read_bytes() if options['fixture'] else synthetic_page(options['programs'])
+        repeat = options['repeat']
+        listed = {}
+        for level, (_, column) in LISTS.items():
+            for name in parse_programs(page, column):
+                listed.setdefault(name, level)
+        self.stdout.write(f"{len(page) / 1024:.0f} KiB page, {len(listed)} programs, best of {repeat}")
+
+        for parser in dict.fromkeys(("html.parser", PARSER)):
+            elapsed = self.best(lambda: [parse_programs(page, column, parser) for _, column in LISTS.values()], repeat)
+            self.stdout.write(f"parse with {parser:<18} {elapsed * 1000:>8.1f} ms")
+
+        def per_row():
+            for name, level in listed.items():
+                program, created = Program.objects.get_or_create(name=name, defaults={'level': level})
+                if not created:
+                    program.level = level
+                    program.save()
+
+        def empty():
+            Program.objects.all().delete()
+
+        def seeded():
+            empty()
+            sync_programs(Program, listed)
+
+        variants = [
+            ("get_or_create, empty table", per_row, empty),
+            ("sync_programs, empty table", lambda: sync_programs(Program, listed), empty),
+            ("get_or_create, unchanged", per_row, seeded),
+            ("sync_programs, unchanged", lambda: sync_programs(Program, listed), seeded),
+        ]
+        for label, func, setup in variants:
+            elapsed = self.best(func, repeat, setup)
+            self.stdout.write(f"{label:<28} {elapsed * 1000:>8.1f} ms")
@@ -0,0 +1,29 @@
+# Generated by Django for catalogsrv
+
+from django.db import migrations, models
+
+
+def seed_versions(apps, schema_editor):
+    """Create the counters up front so every bump is a single UPDATE"""
+    CatalogVersion = apps.get_model('catalogsrv', 'CatalogVersion')
+    for name in ['programs']:
+        CatalogVersion.objects.get_or_create(name=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogsrv', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_versions, migrations.RunPython.noop),
+    ]
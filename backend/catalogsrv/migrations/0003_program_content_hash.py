@@ -0,0 +1,18 @@
+# Generated by Django for catalogsrv
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogsrv', '0002_catalogversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='program',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from backend.versioning import VersionCounter
 
 
 class Program(models.Model):
@@ -8,6 +9,14 @@ class Program(models.Model):
 
     name = models.CharField(max_length=255, unique=True)
     level = models.CharField(max_length=16, choices=ProgramLevel.choices)
+    # ``content_hash`` of the scraped record last written, so unchanged
+    # programs are skipped by scrape_programs
+    content_hash = models.CharField(max_length=64, blank=True, default="")
 
     def __str__(self) -> str:
         return f"{self.name} ({self.get_level_display()})"
+
+
+class CatalogVersion(VersionCounter):
+    """``programs`` is bumped on every write to ``Program``"""
+    PROGRAMS = "programs"
@@ -0,0 +1,219 @@
+"""
+Scraping of the UQ program lists.
+
+The browse page lists undergraduate programs in its first table column and
+postgraduate ones in its second. ``parse_programs`` reads one column, with
+lxml when it is installed. ``sync_programs`` then makes a ``Program`` table
+match the scraped ``{name: level}`` map as a set operation: one query loads
+every existing row, and the inserts, updates and optional deletes are
+applied with one ``bulk_create``, one ``bulk_update`` and one ``DELETE`` in
+a single transaction.
+
+Nothing here imports a model. ``ScrapeProgramsCommand`` is shared by
+catalogsrv's ``scrape_programs`` and its twin in the legacy ``api`` app,
+which each set ``program_model``.
+"""
+from dataclasses import dataclass, field
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Count, Q
+
+from backend.scraping import Fetcher, content_hash
+
+try:
+    import lxml.html
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+BASE_URL = "https://programs-courses.uq.edu.au"
+
+# Level, browse page and table column of each program list
+LISTS = {
+    "UNDERGRAD": ("/browse.html?level=ugpg", 0),
+    "POSTGRAD": ("/browse.html?level=pgpg", 1),
+}
+
+HEADER_NAMES = {"Program", "Undergraduate Program", "Postgraduate Program"}
+
+BATCH_SIZE = 500
+
+
+def _cells(html, parser):
+    """``(tag, text)`` of the cells of each table row"""
+    if parser == "lxml":
+        for row in lxml.html.fromstring(html).iter("tr"):
+            yield [(cell.tag, cell.text_content()) for cell in row if cell.tag in ("td", "th")]
+        return
+    soup = BeautifulSoup(html, parser, parse_only=SoupStrainer("table"))
+    for row in soup.find_all("tr"):
+        yield [(cell.name, cell.get_text(" ")) for cell in row.find_all(["td", "th"], recursive=False)]
+
+
+def parse_programs(html, column, parser=PARSER):
+    """
+    Program names in table column ``column`` (0-based) of a browse page, in
+    page order. lxml builds its tree in C, several times faster than
+    BeautifulSoup's pure Python parser, which remains the fallback.
+    """
+    names = []
+    for cells in _cells(html, parser):
+        if len(cells) <= column or cells[column][0] != "td":
+            continue
+        name = " ".join(cells[column][1].split())
+        if name and name not in HEADER_NAMES:
+            names.append(name)
+    return names
+
+
+@dataclass
+class SyncResult:
+    added: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    retired: list = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def changed(self):
+        return bool(self.added or self.updated or self.retired)
+
+
+def sync_programs(model, listed, retire=False, force=False):
+    """
+    Make ``model`` match ``listed`` (``{name: level}``): add new names,
+    update those whose level (or ``content_hash``, where the model has one)
+    differs, rewrite all of them with ``force``, and delete names no longer
+    listed with ``retire``. Writes skip ``post_save``, so callers bump any
+    version counter themselves when the result has ``changed``.
+    """
+    hashed = any(column.name == "content_hash" for column in model._meta.concrete_fields)
+    fields = ["level", "content_hash"] if hashed else ["level"]
+
+    def values(name, level):
+        if hashed:
+            return {"level": level, "content_hash": content_hash({"name": name, "level": level})}
+        return {"level": level}
+
+    existing = {name: (pk, *current) for name, pk, *current in model.objects.values_list("name", "pk", *fields)}
+    result = SyncResult()
+    new = []
+    changed = []
+    for name, level in listed.items():
+        target = values(name, level)
+        if name not in existing:
+            new.append(model(name=name, **target))
+            result.added.append(name)
+        elif force or tuple(target[column] for column in fields) != existing[name][1:]:
+            changed.append(model(pk=existing[name][0], name=name, **target))
+            result.updated.append(name)
+        else:
+            result.unchanged += 1
+    if retire:
+        result.retired = sorted(existing.keys() - listed.keys())
+
+    # A program inserted by a concurrent run since the read above is
+    # updated instead of failing the batch (MySQL infers the unique key)
+    conflicts = {"update_conflicts": True, "update_fields": fields}
+    if connections[model.objects.db].features.supports_update_conflicts_with_target:
+        conflicts["unique_fields"] = ["name"]
+    with transaction.atomic():
+        model.objects.bulk_create(new, batch_size=BATCH_SIZE, **conflicts)
+        model.objects.bulk_update(changed, fields, batch_size=BATCH_SIZE)
+        if result.retired:
+            model.objects.filter(pk__in=[existing[name][0] for name in result.retired]).delete()
+    return result
+
+
+class ScrapeProgramsCommand(BaseCommand):
+    help = "Scrape UQ programs from the official website and populate the Program table."
+    program_model = None
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Refetch both pages and rewrite every program, changed or not',
+        )
+        parser.add_argument(
+            '--retire',
+            action='store_true',
+            help='Delete programs no longer listed (only when both pages were read and list programs)',
+        )
+        parser.add_argument(
+            '--base-url',
+            default=BASE_URL,
+            help='Site to scrape, e.g. a local fixture server',
+        )
+        parser.add_argument(
+            '--cache-dir',
+            default=settings.SCRAPE_CACHE_DIR,
+            help='HTTP cache for conditional requests (ETag/Last-Modified)',
+        )
+
+    def programs_changed(self):
+        """Hook run after a sync that wrote anything"""
+
+    def handle(self, *args, **options):
+        force_update = options['force']
+        # One request per second, to be respectful to the server; a page
+        # unchanged since the last run comes back as a bodiless 304
+        fetcher = Fetcher(rate=1.0, workers=1, cache_dir=None if force_update else options['cache_dir'])
+        listed = {}
+        complete = True
+        try:
+            for level, (path, column) in LISTS.items():
+                url = options['base_url'] + path
+                self.stdout.write(f"Scraping {level} programs from {url}")
+                try:
+                    response = fetcher.get(url)
+                    response.raise_for_status()
+                except requests.RequestException as e:
+                    complete = False
+                    self.stdout.write(self.style.ERROR(f"Failed to fetch {url}: {e}"))
+                    continue
+                names = parse_programs(response.content, column)
+                if not names:
+                    # A redesigned page parses to nothing; retiring on that
+                    # would delete every program of the level
+                    complete = False
+                    self.stdout.write(self.style.ERROR(f"No {level} programs found on {url}"))
+                for name in names:
+                    # Names are unique; the first level a program is listed under wins
+                    listed.setdefault(name, level)
+                self.stdout.write(
+                    f"  {len(names)} listed" + (" (page not modified)" if response.from_cache else "")
+                )
+        finally:
+            fetcher.close()
+
+        retire = options['retire'] and complete
+        if options['retire'] and not retire:
+            self.stdout.write(self.style.WARNING("Not retiring programs: a program list could not be read"))
+
+        result = sync_programs(self.program_model, listed, retire=retire, force=force_update)
+        for label, names in (("Added", result.added), ("Updated", result.updated), ("Retired", result.retired)):
+            for name in names:
+                self.stdout.write(f"  {label}: {name}")
+        if result.changed:
+            self.programs_changed()
+
+        counts = self.program_model.objects.aggregate(
+            total=Count('pk'),
+            undergrad=Count('pk', filter=Q(level='UNDERGRAD')),
+            postgrad=Count('pk', filter=Q(level='POSTGRAD')),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully processed programs: {len(result.added)} added, "
+                f"{len(result.updated)} updated, {result.unchanged} unchanged, {len(result.retired)} retired\n"
+                f"\nSummary:\n"
+                f"Pages: {fetcher.stats['fetched']} fetched, {fetcher.stats['not_modified']} not modified\n"
+                f"Total programs: {counts['total']}\n"
+                f"Undergraduate: {counts['undergrad']}\n"
+                f"Postgraduate: {counts['postgrad']}"
+            )
+        )
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from catalogsrv.models import Program
 
 
@@ -8,3 +9,13 @@ class ProgramSerializer(serializers.ModelSerializer):
     class Meta:
         model = Program
         fields = ["id", "name", "level", "level_label"]
+
+
+class ProgramSearchQuerySerializer(serializers.Serializer):
+    """Validates the typeahead parameters of Programs"""
+    level = serializers.ChoiceField(choices=Program.ProgramLevel.choices, required=False, allow_blank=True)
+    search = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from catalogsrv.models import CatalogVersion, Program
+
+
+@receiver(post_save, sender=Program)
+@receiver(post_delete, sender=Program)
+def bump_programs_version(sender, **kwargs):
+    CatalogVersion.bump(CatalogVersion.PROGRAMS)
@@ -0,0 +1,104 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.query_budget import QueryBudgetTestMixin
+from catalogsrv import bootstrap, typeahead
+from catalogsrv.management.commands.benchmark_scrape_programs import synthetic_page
+from catalogsrv.models import Program
+
+
+class CatalogQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Every budgeted catalog-svc endpoint, with a Bearer token and cold per-process caches"""
+
+    def setUp(self):
+        for clear in (bootstrap.clear, typeahead.clear):
+            clear()
+            self.addCleanup(clear)
+        user = get_user_model().objects.create_user("student", "student@uq.edu.au", "password123")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(user)}"
+        Program.objects.bulk_create(
+            Program(name=name, level=level)
+            for name, level in [
+                ("Bachelor of Computer Science", Program.ProgramLevel.UNDERGRAD),
+                ("Bachelor of Engineering (Honours)", Program.ProgramLevel.UNDERGRAD),
+                ("Master of Computer Science", Program.ProgramLevel.POSTGRAD),
+            ]
+        )
+
+    def get(self, url, params=None, status=200):
+        response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, status)
+        self.assertWithinQueryBudget(response)
+        return response
+
+    def test_static_lists(self):
+        for name in ("assessment-types", "study-areas", "program-levels"):
+            with self.subTest(name=name):
+                self.get(reverse(name))
+
+    def test_bootstrap(self):
+        redirect = self.get(reverse("bootstrap"), status=302)
+        bootstrap.clear()
+        self.get(redirect["Location"])
+        # Rendered by this worker: served without a query
+        self.assertEqual(self.get(redirect["Location"]).db_queries, 0)
+
+    def test_programs(self):
+        response = self.get(reverse("programs"), {"search": "computer"})
+        self.assertEqual(
+            [program["name"] for program in response.json()["results"]],
+            ["Bachelor of Computer Science", "Master of Computer Science"],
+        )
+        self.get(reverse("programs"), {"search": "compter science", "level": "POSTGRAD"})
+
+
+class FakeFetcher:
+    """Serves ``pages`` (path to body) in place of the UQ site"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.stats = {"fetched": 0, "not_modified": 0}
+
+    def __call__(self, **kwargs):
+        return self
+
+    def get(self, url):
+        self.stats["fetched"] += 1
+        return mock.Mock(content=self.pages[url.removeprefix("http://uq.test")], from_cache=False)
+
+    def close(self):
+        pass
+
+
+class ScrapeProgramsTests(TestCase):
+    def setUp(self):
+        Program.objects.bulk_create([
+            Program(name="Bachelor of Benchmark 0", level=Program.ProgramLevel.UNDERGRAD),
+            Program(name="Bachelor of Retired Studies", level=Program.ProgramLevel.UNDERGRAD),
+            Program(name="Master of Benchmark 0", level=Program.ProgramLevel.POSTGRAD),
+        ])
+
+    def scrape(self, undergrad, postgrad):
+        fetcher = FakeFetcher({"/browse.html?level=ugpg": undergrad, "/browse.html?level=pgpg": postgrad})
+        out = StringIO()
+        with mock.patch("catalogsrv.programs.Fetcher", fetcher):
+            call_command("scrape_programs", retire=True, base_url="http://uq.test", stdout=out)
+        return out.getvalue()
+
+    def test_retire_programs_no_longer_listed(self):
+        self.scrape(synthetic_page(2), synthetic_page(2))
+        self.assertFalse(Program.objects.filter(name="Bachelor of Retired Studies").exists())
+        self.assertEqual(Program.objects.count(), 4)
+
+    def test_empty_list_retires_nothing(self):
+        out = self.scrape(synthetic_page(2), b"<html><body><p>Page moved</p></body></html>")
+        self.assertIn("No POSTGRAD programs found", out)
+        self.assertIn("Not retiring programs", out)
+        self.assertTrue(Program.objects.filter(name="Bachelor of Retired Studies").exists())
+        self.assertTrue(Program.objects.filter(name="Master of Benchmark 0").exists())
@@ -0,0 +1,268 @@
+"""
+Process-local typeahead index over program names.
+
+Every worker keeps one ``ProgramIndex``, built from a single query and
+tagged with the ``programs`` ``CatalogVersion`` it was built from. Like
+``coursessvc.catalog_cache`` it is revalidated against that counter at most
+once every ``PROGRAM_INDEX_CHECK_INTERVAL`` seconds, and at once when a
+view hands ``validate`` the version it read for its ETag.
+
+Names are normalized (case-folded, accents and punctuation dropped) and
+matches are ranked in tiers:
+
+0. the name starts with the query;
+1. every query word starts a word of the name ("bach sci");
+2. the query, three characters or more, appears anywhere in the name;
+3. every query word is within a small edit distance of the start of a
+   word ("scince"), tried only when the exact tiers leave a page unfilled.
+
+Within a tier, results sort by edit distance, then name, then id. That sort
+key is also the pagination cursor. Exact tiers are answered from sorted
+lists with ``bisect`` and from trigram postings. The fuzzy tier measures
+edit distances only to the distinct name words that share trigrams with a
+query word.
+"""
+import heapq
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+from catalogsrv.models import CatalogVersion, Program
+
+DEFAULT_CHECK_INTERVAL = 5.0
+
+# Typos allowed per query word, by word length; shorter words must match exactly
+TYPO_BUDGETS = ((8, 2), (4, 1))
+
+_lock = threading.Lock()
+_state = {"index": None, "checked_at": 0.0}
+
+
+def normalize(text):
+    """Lowercase ASCII words separated by single spaces"""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join("".join(char if char.isalnum() else " " for char in stripped).split())
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def typo_budget(word):
+    return next((budget for length, budget in TYPO_BUDGETS if len(word) >= length), 0)
+
+
+def prefix_distance(query, word, budget):
+    """
+    Fewest edits (insert, delete, substitute, swap neighbours) turning
+    ``query`` into some prefix of ``word``, or None if more than ``budget``
+    """
+    previous2 = None
+    previous = list(range(len(word) + 1))
+    for i, query_char in enumerate(query, 1):
+        current = [i]
+        for j, word_char in enumerate(word, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (query_char != word_char))
+            if i > 1 and j > 1 and query_char == word[j - 2] and query[i - 2] == word_char:
+                cost = min(cost, previous2[j - 2] + 1)
+            current.append(cost)
+        if min(current) > budget:
+            return None
+        previous2, previous = previous, current
+    distance = min(previous)
+    return distance if distance <= budget else None
+
+
+class ProgramIndex:
+    """Immutable typeahead index over the programs at one ``programs`` version"""
+
+    def __init__(self, version, rows):
+        self.version = version
+        # Positions in ``rows`` follow (normalized name, id), the final sort order
+        keyed = sorted(((normalize(row["name"]), row["id"]), row) for row in rows)
+        self.rows = [row for _, row in keyed]
+        self.sort_keys = [sort_key for sort_key, _ in keyed]
+        self.keys = [key for key, _ in self.sort_keys]
+        self.name_trigrams = defaultdict(set)
+        # Names share most of their words, so word matching and typo
+        # distances work on the distinct words and map back to positions
+        self.positions = defaultdict(set)
+        for position, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                self.name_trigrams[gram].add(position)
+            for word in key.split():
+                self.positions[word].add(position)
+        self.vocabulary = sorted(self.positions)
+        # Trigrams of "^word", so a prefix typed so far shares its leading ones
+        self.word_trigrams = defaultdict(set)
+        for word in self.vocabulary:
+            for gram in trigrams("^" + word):
+                self.word_trigrams[gram].add(word)
+
+    def _words_with_prefix(self, prefix):
+        start = bisect_left(self.vocabulary, prefix)
+        for word in self.vocabulary[start:]:
+            if not word.startswith(prefix):
+                break
+            yield word
+
+    def _with_word_prefix(self, prefix):
+        return set().union(*(self.positions[word] for word in self._words_with_prefix(prefix)))
+
+    def _exact(self, query):
+        """``{position: tier}`` for tiers 0 to 2"""
+        tiers = {}
+        start = bisect_left(self.keys, query)
+        for position in range(start, len(self.keys)):
+            if not self.keys[position].startswith(query):
+                break
+            tiers[position] = 0
+
+        matched = None
+        for word in query.split():
+            positions = self._with_word_prefix(word)
+            matched = positions if matched is None else matched & positions
+        for position in matched or ():
+            tiers.setdefault(position, 1)
+
+        # One or two letters inside a word match too much to be useful
+        if len(query) < 3:
+            return tiers
+        postings = sorted((self.name_trigrams.get(gram, set()) for gram in trigrams(query)), key=len)
+        for position in set.intersection(*postings):
+            if position not in tiers and query in self.keys[position]:
+                tiers[position] = 2
+        return tiers
+
+    def _word_distances(self, query_word):
+        """``{position: fewest edits}`` over the names with a word near ``query_word``"""
+        budget = typo_budget(query_word)
+        if not budget:
+            return dict.fromkeys(self._with_word_prefix(query_word), 0)
+        grams = trigrams("^" + query_word)
+        shared = Counter(word for gram in grams for word in self.word_trigrams.get(gram, ()))
+        # Each edit breaks at most three trigrams
+        needed = max(len(grams) - 3 * budget, 1)
+        distances = {}
+        for word, count in shared.items():
+            if count < needed:
+                continue
+            distance = prefix_distance(query_word, word, budget)
+            if distance is None:
+                continue
+            for position in self.positions[word]:
+                if distance < distances.get(position, budget + 1):
+                    distances[position] = distance
+        return distances
+
+    def _fuzzy(self, query, exclude):
+        """``{position: total edit distance}`` for tier 3"""
+        words = query.split()
+        if not any(typo_budget(word) for word in words):
+            return {}
+        totals = None
+        for word in words:
+            distances = self._word_distances(word)
+            if totals is None:
+                totals = distances
+            else:
+                totals = {position: total + distances[position] for position, total in totals.items() if position in distances}
+        return {position: total for position, total in totals.items() if position not in exclude}
+
+    def search(self, query, level=None, after=None, limit=50):
+        """
+        ``(rows, last sort key or None)`` of one page of matches for ``query``
+        at ``level``, starting after the sort key ``after``. An empty query
+        lists every program by name.
+        """
+        query = normalize(query)
+        if not query:
+            return self._listing(level, after, limit)
+
+        def best(ranked):
+            """The first ``limit + 1`` of ``ranked`` at ``level`` after ``after``"""
+            return heapq.nsmallest(limit + 1, (
+                (sort_key, position) for sort_key, position in ranked
+                if (not level or self.rows[position]["level"] == level) and (after is None or sort_key > after)
+            ))
+
+        tiers = self._exact(query)
+        page = best(
+            ((tier, 0, self.keys[position], self.rows[position]["id"]), position)
+            for position, tier in tiers.items()
+        )
+
+        # Fuzzy matches rank after every exact one, so they are only needed
+        # once the exact matches cannot fill the page
+        if len(page) <= limit:
+            page += best(
+                ((3, distance, self.keys[position], self.rows[position]["id"]), position)
+                for position, distance in self._fuzzy(query, tiers).items()
+            )
+        return self._page(page, limit)
+
+    def _listing(self, level, after, limit):
+        """Every program by name: a slice of the sorted rows, no ranking needed"""
+        start = 0 if after is None else bisect_right(self.sort_keys, tuple(after[2:]))
+        page = []
+        for position in range(start, len(self.rows)):
+            if not level or self.rows[position]["level"] == level:
+                page.append(((0, 0, *self.sort_keys[position]), position))
+                if len(page) > limit:
+                    break
+        return self._page(page, limit)
+
+    def _page(self, page, limit):
+        """Rows of the first ``limit`` of ``(sort key, position)`` pairs, and the cursor"""
+        rows = [self.rows[position] for _, position in page[:limit]]
+        return rows, page[limit - 1][0] if len(page) > limit else None
+
+
+def _check_interval():
+    return getattr(settings, "PROGRAM_INDEX_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL)
+
+
+def build_index():
+    # Read the stamp first: a write racing the load bumps it past this value
+    (version,) = CatalogVersion.current(CatalogVersion.PROGRAMS)
+    labels = dict(Program.ProgramLevel.choices)
+    rows = [
+        {"id": pk, "name": name, "level": level, "level_label": labels.get(level, level)}
+        for pk, name, level in Program.objects.values_list("id", "name", "level")
+    ]
+    return ProgramIndex(version, rows)
+
+
+def validate(version):
+    """Record a freshly read ``programs`` version, dropping a stale index"""
+    with _lock:
+        _state["checked_at"] = time.monotonic()
+        if _state["index"] is not None and _state["index"].version != version:
+            _state["index"] = None
+
+
+def get_index():
+    """The current index, revalidated or rebuilt as needed"""
+    with _lock:
+        now = time.monotonic()
+        index = _state["index"]
+        if index is not None and now - _state["checked_at"] >= _check_interval():
+            (version,) = CatalogVersion.current(CatalogVersion.PROGRAMS)
+            _state["checked_at"] = now
+            if index.version != version:
+                _state["index"] = None
+
+        if _state["index"] is None:
+            _state["index"] = build_index()
+            _state["checked_at"] = now
+        return _state["index"]
+
+
+def clear():
+    with _lock:
+        _state["index"] = None
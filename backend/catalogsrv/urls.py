@@ -6,5 +6,7 @@ urlpatterns = [
     path("catalog/assessment-types/", catalogsrv.views.AssessmentTypes.as_view(), name="assessment-types"),
     path("catalog/study-areas/", catalogsrv.views.StudyAreas.as_view(), name="study-areas"),
     path("catalog/program-levels/", catalogsrv.views.ProgramLevels.as_view(), name="program-levels"),
+    path("catalog/bootstrap/", catalogsrv.views.Bootstrap.as_view(), name="bootstrap"),
+    path("catalog/bootstrap/<str:content_hash>/", catalogsrv.views.BootstrapBundle.as_view(), name="bootstrap-bundle"),
     path("catalog/programs/", catalogsrv.views.Programs.as_view(), name="programs"),
 ]
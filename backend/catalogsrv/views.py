@@ -1,10 +1,25 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions
+from rest_framework import permissions, status
+from django.http import HttpResponse, HttpResponseRedirect
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
+from django.utils.cache import patch_cache_control
 from django.utils.decorators import method_decorator
-from catalogsrv.models import Program
-from .serializers import ProgramSerializer
+from django.views.decorators.http import condition
+from backend.etag import static_etag
+from backend.pagination import decode_cursor, encode_cursor
+from backend.query_budget import query_budget
+from catalogsrv import bootstrap, typeahead
+from catalogsrv.bootstrap import ASSESSMENT_TYPES, PROGRAM_LEVELS, STUDY_AREAS
+from catalogsrv.models import CatalogVersion
+from .serializers import ProgramSearchQuerySerializer
+
+
+def programs_etag(request, *args, **kwargs):
+    (version,) = CatalogVersion.current(CatalogVersion.PROGRAMS)
+    typeahead.validate(version)
+    return f"programs-{version}"
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -17,51 +32,106 @@ class HealthCheck(APIView):
 
 class AssessmentTypes(APIView):
     """Return hardcoded assessment types (moved from Course model choices)"""
+    # Public and user-independent: skip the JWT user lookup
+    authentication_classes = []
+
+    # Served from constants
+    @query_budget(0)
+    @method_decorator(condition(etag_func=static_etag(ASSESSMENT_TYPES)))
     def get(self, request):
-        assessment_types = [
-            {"value": "EXAM", "label": "Exam"},
-            {"value": "PROJECT", "label": "Project"},
-            {"value": "ASSIGNMENT", "label": "Assignment"},
-            {"value": "MIX", "label": "Mix"},
-        ]
-        return Response(assessment_types)
+        return Response(ASSESSMENT_TYPES)
 
 
 class StudyAreas(APIView):
     """Return hardcoded study areas (moved from Course model choices)"""
+    authentication_classes = []
+
+    @query_budget(0)
+    @method_decorator(condition(etag_func=static_etag(STUDY_AREAS)))
     def get(self, request):
-        study_areas = [
-            {"value": "BEL", "label": "Business, Economics & Law"},
-            {"value": "EAIT", "label": "Engineering, Architecture & Information Technology"},
-            {"value": "HABS", "label": "Health & Behavioural Sciences"},
-            {"value": "HMB", "label": "Health, Medicine and Behavioural Sciences"},
-            {"value": "HASS", "label": "Humanities, Arts & Social Sciences"},
-            {"value": "SCI", "label": "Science"},
-        ]
-        return Response(study_areas)
+        return Response(STUDY_AREAS)
 
 
 class ProgramLevels(APIView):
+    authentication_classes = []
+
+    @query_budget(0)
+    @method_decorator(condition(etag_func=static_etag(PROGRAM_LEVELS)))
     def get(self, request):
-        return Response([
-            {"value": choice[0], "label": choice[1]} for choice in Program.ProgramLevel.choices
-        ])
+        return Response(PROGRAM_LEVELS)
+
+
+def _bundle_redirect(content_hash):
+    return HttpResponseRedirect(reverse("bootstrap-bundle", args=[content_hash]))
+
+
+class Bootstrap(APIView):
+    """Redirect to the current content-hashed bootstrap bundle"""
+    authentication_classes = []
+
+    # Programs version, which the bundle embeds
+    @query_budget(1)
+    def get(self, request):
+        content_hash, _ = bootstrap.current()
+        response = _bundle_redirect(content_hash)
+        patch_cache_control(response, public=True, max_age=bootstrap.redirect_max_age())
+        return response
+
+
+class BootstrapBundle(APIView):
+    """The bootstrap bundle with hash ``content_hash``, cacheable forever"""
+    authentication_classes = []
+
+    # None when this worker rendered the bundle already, else the programs version
+    @query_budget(1)
+    def get(self, request, content_hash):
+        body = bootstrap.cached(content_hash)
+        if body is None:
+            current_hash, body = bootstrap.current()
+            if current_hash != content_hash:
+                # An outdated hash: send the client to the current bundle
+                response = _bundle_redirect(current_hash)
+                patch_cache_control(response, no_cache=True)
+                return response
+        response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = f'"{content_hash}"'
+        patch_cache_control(response, public=True, max_age=bootstrap.IMMUTABLE_MAX_AGE, immutable=True)
+        return response
+
+
+def _is_sort_key(values):
+    """Whether a decoded cursor has the shape of a typeahead sort key"""
+    return (
+        len(values) == 4
+        and all(isinstance(value, int) for value in (values[0], values[1], values[3]))
+        and isinstance(values[2], str)
+    )
 
 
 class Programs(APIView):
+    """Ranked program typeahead, served from the worker's ``typeahead`` index"""
+    authentication_classes = []
+
+    # Programs version for the ETag, plus the two queries of an index rebuild
+    @query_budget(3)
+    @method_decorator(condition(etag_func=programs_etag))
     def get(self, request):
-        level = request.query_params.get("level")
-        search = request.query_params.get("search", "").strip()
-        
-        qs = Program.objects.all()
-        
-        if level in dict(Program.ProgramLevel.choices):
-            qs = qs.filter(level=level)
-        
-        if search:
-            qs = qs.filter(name__icontains=search)
-        
-        # Limit results to prevent overwhelming the UI
-        qs = qs[:50]
-        
-        return Response(ProgramSerializer(qs, many=True).data)
+        query = ProgramSearchQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+
+        after = None
+        if params.get("cursor"):
+            try:
+                after = decode_cursor(params["cursor"])
+            except ValueError:
+                pass
+            if after is None or not _is_sort_key(after):
+                return Response({"cursor": ["Invalid cursor."]}, status=status.HTTP_400_BAD_REQUEST)
+            after = tuple(after)
+
+        rows, last = typeahead.get_index().search(
+            params["search"], level=params.get("level"), after=after, limit=params["limit"],
+        )
+        return Response({"results": rows, "next_cursor": encode_cursor(last) if last else None})
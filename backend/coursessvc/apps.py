@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CoursesSvcConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'coursessvc'
+
+    def ready(self):
+        # Register signal handlers that keep derived course data in sync
+        from . import signals  # noqa: F401
@@ -0,0 +1,94 @@
+"""
+Precomputed assessment profiles.
+
+``CourseAssessmentProfile`` condenses a course's assessments into the numbers
+the catalog filters on: task and hurdle counts, the heaviest exam, the exam
+share of the total weight and the pass/fail share of the tasks. Signal
+handlers queue a recompute whenever an assessment is written or a course is
+created, flushed after the transaction commits like ``coursessvc.documents``,
+so every course has a profile row to join against.
+"""
+import threading
+from collections import defaultdict
+
+from django.db import connections, transaction
+
+from coursessvc.models import Assessment, CatalogVersion, Course, CourseAssessmentProfile
+
+# Columns read per assessment, in the order ``build_profiles`` expects
+ASSESSMENT_COLUMNS = ("course_id", "category", "grading_type", "weight", "hurdle")
+
+FIELDS = ("task_count", "hurdle_count", "max_exam_weight", "exam_share", "pass_fail_share")
+
+_pending = threading.local()
+
+
+def is_exam(category):
+    """Whether a free-text assessment category (e.g. "Examination, Quiz") names an exam"""
+    return "exam" in category.lower()
+
+
+def _share(part, whole):
+    return round(100 * part / whole) if whole else 0
+
+
+def build_profiles(course_ids, assessments, profile_model=CourseAssessmentProfile):
+    """Unsaved profiles of ``course_ids`` from assessment rows in ``ASSESSMENT_COLUMNS`` order"""
+    tasks = defaultdict(list)
+    for course_id, *task in assessments:
+        tasks[course_id].append(task)
+
+    profiles = []
+    for course_id in course_ids:
+        rows = tasks.get(course_id, [])
+        exam_weights = [weight or 0 for category, _, weight, _ in rows if is_exam(category)]
+        total_weight = sum(weight or 0 for _, _, weight, _ in rows)
+        pass_fail = sum(1 for _, grading_type, _, _ in rows if grading_type == Assessment.GradingType.PASS_FAIL)
+        profiles.append(profile_model(
+            course_id=course_id,
+            task_count=len(rows),
+            hurdle_count=sum(1 for *_, hurdle in rows if hurdle),
+            max_exam_weight=max(exam_weights, default=0),
+            exam_share=_share(sum(exam_weights), total_weight),
+            pass_fail_share=_share(pass_fail, len(rows)),
+        ))
+    return profiles
+
+
+def render(course_ids):
+    """Recompute and store the profiles of ``course_ids`` (deleted courses just lose theirs)"""
+    course_ids = set(course_ids)
+    existing = list(Course.objects.filter(id__in=course_ids).values_list("id", flat=True))
+    rows = Assessment.objects.filter(course_id__in=existing).values_list(*ASSESSMENT_COLUMNS)
+    profiles = build_profiles(existing, rows)
+    # Upserted: signal flushes and bulk loads can render the same course at
+    # once (MySQL infers the unique key)
+    conflicts = {"update_conflicts": True, "update_fields": FIELDS}
+    if connections[CourseAssessmentProfile.objects.db].features.supports_update_conflicts_with_target:
+        conflicts["unique_fields"] = ["course"]
+    with transaction.atomic():
+        CourseAssessmentProfile.objects.bulk_create(profiles, **conflicts)
+        CourseAssessmentProfile.objects.filter(course_id__in=course_ids.difference(existing)).delete()
+        # Catalog snapshots read profiles lazily; make them reload
+        CatalogVersion.bump(CatalogVersion.CATALOG)
+
+
+def refresh(course_ids):
+    """Queue ``course_ids`` for a recompute once the current transaction commits"""
+    pending = _pending.__dict__.setdefault("ids", set())
+    pending.update(course_ids)
+    transaction.on_commit(_flush)
+
+
+def _flush():
+    course_ids = _pending.__dict__.pop("ids", None)
+    if course_ids:
+        render(course_ids)
+
+
+def rebuild(batch_size=1000):
+    """Recompute every course's profile; returns the number of courses"""
+    course_ids = list(Course.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(course_ids), batch_size):
+        render(course_ids[start:start + batch_size])
+    return len(course_ids)
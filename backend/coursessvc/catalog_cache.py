@@ -0,0 +1,159 @@
+"""
+Process-local cache of the serialized course catalog.
+
+Every gunicorn worker keeps one ``CatalogSnapshot``: the serialized catalog
+fields of every course, built with three queries. A snapshot is tagged with
+the ``catalog`` ``CatalogVersion`` it was built from and is revalidated
+against that counter at most once every ``CATALOG_CACHE_CHECK_INTERVAL``
+seconds, so a catalog write made by any worker of any replica is picked up
+within that delay. Views that have just read the counter themselves (for
+their ETag) hand it to ``validate`` and get an immediately consistent
+snapshot.
+
+Ratings change far more often than the catalog and are not cached here;
+views overlay them per request. Nor are the long ``aim`` and ``description``
+texts, which views read for just the rows they return, when asked for.
+Course detail responses are materialized separately by
+``coursessvc.documents``.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+from django.utils.functional import cached_property
+
+from coursessvc import assessment_profiles
+from coursessvc.models import CatalogVersion, Course, CourseAssessmentProfile
+from coursessvc.prereq_graph import PrerequisiteGraph
+from coursessvc.serializers import CATALOG_ROWS
+
+DEFAULT_CHECK_INTERVAL = 5.0
+
+_lock = threading.Lock()
+_state = {"snapshot": None, "checked_at": 0.0}
+_counters = {"hits": 0, "misses": 0, "checks": 0, "invalidations": 0}
+
+
+class CatalogSnapshot:
+    """Immutable view of the catalog at one ``catalog`` version"""
+
+    def __init__(self, version, rows):
+        self.version = version
+        # Ordered by code, matching the keyset pagination of CourseList
+        self.rows = rows
+        self.codes = [row["code"] for row in rows]
+        self.by_id = {row["id"]: row for row in rows}
+        self.by_code = {row["code"]: row for row in rows}
+        self._indexes = {}
+
+    @cached_property
+    def graph(self):
+        """Prerequisite DAG of this snapshot, built on first use"""
+        return PrerequisiteGraph.from_rows(self.rows)
+
+    @cached_property
+    def assessment_profiles(self):
+        """``{course_id: profile dict}``, loaded on first use by an assessment filter"""
+        rows = CourseAssessmentProfile.objects.values_list("course_id", *assessment_profiles.FIELDS)
+        return {course_id: dict(zip(assessment_profiles.FIELDS, values)) for course_id, *values in rows}
+
+    def rows_after(self, code=None, prefix=""):
+        """Rows whose code sorts after ``code`` (all rows when None) and starts with ``prefix``"""
+        return code_range(self.codes, self.rows, code, prefix)
+
+    def index(self, name):
+        """
+        ``{value: (codes, rows)}`` of column ``name``, each list in code order
+        for ``code_range``; built on first use by an exact filter.
+        """
+        index = self._indexes.get(name)
+        if index is None:
+            index = {}
+            for row in self.rows:
+                codes, rows = index.setdefault(row[name], ([], []))
+                codes.append(row["code"])
+                rows.append(row)
+            # Threads racing here build equal indexes; either may be kept
+            self._indexes[name] = index
+        return index
+
+
+def code_range(codes, rows, after=None, prefix=""):
+    """
+    The ``rows``, sorted by their ``codes``, whose code sorts after ``after``
+    and starts with ``prefix``, found by bisection rather than a scan.
+    """
+    start = bisect_left(codes, prefix)
+    if after is not None:
+        start = max(start, bisect_right(codes, after))
+    # The first code past the prefix range, e.g. "COMQ" for "COMP"
+    end = bisect_left(codes, prefix[:-1] + chr(ord(prefix[-1]) + 1)) if prefix else len(codes)
+    return rows[start:end]
+
+
+def _check_interval():
+    return getattr(settings, "CATALOG_CACHE_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL)
+
+
+def build_snapshot():
+    """Load the catalog from the database"""
+    # Read the stamp first: a write racing the load bumps it past this
+    # value, so the next check rebuilds rather than keeping stale rows.
+    (version,) = CatalogVersion.current(CatalogVersion.CATALOG)
+
+    rows = CATALOG_ROWS.rows(Course.objects.all())
+    # Sorted in Python so bisect agrees with the order regardless of collation
+    rows.sort(key=lambda row: row["code"])
+    return CatalogSnapshot(version, rows)
+
+
+def _invalidate_if_stale(version):
+    snapshot = _state["snapshot"]
+    if snapshot is not None and snapshot.version != version:
+        _state["snapshot"] = None
+        _counters["invalidations"] += 1
+
+
+def validate(version):
+    """Record a freshly read ``catalog`` version, dropping a stale snapshot"""
+    with _lock:
+        _state["checked_at"] = time.monotonic()
+        _invalidate_if_stale(version)
+
+
+def get_snapshot():
+    """The current snapshot, revalidated or rebuilt as needed"""
+    with _lock:
+        now = time.monotonic()
+        if _state["snapshot"] is not None and now - _state["checked_at"] >= _check_interval():
+            _counters["checks"] += 1
+            (version,) = CatalogVersion.current(CatalogVersion.CATALOG)
+            _state["checked_at"] = now
+            _invalidate_if_stale(version)
+
+        if _state["snapshot"] is not None:
+            _counters["hits"] += 1
+            return _state["snapshot"]
+
+        _counters["misses"] += 1
+        snapshot = build_snapshot()
+        _state["snapshot"] = snapshot
+        _state["checked_at"] = now
+        return snapshot
+
+
+def clear():
+    with _lock:
+        _state["snapshot"] = None
+
+
+def get_stats():
+    """Hit/miss counters of this process, for monitoring"""
+    with _lock:
+        snapshot = _state["snapshot"]
+        return {
+            **_counters,
+            "version": snapshot.version if snapshot else None,
+            "courses": len(snapshot.rows) if snapshot else 0,
+        }
@@ -0,0 +1,171 @@
+"""
+SQL-side transitive closure of the prerequisite graph.
+
+``CoursePrerequisiteClosure`` turns recursive questions ("every course that
+eventually requires COMP1100", "everything needed before COMP3506") into a
+single indexed join against ``Course``. A new link adds the pairs it
+connects, computed from the closure rows on either side of it. A removed or
+changed link recomputes the rows of its course and of every course that
+transitively requires it, from the links above them; nothing else can be
+affected.
+"""
+from collections import defaultdict, deque
+
+from django.db import transaction
+
+from coursessvc.models import CoursePrerequisite, CoursePrerequisiteClosure
+
+
+def ancestors(prereqs_by_course, course_id):
+    """``{ancestor id: shortest chain length}`` for a course, by breadth-first search"""
+    depths = {course_id: 0}
+    queue = deque([course_id])
+    while queue:
+        node = queue.popleft()
+        for prereq in prereqs_by_course.get(node, ()):
+            if prereq not in depths:
+                depths[prereq] = depths[node] + 1
+                queue.append(prereq)
+    # A cycle leads back to the course itself, which is not its own ancestor
+    del depths[course_id]
+    return depths
+
+
+def closure_rows(links, course_ids=None):
+    """``(ancestor, descendant, depth)`` for ``(course_id, prereq_id)`` links, optionally only for some descendants"""
+    prereqs_by_course = defaultdict(list)
+    for course_id, prereq_id in links:
+        prereqs_by_course[course_id].append(prereq_id)
+    if course_ids is None:
+        course_ids = list(prereqs_by_course)
+    return [
+        (ancestor, course_id, depth)
+        for course_id in course_ids
+        for ancestor, depth in ancestors(prereqs_by_course, course_id).items()
+    ]
+
+
+def _batches(ids, size):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _create(rows, batch_size=1000):
+    CoursePrerequisiteClosure.objects.bulk_create(
+        [
+            CoursePrerequisiteClosure(ancestor_id=ancestor, descendant_id=descendant, depth=depth)
+            for ancestor, descendant, depth in rows
+        ],
+        batch_size=batch_size,
+    )
+
+
+def _links_above(course_ids, affected, batch_size):
+    """
+    ``(course_id, prereq_id)`` links of ``course_ids`` and of every course
+    they require. Outside ``affected`` the closure table is current, so a
+    course's ancestors are taken from it in one step rather than link by link.
+    """
+    links = []
+    seen = set(course_ids)
+    frontier = list(seen)
+    while frontier:
+        found = set()
+        for batch in _batches(frontier, batch_size):
+            for link in CoursePrerequisite.objects.filter(course_id__in=batch).values_list("course_id", "prereq_id"):
+                links.append(link)
+                found.add(link[1])
+        found -= seen
+        for batch in _batches(found - affected, batch_size):
+            found.update(
+                CoursePrerequisiteClosure.objects.filter(descendant_id__in=batch).values_list("ancestor_id", flat=True)
+            )
+        found -= seen
+        seen |= found
+        frontier = list(found)
+    return links
+
+
+def add(course_id, prereq_id, batch_size=1000):
+    """
+    Extend the closure for a new link from ``course_id`` to ``prereq_id``:
+    the prerequisite and its ancestors now come before the course and its
+    descendants, at the shorter of the new chain and any existing one.
+    """
+    with transaction.atomic():
+        above = dict(
+            CoursePrerequisiteClosure.objects.filter(descendant_id=prereq_id).values_list("ancestor_id", "depth")
+        )
+        above[prereq_id] = 0
+        below = dict(
+            CoursePrerequisiteClosure.objects.filter(ancestor_id=course_id).values_list("descendant_id", "depth")
+        )
+        below[course_id] = 0
+        depths = {
+            (ancestor, descendant): up + 1 + down
+            for ancestor, up in above.items()
+            for descendant, down in below.items()
+            # A link closing a cycle does not make a course its own ancestor
+            if ancestor != descendant
+        }
+        shorter = []
+        for ancestors_batch in _batches(above, batch_size):
+            for descendants_batch in _batches(below, batch_size):
+                for row_id, ancestor, descendant, depth in CoursePrerequisiteClosure.objects.filter(
+                    ancestor_id__in=ancestors_batch, descendant_id__in=descendants_batch,
+                ).values_list("id", "ancestor_id", "descendant_id", "depth"):
+                    new_depth = depths.pop((ancestor, descendant))
+                    if new_depth < depth:
+                        shorter.append(CoursePrerequisiteClosure(id=row_id, depth=new_depth))
+        CoursePrerequisiteClosure.objects.bulk_update(shorter, ["depth"], batch_size=batch_size)
+        _create(((ancestor, descendant, depth) for (ancestor, descendant), depth in depths.items()), batch_size)
+
+
+def refresh(course_id):
+    """Recompute the closure after the prerequisites of ``course_id`` changed"""
+    refresh_many([course_id])
+
+
+def refresh_many(course_ids, batch_size=1000):
+    """
+    Recompute the closure after the prerequisites of every course in
+    ``course_ids`` changed. Only they and the courses requiring them can
+    gain or lose ancestors; their rows are rebuilt from the links of the
+    courses above them, not from the whole graph.
+    """
+    course_ids = set(course_ids)
+    with transaction.atomic():
+        affected = set(course_ids)
+        for batch in _batches(course_ids, batch_size):
+            affected.update(
+                CoursePrerequisiteClosure.objects.filter(ancestor_id__in=batch).values_list("descendant_id", flat=True)
+            )
+        rows = {
+            (ancestor, descendant): depth
+            for ancestor, descendant, depth in closure_rows(_links_above(affected, affected, batch_size), affected)
+        }
+        # Most rows survive a change; write only the ones that differ
+        stale = []
+        changed = []
+        for batch in _batches(affected, batch_size):
+            for row_id, ancestor, descendant, depth in CoursePrerequisiteClosure.objects.filter(
+                descendant_id__in=batch,
+            ).values_list("id", "ancestor_id", "descendant_id", "depth"):
+                new_depth = rows.pop((ancestor, descendant), None)
+                if new_depth is None:
+                    stale.append(row_id)
+                elif new_depth != depth:
+                    changed.append(CoursePrerequisiteClosure(id=row_id, depth=new_depth))
+        for batch in _batches(stale, batch_size):
+            CoursePrerequisiteClosure.objects.filter(id__in=batch).delete()
+        CoursePrerequisiteClosure.objects.bulk_update(changed, ["depth"], batch_size=batch_size)
+        _create(((ancestor, descendant, depth) for (ancestor, descendant), depth in rows.items()), batch_size)
+
+def rebuild(batch_size=1000):
+    """Recompute the whole table; returns the number of rows written"""
+    with transaction.atomic():
+        rows = closure_rows(CoursePrerequisite.objects.values_list("course_id", "prereq_id"))
+        CoursePrerequisiteClosure.objects.all().delete()
+        _create(rows, batch_size)
+    return len(rows)
@@ -0,0 +1,142 @@
+"""
+Materialized CourseDetail responses.
+
+The JSON body of each course's detail endpoint is rendered once and stored in
+``CourseDetailDocument``. Signal handlers queue a re-render whenever the
+course, its assessments, prerequisites, reviews or rating stats are written;
+the queue is flushed after the surrounding transaction commits, so a
+document never captures a half-applied write. A detail request is then one
+primary-key read returning the stored bytes.
+
+Documents embed only the newest ``DETAIL_REVIEW_LIMIT`` reviews next to the
+rating aggregates, so their size does not grow with a course's review count.
+"""
+import hashlib
+import threading
+
+from django.db import connections, transaction
+from django.db.models import Prefetch
+from rest_framework.settings import api_settings
+
+from backend.pagination import encode_cursor
+
+from coursessvc.models import Assessment, Course, CourseDetailDocument, CourseReview, empty_rating_histogram
+from coursessvc.serializers import CourseSerializer, rating_stats_for
+
+# Bump whenever the output of ``course_detail_data`` changes shape
+FORMAT_VERSION = 2
+
+# Newest reviews embedded in a document; the rest are paged through
+# CourseReviews starting from ``reviews_next_cursor``
+DETAIL_REVIEW_LIMIT = 10
+
+_pending = threading.local()
+
+
+def course_detail_data(course):
+    """CourseDetail payload for a course loaded by ``_detail_rows``"""
+    course_data = CourseSerializer(course).data
+    course_data['assessments'] = [
+        {
+            'id': assessment.id,
+            'category': assessment.category,
+            'task': assessment.task,
+            'mode': assessment.mode,
+            'grading_type': assessment.grading_type,
+            'weight': assessment.weight,
+            'description': assessment.description,
+            'hurdle': assessment.hurdle,
+            'hurdle_description': assessment.hurdle_description,
+        }
+        for assessment in course.assessments.all()
+    ]
+    reviews = course.newest_reviews
+    course_data['reviews'] = [
+        {
+            'id': review.id,
+            'review': float(review.review),
+            'description': review.description,
+            'created_at': review.created_at.isoformat(),
+            'user': {'username': review.user.username}
+        }
+        for review in reviews[:DETAIL_REVIEW_LIMIT]
+    ]
+    # Same cursor as CourseReviews' "newest" sort after the last embedded review
+    last = reviews[DETAIL_REVIEW_LIMIT - 1] if len(reviews) > DETAIL_REVIEW_LIMIT else None
+    course_data['reviews_next_cursor'] = encode_cursor([last.created_at, last.id]) if last else None
+    stats = rating_stats_for(course)
+    course_data['rating_histogram'] = stats.histogram if stats else empty_rating_histogram()
+    course_data['prerequisites'] = [prereq.code for prereq in course.prerequisites.all()]
+    return course_data
+
+
+def _detail_rows():
+    return Course.objects.select_related('rating_stats').prefetch_related(
+        Prefetch('assessments', queryset=Assessment.objects.order_by('id')),
+        # One more than embedded, to tell whether a next page exists
+        Prefetch(
+            'reviews',
+            queryset=CourseReview.objects.select_related('user').order_by('-created_at', '-id')[:DETAIL_REVIEW_LIMIT + 1],
+            to_attr='newest_reviews',
+        ),
+        Prefetch('prerequisites', queryset=Course.objects.only('code').order_by('code')),
+    )
+
+
+def render(course_ids):
+    """Re-render and store the documents of ``course_ids``; returns them by course id"""
+    course_ids = set(course_ids)
+    # The configured JSON renderer, so documents match live responses
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    documents = {}
+    for course in _detail_rows().filter(id__in=course_ids):
+        body = renderer.render(course_detail_data(course))
+        documents[course.id] = CourseDetailDocument(
+            course=course,
+            format_version=FORMAT_VERSION,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            body=body,
+        )
+
+    # Upserted: a request missing the document and a post-commit flush
+    # render the same course concurrently (MySQL infers the unique key)
+    conflicts = {'update_conflicts': True, 'update_fields': ['format_version', 'etag', 'body', 'updated_at']}
+    if connections[CourseDetailDocument.objects.db].features.supports_update_conflicts_with_target:
+        conflicts['unique_fields'] = ['course']
+    with transaction.atomic():
+        CourseDetailDocument.objects.bulk_create(documents.values(), **conflicts)
+        # Ids without a course (deleted since) just lose their document
+        CourseDetailDocument.objects.filter(course_id__in=course_ids - documents.keys()).delete()
+    return documents
+
+
+def refresh(course_ids):
+    """Queue ``course_ids`` for re-rendering once the current transaction commits"""
+    pending = _pending.__dict__.setdefault("ids", set())
+    pending.update(course_ids)
+    # Every caller registers a flush; the first to run renders the whole
+    # batch and the rest find it empty. Ids left behind by a rolled-back
+    # transaction are re-rendered with the next batch, which is harmless.
+    transaction.on_commit(_flush)
+
+
+def _flush():
+    course_ids = _pending.__dict__.pop("ids", None)
+    if course_ids:
+        render(course_ids)
+
+
+def get_document(course_id):
+    """The stored document for a course, rendered on first use; None if no such course"""
+    document = CourseDetailDocument.objects.filter(course_id=course_id).first()
+    if document is None or document.format_version != FORMAT_VERSION:
+        document = render([course_id]).get(course_id)
+    return document
+
+
+def rebuild_all(batch_size=200):
+    """Re-render every course's document; returns the number of courses"""
+    course_ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(course_ids), batch_size):
+        render(course_ids[start:start + batch_size])
+    return len(course_ids)
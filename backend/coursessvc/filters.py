@@ -0,0 +1,102 @@
+"""
+Server-side filtering for the course catalog.
+
+Each filter maps onto a column covered by one of the composite indexes on
+``Course`` so that a filtered page is an index range scan ordered by code.
+Assessment-mix filters are range predicates on the indexed columns of the
+course's ``CourseAssessmentProfile``. Over a cached catalog snapshot,
+``candidate_rows`` narrows the scan the same way: a code-prefix range found
+by bisection, or the snapshot's per-value rows of an exact filter.
+"""
+import operator
+
+from coursessvc.catalog_cache import code_range
+
+EXACT_FILTERS = (
+    "study_area",
+    "level",
+    "credits",
+    "assessment_type",
+    "offered_sem_1",
+    "offered_sem_2",
+    "offered_summer",
+)
+
+# Query parameter -> (CourseAssessmentProfile field, comparison)
+PROFILE_FILTERS = {
+    "max_exam_weight": ("max_exam_weight", "lte"),
+    "max_exam_share": ("exam_share", "lte"),
+    "max_hurdles": ("hurdle_count", "lte"),
+    "min_pass_fail_share": ("pass_fail_share", "gte"),
+    "max_pass_fail_share": ("pass_fail_share", "lte"),
+    "min_tasks": ("task_count", "gte"),
+    "max_tasks": ("task_count", "lte"),
+}
+
+_COMPARISONS = {"lte": operator.le, "gte": operator.ge}
+
+
+def uses_profile(params):
+    """Whether any assessment-mix filter is set"""
+    return any(params.get(name) is not None for name in PROFILE_FILTERS)
+
+
+def filter_courses(queryset, params):
+    """Apply validated ``CourseListQuerySerializer`` data to a Course queryset"""
+    lookups = {
+        name: params[name]
+        for name in EXACT_FILTERS
+        if params.get(name) is not None
+    }
+    code_prefix = params.get("code_prefix")
+    if code_prefix:
+        lookups["code__startswith"] = code_prefix.upper()
+    requires = params.get("requires")
+    if requires:
+        # One join on the closure table; pairs are unique, so no duplicates
+        lookups["closure_ancestors__ancestor__code"] = requires.upper()
+    for name, (field, comparison) in PROFILE_FILTERS.items():
+        if params.get(name) is not None:
+            lookups[f"assessment_profile__{field}__{comparison}"] = params[name]
+    return queryset.filter(**lookups)
+
+
+def candidate_rows(snapshot, params, after=None):
+    """
+    Rows of a ``CatalogSnapshot`` that can match ``params``, past the keyset
+    ``after``, in code order: the shortest of the ``code_prefix`` range and
+    the snapshot's index list of each exact filter given. Each still has to
+    pass ``course_matches``.
+    """
+    prefix = (params.get("code_prefix") or "").upper()
+    best = snapshot.rows_after(after, prefix)
+    for name in EXACT_FILTERS:
+        value = params.get(name)
+        if value is not None:
+            rows = code_range(*snapshot.index(name).get(value, ((), ())), after, prefix)
+            if len(rows) < len(best):
+                best = rows
+    return best
+
+
+def course_matches(row, params, profile=None):
+    """
+    In-memory twin of ``filter_courses`` for cached catalog rows, with the
+    course's assessment profile as a dict (None if it has none); ``requires``
+    is answered by the snapshot's prerequisite graph instead.
+    """
+    for name in EXACT_FILTERS:
+        value = params.get(name)
+        if value is not None and row[name] != value:
+            return False
+    code_prefix = params.get("code_prefix")
+    if code_prefix and not row["code"].startswith(code_prefix.upper()):
+        return False
+    for name, (field, comparison) in PROFILE_FILTERS.items():
+        value = params.get(name)
+        if value is None:
+            continue
+        # Like the join in filter_courses, no profile means no match
+        if profile is None or not _COMPARISONS[comparison](profile[field], value):
+            return False
+    return True
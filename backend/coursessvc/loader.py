@@ -0,0 +1,394 @@
+"""
+Bulk catalog loading for the ``load_catalog`` command.
+
+Courses, assessments and prerequisite links are read as streams of records
+from JSONL or CSV files and written in chunks, each chunk in its own
+transaction:
+
+* courses are upserted by ``code``: one lookup, one ``bulk_create`` and one
+  ``bulk_update`` per chunk;
+* assessments replace the existing assessments of each course they name;
+* prerequisite links, given in a course's ``prerequisites`` field or as
+  ``course``/``prereq`` code pairs, replace the links of each course they
+  name. They are resolved in a second pass, through a code-to-id map read
+  once every course exists.
+
+Every step compares what it reads with what is stored and writes only
+courses, assessments and links that differ, so ``LoadStats.codes`` names
+just the changed courses.
+
+Bulk writes bypass the model signals, so ``refresh_derived`` brings the
+search index, closure table, assessment profiles, detail documents and
+catalog version up to date once at the end, for the changed courses only.
+A failed load leaves the chunks before the failure committed, and they are
+refreshed all the same; loading is idempotent, so the fix is to correct the
+file and run it again.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from coursessvc import assessment_profiles, closure, search
+from coursessvc.models import (
+    Assessment, CatalogVersion, Course, CourseDetailDocument, CoursePrerequisite,
+)
+
+DEFAULT_BATCH_SIZE = 1000
+# bulk_update builds a CASE per column and row; large statements get slow
+UPDATE_BATCH_SIZE = 100
+
+COURSE_FIELDS = [
+    column.name for column in Course._meta.concrete_fields if not column.primary_key
+]
+# Fields a new course needs a value for: NOT NULL, with no default
+REQUIRED_COURSE_FIELDS = [
+    column.name for column in Course._meta.concrete_fields
+    if not (column.primary_key or column.null or column.has_default() or column.empty_strings_allowed)
+]
+ASSESSMENT_FIELDS = [
+    column.name for column in Assessment._meta.concrete_fields
+    if not column.primary_key and column.name != "course"
+]
+
+_TRUE = {"1", "t", "true", "y", "yes"}
+_FALSE = {"0", "f", "false", "n", "no", ""}
+
+
+class LoadError(Exception):
+    """A record that cannot be loaded, with where it came from"""
+
+
+@dataclass
+class LoadStats:
+    created: int = 0
+    updated: int = 0
+    written: int = 0
+    skipped: int = 0
+    # Codes of the courses whose rows were created or changed
+    codes: set = field(default_factory=set)
+    # Codes referenced but not in the catalog, capped for reporting
+    unknown_codes: set = field(default_factory=set)
+
+    def skip(self, code):
+        self.skipped += 1
+        if len(self.unknown_codes) < 20:
+            self.unknown_codes.add(code)
+
+
+def read_records(path):
+    """Yield ``("path:line", record dict)`` from a ``.jsonl``/``.ndjson`` or ``.csv`` file"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        with path.open(encoding="utf-8") as lines:
+            for number, line in enumerate(lines, 1):
+                if line.strip():
+                    try:
+                        yield f"{path}:{number}", json.loads(line)
+                    except ValueError as exc:
+                        raise LoadError(f"{path}:{number}: {exc}") from exc
+    elif suffix == ".csv":
+        with path.open(encoding="utf-8", newline="") as rows:
+            # Line 1 is the header
+            for number, row in enumerate(csv.DictReader(rows), 2):
+                yield f"{path}:{number}", row
+    else:
+        raise LoadError(f"{path}: expected a .jsonl, .ndjson or .csv file")
+
+
+def chunks(records, size):
+    records = iter(records)
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+def _convert(model, name, value):
+    """Model value for a JSON or CSV ``value`` of field ``name``"""
+    model_field = model._meta.get_field(name)
+    if isinstance(value, str) and model_field.get_internal_type() == "BooleanField":
+        if value.strip().lower() not in _TRUE | _FALSE:
+            raise ValidationError(f"{value!r} is not a boolean")
+        return value.strip().lower() in _TRUE
+    if value == "" and model_field.null:
+        return None
+    value = model_field.to_python(value)
+    if model_field.choices and value not in {choice for choice, _ in model_field.flatchoices}:
+        raise ValidationError(f"{value!r} is not a valid choice")
+    return value
+
+
+def _fields(model, names, record, where):
+    try:
+        return {name: _convert(model, name, record[name]) for name in names if name in record}
+    except ValidationError as exc:
+        raise LoadError(f"{where}: {'; '.join(exc.messages)}") from exc
+
+
+def _codes(value):
+    """Prerequisite codes from a JSON list or a ``;``/``,`` separated string"""
+    if isinstance(value, str):
+        value = value.replace(";", ",").split(",")
+    return [code.strip() for code in value or [] if code and code.strip()]
+
+
+def load_courses(records, batch_size=DEFAULT_BATCH_SIZE, links=None, stats=None):
+    """
+    Upsert ``(source, record)`` course records by code. Prerequisite codes
+    found on the records are added to ``links`` (course code to codes) for
+    ``load_prerequisites``. Returns a ``LoadStats``; pass ``stats`` to have
+    it filled in chunk by chunk, so it still names the committed courses
+    when a later record raises ``LoadError``.
+    """
+    stats = stats if stats is not None else LoadStats()
+    for chunk in chunks(records, batch_size):
+        # Last record wins when a code repeats within a chunk
+        by_code = {}
+        sources = {}
+        for where, record in chunk:
+            code = str(record.get("code") or "").strip()
+            if not code:
+                raise LoadError(f"{where}: course without a code")
+            values = _fields(Course, COURSE_FIELDS, record, where)
+            values["code"] = code
+            # Rows written from anything but the scraper lose its hash, so
+            # the next scrape rewrites them
+            values.setdefault("content_hash", "")
+            by_code[code] = values
+            sources[code] = where
+            if links is not None and "prerequisites" in record:
+                links[code] = _codes(record["prerequisites"])
+
+        existing = {row["code"]: row for row in Course.objects.filter(code__in=by_code).values("id", *COURSE_FIELDS)}
+        for code, values in by_code.items():
+            missing = [name for name in REQUIRED_COURSE_FIELDS if values.get(name) is None]
+            if code not in existing and missing:
+                raise LoadError(f"{sources[code]}: new course {code} without {', '.join(missing)}")
+        new = [Course(**values) for code, values in by_code.items() if code not in existing]
+        # Unchanged rows are left alone; with the assessment and link diffs
+        # below, reloading an unchanged file costs reads only.
+        # bulk_update writes one field list per call; group records by theirs.
+        updates = {}
+        for code, values in by_code.items():
+            current = existing.get(code)
+            if current is not None and any(current[name] != value for name, value in values.items()):
+                updates.setdefault(tuple(sorted(values)), []).append(Course(id=current["id"], **values))
+
+        with transaction.atomic():
+            Course.objects.bulk_create(new, batch_size=batch_size)
+            for names, courses in updates.items():
+                Course.objects.bulk_update(courses, [name for name in names if name != "code"], batch_size=UPDATE_BATCH_SIZE)
+        stats.created += len(new)
+        stats.updated += sum(len(courses) for courses in updates.values())
+        stats.written += len(by_code)
+        stats.codes.update(course.code for course in new)
+        stats.codes.update(course.code for courses in updates.values() for course in courses)
+    return stats
+
+
+def _delete(queryset):
+    """
+    Delete without collecting rows for post_delete signals: their per-row
+    refreshes are what ``refresh_derived`` does once for the whole load.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def course_ids_by_code():
+    return dict(Course.objects.values_list("code", "id"))
+
+
+def _runs(records):
+    """``(course code, [(source, record), ...])`` for each run of records naming the same course"""
+    code, run = None, []
+    for where, record in records:
+        record_code = str(record.get("course") or "").strip()
+        if run and record_code != code:
+            yield code, run
+            run = []
+        code = record_code
+        run.append((where, record))
+    if run:
+        yield code, run
+
+
+def _run_chunks(runs, size):
+    """Whole runs, grouped until a group holds at least ``size`` records"""
+    chunk, count = [], 0
+    for run in runs:
+        chunk.append(run)
+        count += len(run[1])
+        if count >= size:
+            yield chunk
+            chunk, count = [], 0
+    if chunk:
+        yield chunk
+
+
+def load_assessments(records, batch_size=DEFAULT_BATCH_SIZE, ids=None, cleared=(), stats=None):
+    """
+    Load ``(source, record)`` assessment records naming their course by
+    ``course`` code. The records of a course replace its assessments, and
+    are written only when they differ from the stored ones; a file is
+    expected to list each course's records together. Records of a course
+    that turn up again later are added to the first ones. Courses in
+    ``cleared`` that no record names are left with no assessments. ``stats``
+    is as for ``load_courses``.
+    """
+    ids = ids if ids is not None else course_ids_by_code()
+    stats = stats if stats is not None else LoadStats()
+    seen = set()
+    for chunk in _run_chunks(_runs(records), batch_size):
+        incoming = {}
+        codes = {}
+        for code, run in chunk:
+            if code not in ids:
+                for _ in run:
+                    stats.skip(code)
+                continue
+            codes[ids[code]] = code
+            for where, record in run:
+                values = _fields(Assessment, ASSESSMENT_FIELDS, record, where)
+                incoming.setdefault(ids[code], []).append(Assessment(course_id=ids[code], **values))
+                stats.written += 1
+
+        first = incoming.keys() - seen
+        stored = {}
+        for course_id, *values in (
+            Assessment.objects.filter(course_id__in=first)
+            .order_by("course_id", "id")
+            .values_list("course_id", *ASSESSMENT_FIELDS)
+        ):
+            stored.setdefault(course_id, []).append(tuple(values))
+
+        clear = set()
+        new = []
+        for course_id, assessments in incoming.items():
+            if course_id in first:
+                rows = [tuple(getattr(assessment, name) for name in ASSESSMENT_FIELDS) for assessment in assessments]
+                if rows == stored.get(course_id, []):
+                    continue
+                clear.add(course_id)
+            new += assessments
+            stats.codes.add(codes[course_id])
+
+        with transaction.atomic():
+            _delete(Assessment.objects.filter(course_id__in=clear))
+            Assessment.objects.bulk_create(new, batch_size=batch_size)
+        seen |= incoming.keys()
+        stats.created += len(new)
+
+    codes = {ids[code]: code for code in cleared if code in ids and ids[code] not in seen}
+    for chunk in chunks(codes, batch_size):
+        stored = set(Assessment.objects.filter(course_id__in=chunk).values_list("course_id", flat=True).distinct())
+        if stored:
+            _delete(Assessment.objects.filter(course_id__in=stored))
+            stats.codes.update(codes[course_id] for course_id in stored)
+    return stats
+
+
+def load_prerequisites(links, batch_size=DEFAULT_BATCH_SIZE, ids=None, stats=None):
+    """
+    Replace the prerequisites of each course in ``links``, an iterable of
+    ``(course code, [prerequisite codes])`` pairs, where they differ from
+    the stored ones. Unknown codes and links from a course to itself are
+    skipped. ``stats`` is as for ``load_courses``.
+    """
+    ids = ids if ids is not None else course_ids_by_code()
+    stats = stats if stats is not None else LoadStats()
+    for chunk in chunks(links, batch_size):
+        incoming = {}
+        codes = {}
+        for code, prereq_codes in chunk:
+            if code not in ids:
+                stats.skip(code)
+                continue
+            codes[ids[code]] = code
+            prereq_ids = incoming.setdefault(ids[code], set())
+            for prereq_code in prereq_codes:
+                if prereq_code not in ids:
+                    stats.skip(prereq_code)
+                elif prereq_code != code:
+                    prereq_ids.add(ids[prereq_code])
+            stats.written += len(prereq_ids)
+
+        stored = {}
+        for course_id, prereq_id in CoursePrerequisite.objects.filter(course_id__in=incoming).values_list(
+            "course_id", "prereq_id"
+        ):
+            stored.setdefault(course_id, set()).add(prereq_id)
+        changed = {course_id for course_id, prereq_ids in incoming.items() if prereq_ids != stored.get(course_id, set())}
+        rows = [
+            CoursePrerequisite(course_id=course_id, prereq_id=prereq_id)
+            for course_id in changed for prereq_id in incoming[course_id]
+        ]
+
+        with transaction.atomic():
+            _delete(CoursePrerequisite.objects.filter(course_id__in=changed))
+            CoursePrerequisite.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+        stats.codes.update(codes[course_id] for course_id in changed)
+        stats.created += len(rows)
+    return stats
+
+
+def group_links(records):
+    """``(course code, [prerequisite codes])`` pairs from ``course``/``prereq`` link records"""
+    links = {}
+    for _, record in records:
+        code = str(record.get("course") or "").strip()
+        links.setdefault(code, []).extend(_codes([str(record.get("prereq") or "")]))
+    return links
+
+
+def refresh_derived(course_ids, batch_size=DEFAULT_BATCH_SIZE, prerequisites=()):
+    """
+    Bring everything the skipped signals maintain up to date for the changed
+    ``course_ids``. Closure rows are recomputed for ``prerequisites``, the
+    ids of courses whose links changed, and the courses requiring them.
+    Nothing is done, and the catalog version is kept, when no course changed.
+    """
+    if not course_ids:
+        return
+    course_ids = sorted(course_ids)
+    fields = ["id", *search.FIELD_WEIGHTS]
+    for start in range(0, len(course_ids), batch_size):
+        batch = course_ids[start:start + batch_size]
+        search.index_courses(Course.objects.only(*fields).filter(id__in=batch))
+        assessment_profiles.render(batch)
+        # Re-rendered on first request
+        CourseDetailDocument.objects.filter(course_id__in=batch).delete()
+    if prerequisites:
+        closure.refresh_many(prerequisites, batch_size)
+    CatalogVersion.bump(CatalogVersion.CATALOG)
+
+
+def refresh_codes(codes, batch_size=DEFAULT_BATCH_SIZE, prerequisites=()):
+    """
+    ``refresh_derived`` for course codes, such as the ``LoadStats.codes``
+    of a load that stopped part way, before any code-to-id map was read.
+    """
+    ids = {}
+    for chunk in chunks(set(codes) | set(prerequisites), batch_size):
+        ids.update(Course.objects.filter(code__in=chunk).values_list("code", "id"))
+    refresh_derived(
+        {ids[code] for code in codes if code in ids},
+        batch_size,
+        prerequisites={ids[code] for code in prerequisites if code in ids},
+    )
+
+
+def store_content_hashes(hashes, batch_size=DEFAULT_BATCH_SIZE, ids=None):
+    """
+    Set ``content_hash`` from ``hashes`` (course code to hash). The scraper
+    stores them last, once a course's assessments and links are written
+    too, so an interrupted scrape leaves the course to be fetched again.
+    """
+    ids = ids if ids is not None else course_ids_by_code()
+    courses = [Course(id=ids[code], content_hash=value) for code, value in hashes.items() if code in ids]
+    for chunk in chunks(courses, batch_size):
+        with transaction.atomic():
+            Course.objects.bulk_update(chunk, ["content_hash"], batch_size=UPDATE_BATCH_SIZE)
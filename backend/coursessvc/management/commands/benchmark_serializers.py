@@ -0,0 +1,109 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from backend.renderers import ORJSONRenderer
+from coursessvc.models import Course, CoursePrerequisite
+from coursessvc.serializers import COURSE_ROWS, CourseSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/second of CourseSerializer against the RowMapper fast path "
+        "on a synthetic catalog. Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--courses',
+            type=int,
+            default=10000,
+            help='Size of the catalog to benchmark against',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per variant; the best one is reported',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                total = self.populate(options['courses'])
+                self.run(total, options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def populate(self, target):
+        """Top the catalog up to ``target`` courses, two prerequisites each"""
+        existing = Course.objects.count()
+        # bulk_create skips the signals, so no search or document work
+        Course.objects.bulk_create(
+            [
+                Course(
+                    name=f"Benchmark course {i}",
+                    code=f"BENCH{i:05d}",
+                    level=1 + i % 4,
+                    credits=2,
+                    aim="Synthetic course used to benchmark serialization.",
+                    description="Synthetic course used to benchmark serialization. " * 8,
+                    assessment_type=Course.AssessmentType.EXAM,
+                    study_area=Course.StudyArea.SCI,
+                    offered_sem_1=bool(i % 2),
+                )
+                for i in range(max(target - existing, 0))
+            ],
+            batch_size=1000,
+        )
+        ids = list(Course.objects.filter(code__startswith="BENCH").values_list('id', flat=True))
+        CoursePrerequisite.objects.bulk_create(
+            [
+                CoursePrerequisite(course_id=course_id, prereq_id=prereq_id)
+                for course_id, prereq_id in zip(ids[2:], ids)
+            ] + [
+                CoursePrerequisite(course_id=course_id, prereq_id=prereq_id)
+                for course_id, prereq_id in zip(ids[2:], ids[1:])
+            ],
+            batch_size=1000,
+        )
+        return Course.objects.count()
+
+    def run(self, total, repeat):
+        def serializer(renderer):
+            courses = Course.objects.select_related('rating_stats').prefetch_related(
+                Prefetch('prerequisites', queryset=Course.objects.only('id'))
+            )
+            return renderer.render(CourseSerializer(courses, many=True).data)
+
+        def fast(renderer):
+            return renderer.render(COURSE_ROWS.rows(Course.objects.all()))
+
+        variants = [
+            ("CourseSerializer + JSONRenderer", lambda: serializer(JSONRenderer())),
+            ("CourseSerializer + ORJSONRenderer", lambda: serializer(ORJSONRenderer())),
+            ("RowMapper + JSONRenderer", lambda: fast(JSONRenderer())),
+            ("RowMapper + ORJSONRenderer", lambda: fast(ORJSONRenderer())),
+        ]
+        self.stdout.write(f"{total} courses, best of {repeat}")
+        baseline = None
+        for label, func in variants:
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            baseline = baseline or best
+            self.stdout.write(
+                f"{label:<36} {total / best:>10.0f} rows/s  {best * 1000:>8.1f} ms  "
+                f"x{baseline / best:.1f}"
+            )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from coursessvc import rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold the review rollup deltas appended since the last run into one row "
+        "per course, month and program. Meant to run nightly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute every rollup from CourseReview instead',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            total = rollups.rebuild()
+            self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {total} review rollups'))
+            return
+        removed = rollups.compact()
+        self.stdout.write(self.style.SUCCESS(f'Successfully compacted review rollups ({removed} rows removed)'))
@@ -0,0 +1,89 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from coursessvc import loader
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load courses, assessments and prerequisites from JSONL or CSV files. "
+        "Courses are upserted by code; assessments and prerequisites replace those "
+        "of the courses they name."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', help='Course records keyed by "code"')
+        parser.add_argument('--assessments', help='Assessment records naming their course code in "course"')
+        parser.add_argument('--prerequisites', help='Prerequisite links as "course" and "prereq" codes')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=loader.DEFAULT_BATCH_SIZE,
+            help='Number of records written per transaction',
+        )
+
+    def handle(self, *args, **options):
+        if not any(options[name] for name in ('courses', 'assessments', 'prerequisites')):
+            raise CommandError('Nothing to load: pass --courses, --assessments and/or --prerequisites')
+        batch_size = options['batch_size']
+        started = time.monotonic()
+        # Filled in chunk by chunk, so they name what was committed even when
+        # a later record fails
+        courses = loader.LoadStats()
+        assessments = loader.LoadStats()
+        prerequisites = loader.LoadStats()
+
+        try:
+            # Prerequisites listed on course records wait until every course exists
+            links = {}
+            if options['courses']:
+                self._timed('courses', lambda: loader.load_courses(
+                    loader.read_records(options['courses']), batch_size, links, courses,
+                ))
+                self.stdout.write(
+                    f'  {courses.created} created, {courses.updated} updated, '
+                    f'{courses.written - courses.created - courses.updated} unchanged'
+                )
+            if options['prerequisites']:
+                links.update(loader.group_links(loader.read_records(options['prerequisites'])))
+
+            ids = loader.course_ids_by_code()
+            if options['assessments']:
+                self._timed('assessments', lambda: loader.load_assessments(
+                    loader.read_records(options['assessments']), batch_size, ids, stats=assessments,
+                ))
+                self.stdout.write(f'  {assessments.created} written, {len(assessments.codes)} courses changed')
+            if links:
+                self._timed('prerequisites', lambda: loader.load_prerequisites(
+                    links.items(), batch_size, ids, prerequisites,
+                ))
+                self.stdout.write(f'  {prerequisites.created} written, {len(prerequisites.codes)} courses changed')
+        except (loader.LoadError, OSError) as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            # Bulk writes skip the signals that keep derived tables current.
+            # Chunks committed before a failure are unchanged to the rerun,
+            # so they are refreshed here or never.
+            touched = courses.codes | assessments.codes | prerequisites.codes
+            refresh_started = time.monotonic()
+            loader.refresh_codes(touched, batch_size, prerequisites=prerequisites.codes)
+            self.stdout.write(
+                f'derived data: {len(touched)} courses refreshed in {time.monotonic() - refresh_started:.1f}s'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully loaded the catalog in {time.monotonic() - started:.1f}s'
+        ))
+
+    def _timed(self, label, load):
+        started = time.monotonic()
+        stats = load()
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            f'{label}: {stats.written} rows in {elapsed:.1f}s ({stats.written / elapsed:,.0f} rows/s)'
+        )
+        if stats.skipped:
+            self.stdout.write(self.style.WARNING(
+                f'  skipped {stats.skipped} references to unknown course codes '
+                f'(e.g. {", ".join(sorted(stats.unknown_codes)[:5])})'
+            ))
+        return stats
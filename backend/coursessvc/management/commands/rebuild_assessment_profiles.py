@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from coursessvc import assessment_profiles
+
+
+class Command(BaseCommand):
+    help = "Recompute every course's assessment profile from its Assessment rows."
+
+    def handle(self, *args, **options):
+        total = assessment_profiles.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt assessment profiles for {total} courses'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from coursessvc import documents
+
+
+class Command(BaseCommand):
+    help = "Re-render the materialized CourseDetail document of every course."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of courses rendered per transaction',
+        )
+
+    def handle(self, *args, **options):
+        total = documents.rebuild_all(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully rendered {total} course documents'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from coursessvc import closure
+
+
+class Command(BaseCommand):
+    help = "Rebuild the prerequisite transitive-closure table from CoursePrerequisite."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per INSERT statement',
+        )
+
+    def handle(self, *args, **options):
+        total = closure.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully wrote {total} closure rows'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from coursessvc import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text course search index from the Course table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of courses reindexed per transaction',
+        )
+
+    def handle(self, *args, **options):
+        total = search.rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully indexed {total} courses'))
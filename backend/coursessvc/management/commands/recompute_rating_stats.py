@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from coursessvc import ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized rating stats of every course from CourseReview."
+
+    def handle(self, *args, **options):
+        total = ratings.recompute_all()
+        self.stdout.write(self.style.SUCCESS(f'Successfully recomputed rating stats for {total} courses'))
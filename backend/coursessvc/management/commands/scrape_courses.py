@@ -0,0 +1,143 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from backend.scraping import Fetcher, content_hash
+from coursessvc import loader, scraper
+from coursessvc.models import Course
+
+
+class Command(BaseCommand):
+    help = (
+        "Scrape UQ course pages and course profiles concurrently and upsert the "
+        "courses, assessments and prerequisites they describe."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('codes', nargs='*', help='Course codes to scrape (default: every course in the catalog)')
+        parser.add_argument('--codes-file', help='File with one course code per line')
+        parser.add_argument('--base-url', default=scraper.BASE_URL, help='Site to scrape, e.g. a local fixture server')
+        parser.add_argument('--workers', type=int, default=8, help='Pages fetched concurrently')
+        parser.add_argument('--rate', type=float, default=2.0, help='Requests per second across all workers')
+        parser.add_argument('--retries', type=int, default=3, help='Retries per request after errors and 429/5xx')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=loader.DEFAULT_BATCH_SIZE,
+            help='Number of records written per transaction',
+        )
+        parser.add_argument(
+            '--cache-dir',
+            default=settings.SCRAPE_CACHE_DIR,
+            help='HTTP cache for conditional requests (ETag/Last-Modified)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Ignore the HTTP cache and stored hashes: refetch and reload every course',
+        )
+
+    def handle(self, *args, **options):
+        codes = [code.strip().upper() for code in options['codes']]
+        if options['codes_file']:
+            codes += [
+                line.strip().upper()
+                for line in Path(options['codes_file']).read_text(encoding='utf-8').splitlines()
+                if line.strip()
+            ]
+        if not codes:
+            codes = list(Course.objects.order_by('code').values_list('code', flat=True))
+        if not codes:
+            raise CommandError('No course codes to scrape')
+
+        batch_size = options['batch_size']
+        force = options['force']
+        fetcher = Fetcher(
+            rate=options['rate'],
+            workers=options['workers'],
+            retries=options['retries'],
+            cache_dir=None if force else options['cache_dir'],
+        )
+        # Hashes of what the last scrape wrote; a course whose page parses to
+        # the same hash is skipped without touching the database
+        hashes = dict(Course.objects.values_list('code', 'content_hash'))
+        self.stdout.write(f"Scraping {len(codes)} courses from {options['base_url']}")
+        started = time.monotonic()
+        fetched = 0
+        missing = []
+        failed = []
+        unchanged = 0
+        assessments = []
+        # Courses whose profile lists no assessments
+        cleared = []
+        links = {}
+        # Hashes of the courses written, stored once their assessments and
+        # links are written too
+        scraped_hashes = {}
+
+        def scraped_courses():
+            nonlocal fetched, unchanged
+            for page in scraper.crawl(fetcher, codes, options['base_url'], options['workers']):
+                fetched += page.fetched
+                if page.error:
+                    failed.append(page.code)
+                    self.stdout.write(self.style.ERROR(f"  Failed {page.code}: {page.error}"))
+                elif page.course is None:
+                    missing.append(page.code)
+                else:
+                    # Hashing the prerequisites already in the catalog too means
+                    # links skipped as unknown are retried once their course exists
+                    digest = content_hash(
+                        page.course, page.assessments, [code for code in page.course['prerequisites'] if code in hashes],
+                    )
+                    if not force and hashes.get(page.code) == digest:
+                        unchanged += 1
+                        continue
+                    # Written without its hash until then, so a scrape that
+                    # stops part way fetches the course again next time
+                    scraped_hashes[page.code] = digest
+                    if page.assessments == []:
+                        cleared.append(page.code)
+                    elif page.assessments is not None:
+                        assessments.extend((page.url, record) for record in page.assessments)
+                    yield page.url, page.course
+
+        courses = loader.LoadStats()
+        scraped = loader.LoadStats()
+        prerequisites = loader.LoadStats()
+        try:
+            # Courses are written chunk by chunk while the workers keep fetching
+            loader.load_courses(scraped_courses(), batch_size, links, courses)
+            ids = loader.course_ids_by_code()
+            loader.load_assessments(assessments, batch_size, ids, cleared, scraped)
+            loader.load_prerequisites(links.items(), batch_size, ids, prerequisites)
+            loader.store_content_hashes(scraped_hashes, batch_size, ids)
+        except loader.LoadError as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            fetcher.close()
+            # Chunks committed before a failure are refreshed too
+            loader.refresh_codes(
+                courses.codes | scraped.codes | prerequisites.codes, batch_size,
+                prerequisites=prerequisites.codes,
+            )
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            f'{fetched} pages in {elapsed:.1f}s ({fetched / elapsed:.1f} pages/s): '
+            f"{fetcher.stats['fetched']} fetched, {fetcher.stats['not_modified']} not modified"
+        )
+        if missing:
+            self.stdout.write(self.style.WARNING(f"Not found: {', '.join(sorted(missing))}"))
+        if prerequisites.skipped:
+            self.stdout.write(self.style.WARNING(
+                f'Skipped {prerequisites.skipped} prerequisites not in the catalog '
+                f'(e.g. {", ".join(sorted(prerequisites.unknown_codes)[:5])})'
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully scraped {courses.written + unchanged} courses: {courses.created} added, '
+            f'{courses.updated} changed, {unchanged + courses.written - courses.created - courses.updated} unchanged, '
+            f'{scraped.written} assessments, {prerequisites.written} prerequisites'
+            + (f', {len(failed)} failed' if failed else '')
+        ))
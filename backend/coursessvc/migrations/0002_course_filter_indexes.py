@@ -0,0 +1,29 @@
+# Generated by Django for coursessvc
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursessvc', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['study_area', 'level', 'code'], name='course_area_level_code_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['level', 'code'], name='course_level_code_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['credits', 'code'], name='course_credits_code_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['assessment_type', 'code'], name='course_assess_code_idx'),
+        ),
+    ]
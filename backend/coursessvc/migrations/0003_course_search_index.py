@@ -0,0 +1,85 @@
+# Generated by Django for coursessvc
+
+import re
+from collections import Counter
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copy of coursessvc.search's tokenizer as of this migration, so later
+# changes to the live index cannot change what it writes
+FIELD_WEIGHTS = {'code': 8.0, 'name': 3.0, 'aim': 1.0, 'description': 1.0}
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has in is it its of on or that the this
+    to will with students course courses
+""".split())
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+CODE_PREFIX_RE = re.compile(r'^([a-z]+)\d')
+
+
+def tokenize(text):
+    return [
+        token[:64]
+        for token in TOKEN_RE.findall((text or '').lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def course_terms(course):
+    weighted = Counter()
+    length = 0
+    for field, weight in FIELD_WEIGHTS.items():
+        tokens = tokenize(getattr(course, field))
+        if field == 'code' and tokens:
+            match = CODE_PREFIX_RE.match(tokens[0])
+            if match:
+                tokens.append(match.group(1))
+        length += len(tokens)
+        for token in tokens:
+            weighted[token] += weight
+    return weighted, max(length, 1)
+
+
+def index_existing_courses(apps, schema_editor):
+    Course = apps.get_model('coursessvc', 'Course')
+    CourseSearchDocument = apps.get_model('coursessvc', 'CourseSearchDocument')
+    CourseSearchPosting = apps.get_model('coursessvc', 'CourseSearchPosting')
+    for course in Course.objects.only('id', 'code', 'name', 'aim', 'description').iterator():
+        weighted, length = course_terms(course)
+        CourseSearchDocument.objects.create(course=course, length=length)
+        CourseSearchPosting.objects.bulk_create([
+            CourseSearchPosting(term=term, course=course, tf=tf, doc_length=length)
+            for term, tf in weighted.items()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursessvc', '0002_course_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSearchDocument',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='coursessvc.course')),
+                ('length', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CourseSearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('tf', models.FloatField()),
+                ('doc_length', models.PositiveIntegerField()),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_postings', to='coursessvc.course')),
+            ],
+            options={
+                'unique_together': {('term', 'course')},
+            },
+        ),
+        migrations.RunPython(index_existing_courses, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django for coursessvc
+
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+import coursessvc.models
+
+
+# Frozen copy of coursessvc.ratings.build_stats as of this migration
+def histogram_bucket(rating):
+    return int((Decimal(rating) * 2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def average(total, count):
+    if not count:
+        return Decimal(0)
+    return (Decimal(total) / count).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def backfill_rating_stats(apps, schema_editor):
+    CourseReview = apps.get_model('coursessvc', 'CourseReview')
+    CourseRatingStats = apps.get_model('coursessvc', 'CourseRatingStats')
+    grouped = CourseReview.objects.values('course_id', 'review').annotate(n=Count('id')).order_by()
+    totals = defaultdict(lambda: [0, Decimal(0), [0] * 11])
+    for row in grouped.iterator():
+        entry = totals[row['course_id']]
+        entry[0] += row['n']
+        entry[1] += row['review'] * row['n']
+        entry[2][histogram_bucket(row['review'])] += row['n']
+    CourseRatingStats.objects.bulk_create(
+        [
+            CourseRatingStats(
+                course_id=course_id,
+                review_count=count,
+                review_sum=total,
+                average_rating=average(total, count),
+                histogram=histogram,
+            )
+            for course_id, (count, total, histogram) in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursessvc', '0003_course_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseRatingStats',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_stats', serialize=False, to='coursessvc.course')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('review_sum', models.DecimalField(decimal_places=1, default=0, max_digits=12)),
+                ('average_rating', models.DecimalField(decimal_places=2, default=0, max_digits=3)),
+                ('histogram', models.JSONField(default=coursessvc.models.empty_rating_histogram)),
+            ],
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django for coursessvc
+
+from django.db import migrations, models
+
+
+def seed_versions(apps, schema_editor):
+    """Create the counters up front so every bump is a single UPDATE"""
+    CatalogVersion = apps.get_model('coursessvc', 'CatalogVersion')
+    for name in ['catalog', 'reviews']:
+        CatalogVersion.objects.get_or_create(name=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursessvc', '0004_courseratingstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_versions, migrations.RunPython.noop),
+    ]
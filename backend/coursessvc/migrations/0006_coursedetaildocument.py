@@ -0,0 +1,24 @@
+# Generated by Django for coursessvc
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursessvc', '0005_catalogversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseDetailDocument',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='detail_document', serialize=False, to='coursessvc.course')),
+                ('format_version', models.PositiveSmallIntegerField()),
+                ('etag', models.CharField(max_length=32)),
+                ('body', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django for coursessvc
+
+from collections import defaultdict, deque
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copy of coursessvc.closure.closure_rows as of this migration
+def closure_rows(links):
+    prereqs_by_course = defaultdict(list)
+    for course_id, prereq_id in links:
+        prereqs_by_course[course_id].append(prereq_id)
+    rows = []
+    for course_id in prereqs_by_course:
+        depths = {course_id: 0}
+        queue = deque([course_id])
+        while queue:
+            node = queue.popleft()
+            for prereq in prereqs_by_course.get(node, ()):
+                if prereq not in depths:
+                    depths[prereq] = depths[node] + 1
+                    queue.append(prereq)
+        del depths[course_id]
+        rows.extend((ancestor, course_id, depth) for ancestor, depth in depths.items())
+    return rows
+
+
+def build_closure(apps, schema_editor):
+    CoursePrerequisite = apps.get_model('coursessvc', 'CoursePrerequisite')
+    CoursePrerequisiteClosure = apps.get_model('coursessvc', 'CoursePrerequisiteClosure')
+    links = CoursePrerequisite.objects.values_list('course_id', 'prereq_id')
+    CoursePrerequisiteClosure.objects.bulk_create(
+        [
+            CoursePrerequisiteClosure(ancestor_id=ancestor, descendant_id=descendant, depth=depth)
+            for ancestor, descendant, depth in closure_rows(links)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursessvc', '0006_coursedetaildocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoursePrerequisiteClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_descendants', to='coursessvc.course')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_ancestors', to='coursessvc.course')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'ancestor'], name='prereq_closure_desc_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
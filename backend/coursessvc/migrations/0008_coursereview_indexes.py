@@ -0,0 +1,21 @@
+# Generated by Django for coursessvc
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursessvc', '0007_courseprerequisiteclosure'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursereview',
+            index=models.Index(fields=['course', 'created_at', 'id'], name='review_course_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursereview',
+            index=models.Index(fields=['course', 'review', 'id'], name='review_course_rating_idx'),
+        ),
+    ]
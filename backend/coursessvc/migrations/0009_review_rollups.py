@@ -0,0 +1,80 @@
+# Generated by Django for coursessvc
+
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+import django.db.models.deletion
+import coursessvc.models
+
+
+# Frozen copy of coursessvc.rollups.build_rollups as of this migration
+def histogram_bucket(rating):
+    return int((Decimal(rating) * 2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def backfill_review_rollups(apps, schema_editor):
+    CourseReview = apps.get_model('coursessvc', 'CourseReview')
+    CourseReviewRollup = apps.get_model('coursessvc', 'CourseReviewRollup')
+    grouped = (
+        CourseReview.objects.annotate(month=TruncMonth('created_at'))
+        .values('course_id', 'month', 'reviewer_program', 'review')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    totals = defaultdict(lambda: [0, Decimal(0), [0] * 11])
+    for row in grouped.iterator():
+        month = row['month']
+        if hasattr(month, 'date'):
+            month = month.date()
+        entry = totals[row['course_id'], month, row['reviewer_program']]
+        entry[0] += row['n']
+        entry[1] += row['review'] * row['n']
+        entry[2][histogram_bucket(row['review'])] += row['n']
+    CourseReviewRollup.objects.bulk_create(
+        [
+            CourseReviewRollup(
+                course_id=course_id,
+                month=month,
+                program=program,
+                review_count=count,
+                review_sum=total,
+                histogram=histogram,
+            )
+            for (course_id, month, program), (count, total, histogram) in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursessvc', '0008_coursereview_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursereview',
+            name='reviewer_program',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.CreateModel(
+            name='CourseReviewRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('program', models.CharField(blank=True, default='', max_length=255)),
+                ('review_count', models.IntegerField(default=0)),
+                ('review_sum', models.DecimalField(decimal_places=1, default=0, max_digits=12)),
+                ('histogram', models.JSONField(default=coursessvc.models.empty_rating_histogram)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_rollups', to='coursessvc.course')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['course', 'month', 'program'], name='review_rollup_key_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_review_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django for coursessvc
+
+from collections import defaultdict
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copy of coursessvc.assessment_profiles.build_profiles as of this migration
+def share(part, whole):
+    return round(100 * part / whole) if whole else 0
+
+
+def backfill_assessment_profiles(apps, schema_editor):
+    Course = apps.get_model('coursessvc', 'Course')
+    Assessment = apps.get_model('coursessvc', 'Assessment')
+    CourseAssessmentProfile = apps.get_model('coursessvc', 'CourseAssessmentProfile')
+    tasks = defaultdict(list)
+    for course_id, *task in Assessment.objects.values_list('course_id', 'category', 'grading_type', 'weight', 'hurdle'):
+        tasks[course_id].append(task)
+
+    profiles = []
+    for course_id in Course.objects.values_list('id', flat=True):
+        rows = tasks.get(course_id, [])
+        exam_weights = [weight or 0 for category, _, weight, _ in rows if 'exam' in category.lower()]
+        total_weight = sum(weight or 0 for _, _, weight, _ in rows)
+        pass_fail = sum(1 for _, grading_type, _, _ in rows if grading_type == 'pass_fail')
+        profiles.append(CourseAssessmentProfile(
+            course_id=course_id,
+            task_count=len(rows),
+            hurdle_count=sum(1 for *_, hurdle in rows if hurdle),
+            max_exam_weight=max(exam_weights, default=0),
+            exam_share=share(sum(exam_weights), total_weight),
+            pass_fail_share=share(pass_fail, len(rows)),
+        ))
+    CourseAssessmentProfile.objects.bulk_create(profiles, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursessvc', '0009_review_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseAssessmentProfile',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='assessment_profile', serialize=False, to='coursessvc.course')),
+                ('task_count', models.PositiveSmallIntegerField(default=0)),
+                ('hurdle_count', models.PositiveSmallIntegerField(default=0)),
+                ('max_exam_weight', models.PositiveSmallIntegerField(default=0)),
+                ('exam_share', models.PositiveSmallIntegerField(default=0)),
+                ('pass_fail_share', models.PositiveSmallIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['max_exam_weight'], name='assess_profile_max_exam_idx'),
+                    models.Index(fields=['exam_share'], name='assess_profile_exam_idx'),
+                    models.Index(fields=['hurdle_count'], name='assess_profile_hurdle_idx'),
+                    models.Index(fields=['pass_fail_share'], name='assess_profile_pf_idx'),
+                    models.Index(fields=['task_count'], name='assess_profile_tasks_idx'),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_assessment_profiles, migrations.RunPython.noop),
+    ]
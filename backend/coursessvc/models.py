@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from backend.versioning import VersionCounter
 
 
 class Course(models.Model):
@@ -39,6 +40,9 @@ class Course(models.Model):
     offered_sem_2 = models.BooleanField(default=False)
     offered_summer = models.BooleanField(default=False)
     description = models.TextField()
+    # ``content_hash`` of the scraped course, assessments and prerequisites
+    # last written; blank when the row came from anywhere else
+    content_hash = models.CharField(max_length=64, blank=True, default="")
 
     prerequisites = models.ManyToManyField(
         "self",
@@ -48,6 +52,16 @@ class Course(models.Model):
         blank=True,
     )
 
+    class Meta:
+        # Composite indexes ending in ``code`` back the filtered, keyset
+        # paginated catalog listing (filter columns first, then the cursor).
+        indexes = [
+            models.Index(fields=["study_area", "level", "code"], name="course_area_level_code_idx"),
+            models.Index(fields=["level", "code"], name="course_level_code_idx"),
+            models.Index(fields=["credits", "code"], name="course_credits_code_idx"),
+            models.Index(fields=["assessment_type", "code"], name="course_assess_code_idx"),
+        ]
+
 
 class Assessment(models.Model):
     class GradingType(models.TextChoices):
@@ -71,6 +85,33 @@ class Assessment(models.Model):
     hurdle_description = models.TextField(blank=True, null=True)
 
 
+class CourseAssessmentProfile(models.Model):
+    """
+    Per-course summary of its assessments, kept current by
+    ``coursessvc.assessment_profiles`` so assessment-mix filters are indexed
+    range predicates. Shares are whole percentages.
+    """
+    course = models.OneToOneField(
+        Course, on_delete=models.CASCADE, primary_key=True, related_name="assessment_profile"
+    )
+    task_count = models.PositiveSmallIntegerField(default=0)
+    hurdle_count = models.PositiveSmallIntegerField(default=0)
+    # Heaviest single exam, and all exams as a share of the total weight
+    max_exam_weight = models.PositiveSmallIntegerField(default=0)
+    exam_share = models.PositiveSmallIntegerField(default=0)
+    # Pass/fail tasks as a share of all tasks
+    pass_fail_share = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["max_exam_weight"], name="assess_profile_max_exam_idx"),
+            models.Index(fields=["exam_share"], name="assess_profile_exam_idx"),
+            models.Index(fields=["hurdle_count"], name="assess_profile_hurdle_idx"),
+            models.Index(fields=["pass_fail_share"], name="assess_profile_pf_idx"),
+            models.Index(fields=["task_count"], name="assess_profile_tasks_idx"),
+        ]
+
+
 class CourseReview(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="course_reviews"
@@ -85,9 +126,19 @@ class CourseReview(models.Model):
     )
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Reviewer's program when the review was first written, from the JWT
+    # ``program`` claim (profiles live in authsvc); blank when unknown
+    reviewer_program = models.CharField(max_length=255, blank=True, default="")
 
     class Meta:
         unique_together = [("user", "course")]
+        # Keyset pagination of a course's reviews: the course, then the sort
+        # column, then ``id`` as tie-breaker. Each index serves its sort in
+        # both directions (newest/oldest, highest/lowest).
+        indexes = [
+            models.Index(fields=["course", "created_at", "id"], name="review_course_created_idx"),
+            models.Index(fields=["course", "review", "id"], name="review_course_rating_idx"),
+        ]
 
 
 class CoursePrerequisite(models.Model):
@@ -106,3 +157,116 @@ class CoursePrerequisite(models.Model):
                 name="course_prereq_no_self_ref",
             ),
         ]
+
+
+class CourseSearchDocument(models.Model):
+    """Per-course length statistics for the full-text search index"""
+    course = models.OneToOneField(
+        Course, on_delete=models.CASCADE, primary_key=True, related_name="search_document"
+    )
+    length = models.PositiveIntegerField()
+
+
+class CourseSearchPosting(models.Model):
+    """
+    One inverted-index entry: a term occurring in a course's code, name, aim
+    or description. ``tf`` is the field-weighted term frequency and
+    ``doc_length`` is denormalized from the document so ranking needs no join.
+    """
+    term = models.CharField(max_length=64)
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="search_postings"
+    )
+    tf = models.FloatField()
+    doc_length = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = [("term", "course")]
+
+
+def empty_rating_histogram():
+    return [0] * 11
+
+
+class CourseRatingStats(models.Model):
+    """
+    Denormalized review aggregates for a course, maintained incrementally
+    whenever a review is written. ``histogram[i]`` counts reviews rounding to
+    a rating of ``i / 2``.
+    """
+    course = models.OneToOneField(
+        Course, on_delete=models.CASCADE, primary_key=True, related_name="rating_stats"
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    review_sum = models.DecimalField(max_digits=12, decimal_places=1, default=0)
+    average_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0)
+    histogram = models.JSONField(default=empty_rating_histogram)
+
+
+class CourseReviewRollup(models.Model):
+    """
+    Review aggregates of a course for one calendar month and reviewer
+    program, maintained by ``coursessvc.rollups``. Review writes append
+    delta rows (negative for a replaced rating) that the nightly compaction
+    merges into one row per key; readers sum whatever rows exist.
+    """
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="review_rollups"
+    )
+    # First day of the month the reviews were created in
+    month = models.DateField()
+    program = models.CharField(max_length=255, blank=True, default="")
+    review_count = models.IntegerField(default=0)
+    review_sum = models.DecimalField(max_digits=12, decimal_places=1, default=0)
+    histogram = models.JSONField(default=empty_rating_histogram)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["course", "month", "program"], name="review_rollup_key_idx"),
+        ]
+
+
+class CatalogVersion(VersionCounter):
+    """
+    ``catalog`` is bumped on writes to courses, assessments and prerequisites;
+    ``reviews`` on writes to reviews.
+    """
+    CATALOG = "catalog"
+    REVIEWS = "reviews"
+
+
+class CourseDetailDocument(models.Model):
+    """
+    The rendered JSON body of a course's detail endpoint, kept current by
+    ``coursessvc.documents``. ``format_version`` records the renderer that
+    produced ``body`` so a deploy that changes the format re-renders lazily.
+    """
+    course = models.OneToOneField(
+        Course, on_delete=models.CASCADE, primary_key=True, related_name="detail_document"
+    )
+    format_version = models.PositiveSmallIntegerField()
+    etag = models.CharField(max_length=32)
+    body = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class CoursePrerequisiteClosure(models.Model):
+    """
+    Transitive closure of ``CoursePrerequisite``: one row per course pair
+    where ``ancestor`` is required, directly or through a chain, before
+    ``descendant``. ``depth`` is the length of the shortest such chain (1 for
+    a direct prerequisite). Maintained by ``coursessvc.closure``.
+    """
+    ancestor = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="closure_descendants"
+    )
+    descendant = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="closure_ancestors"
+    )
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = [("ancestor", "descendant")]
+        indexes = [
+            models.Index(fields=["descendant", "ancestor"], name="prereq_closure_desc_idx"),
+        ]
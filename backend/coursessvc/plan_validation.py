@@ -0,0 +1,94 @@
+"""
+Validation of a whole degree plan against the catalog.
+
+A plan is a list of ``{course_id, semester}`` entries, semesters numbered
+from 1 in the order they are studied. ``validate_plan`` checks it in one
+pass over a ``CatalogSnapshot``, with no queries, and returns every
+violation at once:
+
+- ``unknown_course``: the course is not in the catalog;
+- ``prerequisite``: a prerequisite is not planned in an earlier semester;
+- ``offering``: the course is not offered in the semester's type;
+- ``credit_load``: a semester's credits exceed the limit.
+
+Plan semesters alternate between semester 1 and semester 2 of the year,
+starting from the student's ``year_intake``. Plans have no summer terms,
+so a course offered only in summer is reported as not offered.
+"""
+DEFAULT_MAX_SEMESTER_CREDITS = 8
+
+INTAKES = ("SEM1", "SEM2")
+# Offering flag and label of each semester type
+SEMESTER_TYPES = {
+    "SEM1": ("offered_sem_1", "Semester 1"),
+    "SEM2": ("offered_sem_2", "Semester 2"),
+}
+
+
+def semester_type(number, year_intake):
+    """``SEM1`` or ``SEM2`` for plan semester ``number`` of a student starting in ``year_intake``"""
+    return INTAKES[(INTAKES.index(year_intake) + number - 1) % 2]
+
+
+def validate_plan(snapshot, courses, year_intake, max_credits=DEFAULT_MAX_SEMESTER_CREDITS):
+    """
+    ``(violations, semesters)`` for ``courses``: the violations ordered by
+    semester and course code, and the type and credit total of every
+    planned semester
+    """
+    by_id = snapshot.by_id
+    planned = {course["course_id"]: course["semester"] for course in courses}
+    violations = []
+    credits = {}
+
+    for course_id, semester in planned.items():
+        credits.setdefault(semester, 0)
+        row = by_id.get(course_id)
+        if row is None:
+            violations.append({
+                "rule": "unknown_course", "semester": semester, "course_id": course_id, "code": None,
+                "detail": f"Course {course_id} is not in the catalog.",
+            })
+            continue
+        credits[semester] += row["credits"]
+
+        for prereq_id in row["prerequisites"]:
+            prereq = by_id.get(prereq_id)
+            if prereq is None:
+                continue
+            prereq_semester = planned.get(prereq_id)
+            if prereq_semester is None:
+                detail = f"{row['code']} requires {prereq['code']}, which is not in the plan."
+            elif prereq_semester >= semester:
+                detail = (
+                    f"{row['code']} in semester {semester} requires {prereq['code']}, "
+                    f"planned for semester {prereq_semester}."
+                )
+            else:
+                continue
+            violations.append({
+                "rule": "prerequisite", "semester": semester, "course_id": course_id, "code": row["code"],
+                "prerequisite": prereq["code"], "prerequisite_semester": prereq_semester, "detail": detail,
+            })
+
+        offered, label = SEMESTER_TYPES[semester_type(semester, year_intake)]
+        if not row[offered]:
+            violations.append({
+                "rule": "offering", "semester": semester, "course_id": course_id, "code": row["code"],
+                "detail": f"{row['code']} is not offered in {label} (plan semester {semester}).",
+            })
+
+    for semester, total in credits.items():
+        if total > max_credits:
+            violations.append({
+                "rule": "credit_load", "semester": semester, "course_id": None, "code": None,
+                "credits": total, "limit": max_credits,
+                "detail": f"Semester {semester} has {total} credits, more than the limit of {max_credits}.",
+            })
+
+    violations.sort(key=lambda violation: (violation["semester"], violation["code"] or "", violation["rule"]))
+    semesters = [
+        {"semester": semester, "type": semester_type(semester, year_intake), "credits": credits[semester]}
+        for semester in sorted(credits)
+    ]
+    return violations, semesters
@@ -0,0 +1,152 @@
+"""
+In-memory prerequisite DAG.
+
+Courses are numbered ``0..n-1`` and edges are held in CSR form: the
+prerequisites of node ``i`` are ``prereq_targets[prereq_offsets[i]:
+prereq_offsets[i + 1]]`` and its unlocks likewise in the reverse arrays, all
+flat ``array('i')``. Topological positions and chain depths are computed once
+on load (Kahn's algorithm), which also finds any courses caught in a cycle.
+
+The graph is built from a catalog snapshot (``CatalogSnapshot.graph``), so
+it is shared by all requests of a worker and rebuilt with the snapshot.
+"""
+import logging
+from array import array
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def _csr(size, pairs):
+    """Offsets and targets arrays for ``(source, target)`` node pairs"""
+    counts = [0] * (size + 1)
+    for source, _ in pairs:
+        counts[source + 1] += 1
+    for i in range(size):
+        counts[i + 1] += counts[i]
+    offsets = array("i", counts)
+    targets = array("i", bytes(4 * len(pairs)))
+    fill = list(counts[:-1])
+    for source, target in pairs:
+        targets[fill[source]] = target
+        fill[source] += 1
+    return offsets, targets
+
+
+class PrerequisiteGraph:
+    def __init__(self, course_ids, links):
+        """``links`` are ``(course_id, prereq_id)`` pairs; unknown ids are ignored"""
+        self.course_ids = array("q", course_ids)
+        self.index = {course_id: i for i, course_id in enumerate(course_ids)}
+        edges = [
+            (self.index[course_id], self.index[prereq_id])
+            for course_id, prereq_id in links
+            if course_id in self.index and prereq_id in self.index
+        ]
+        size = len(course_ids)
+        self.prereq_offsets, self.prereq_targets = _csr(size, edges)
+        self.unlock_offsets, self.unlock_targets = _csr(size, [(b, a) for a, b in edges])
+        self._sort()
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from catalog rows carrying ``id`` and ``prerequisites``"""
+        return cls(
+            [row["id"] for row in rows],
+            [(row["id"], prereq) for row in rows for prereq in row["prerequisites"]],
+        )
+
+    def _sort(self):
+        """Topological positions, chain depths and cycle members"""
+        size = len(self.course_ids)
+        offsets = self.prereq_offsets
+        remaining = array("i", (offsets[i + 1] - offsets[i] for i in range(size)))
+        ready = deque(i for i in range(size) if not remaining[i])
+
+        self.position = array("i", [-1] * size)
+        self.depth = array("i", [-1] * size)
+        order = 0
+        while ready:
+            node = ready.popleft()
+            self.position[node] = order
+            order += 1
+            self.depth[node] = max((self.depth[prereq] + 1 for prereq in self.prereqs_of(node)), default=0)
+            for unlock in self.unlocks_of(node):
+                remaining[unlock] -= 1
+                if not remaining[unlock]:
+                    ready.append(unlock)
+
+        # Nodes Kahn's algorithm never reached sit on, or behind, a cycle
+        self.cyclic = frozenset(
+            self.course_ids[i] for i in range(size) if self.position[i] < 0
+        )
+        if self.cyclic:
+            logger.warning("Prerequisite cycle involving course ids %s", sorted(self.cyclic))
+
+    def prereqs_of(self, node):
+        return self.prereq_targets[self.prereq_offsets[node]:self.prereq_offsets[node + 1]]
+
+    def unlocks_of(self, node):
+        return self.unlock_targets[self.unlock_offsets[node]:self.unlock_offsets[node + 1]]
+
+    def _walk(self, course_id, neighbours):
+        """``{course_id: distance}`` of every node reachable from ``course_id``"""
+        start = self.index[course_id]
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for neighbour in neighbours(node):
+                if neighbour not in distances:
+                    distances[neighbour] = distances[node] + 1
+                    queue.append(neighbour)
+        del distances[start]
+        return {self.course_ids[node]: distance for node, distance in distances.items()}
+
+    def transitive_prerequisites(self, course_id):
+        """``{course_id: shortest distance}`` of every course required before ``course_id``"""
+        return self._walk(course_id, self.prereqs_of)
+
+    def transitive_unlocks(self, course_id):
+        """``{course_id: shortest distance}`` of every course that requires ``course_id``"""
+        return self._walk(course_id, self.unlocks_of)
+
+    def direct_prerequisites(self, course_id):
+        return [self.course_ids[node] for node in self.prereqs_of(self.index[course_id])]
+
+    def direct_unlocks(self, course_id):
+        return [self.course_ids[node] for node in self.unlocks_of(self.index[course_id])]
+
+    def chain_depth(self, course_id):
+        """Length of the longest prerequisite chain below a course; None inside a cycle"""
+        depth = self.depth[self.index[course_id]]
+        return depth if depth >= 0 else None
+
+    def topological_order(self, course_ids):
+        """``course_ids`` ordered so every course follows its prerequisites; cyclic courses last"""
+        size = len(self.course_ids)
+
+        def key(course_id):
+            position = self.position[self.index[course_id]]
+            return (position if position >= 0 else size, course_id)
+
+        return sorted(course_ids, key=key)
+
+    def tree(self, course_id, describe):
+        """
+        Nested prerequisite tree of a course, each node being ``describe(course_id)``
+        plus ``prerequisites``. A course reached again (a shared prerequisite
+        or a cycle) is expanded only the first time and marked ``repeated``.
+        """
+        expanded = set()
+
+        def build(node):
+            entry = describe(self.course_ids[node])
+            if node in expanded:
+                entry["repeated"] = True
+                return entry
+            expanded.add(node)
+            entry["prerequisites"] = [build(prereq) for prereq in self.prereqs_of(node)]
+            return entry
+
+        return build(self.index[course_id])
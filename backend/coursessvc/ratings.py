@@ -0,0 +1,104 @@
+"""
+Incremental maintenance of ``CourseRatingStats``.
+
+Review writes apply a delta to the course's stats row while holding a row
+lock, so concurrent reviews of the same course serialize on that row instead
+of re-aggregating the whole ``CourseReview`` table.
+"""
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import Count
+
+from coursessvc.models import CourseRatingStats, CourseReview, empty_rating_histogram
+
+
+def histogram_bucket(rating):
+    """Index of the 0.5-wide histogram bucket a rating rounds to"""
+    return int((Decimal(rating) * 2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _average(total, count):
+    if not count:
+        return Decimal(0)
+    return (Decimal(total) / count).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def record_review_change(course_id, old_rating=None, new_rating=None):
+    """
+    Apply one review write to the course's stats: ``old_rating`` is the value
+    being replaced or removed (None for a new review) and ``new_rating`` the
+    value being stored (None for a deletion). Must run inside the transaction
+    that writes the review.
+    """
+    if old_rating == new_rating:
+        return
+    with transaction.atomic(savepoint=False):
+        locked = CourseRatingStats.objects.select_for_update()
+        if new_rating is None:
+            # Removals never create a row (the course itself may be going away)
+            stats = locked.filter(course_id=course_id).first()
+            if stats is None:
+                return
+        else:
+            stats, _ = locked.get_or_create(course_id=course_id)
+        histogram = list(stats.histogram)
+        if old_rating is not None:
+            stats.review_count -= 1
+            stats.review_sum -= Decimal(old_rating)
+            histogram[histogram_bucket(old_rating)] -= 1
+        if new_rating is not None:
+            stats.review_count += 1
+            stats.review_sum += Decimal(new_rating)
+            histogram[histogram_bucket(new_rating)] += 1
+        stats.histogram = histogram
+        stats.average_rating = _average(stats.review_sum, stats.review_count)
+        stats.save()
+
+
+def summary(stats):
+    """The ``average_rating``/``total_reviews`` pair exposed on course rows"""
+    if stats is None:
+        return {"average_rating": 0, "total_reviews": 0}
+    return {
+        "average_rating": round(float(stats.average_rating), 1),
+        "total_reviews": stats.review_count,
+    }
+
+
+def summaries(course_ids):
+    """``summary`` for each of ``course_ids`` in one query"""
+    stats = CourseRatingStats.objects.defer("histogram").in_bulk(course_ids)
+    return {course_id: summary(stats.get(course_id)) for course_id in course_ids}
+
+
+def build_stats(reviews, stats_model=CourseRatingStats):
+    """Aggregate a CourseReview queryset into unsaved per-course stats rows"""
+    grouped = reviews.values("course_id", "review").annotate(n=Count("id")).order_by()
+    totals = defaultdict(lambda: [0, Decimal(0), empty_rating_histogram()])
+    for row in grouped.iterator():
+        entry = totals[row["course_id"]]
+        entry[0] += row["n"]
+        entry[1] += row["review"] * row["n"]
+        entry[2][histogram_bucket(row["review"])] += row["n"]
+
+    return [
+        stats_model(
+            course_id=course_id,
+            review_count=count,
+            review_sum=total,
+            average_rating=_average(total, count),
+            histogram=histogram,
+        )
+        for course_id, (count, total, histogram) in totals.items()
+    ]
+
+
+def recompute_all():
+    """Rebuild every course's stats from ``CourseReview``; returns the course count"""
+    stats = build_stats(CourseReview.objects.all())
+    with transaction.atomic():
+        CourseRatingStats.objects.all().delete()
+        CourseRatingStats.objects.bulk_create(stats, batch_size=1000)
+    return len(stats)
@@ -0,0 +1,233 @@
+"""
+Review rollups behind the rating-trend endpoints.
+
+``CourseReviewRollup`` holds review counts, rating sums and histograms per
+course, calendar month and reviewer program. New and changed reviews never
+lock or update a rollup row: each appends a delta row, so concurrent reviews
+do not contend. Removals, which are rare, are subtracted from an existing
+row of their key instead. The nightly
+``compact_review_rollups`` command folds the rows of each key into one.
+Readers sum every row of a course, a short index range of one row per month
+and program plus the deltas since the last compaction.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from coursessvc.models import CourseReview, CourseReviewRollup, empty_rating_histogram
+from coursessvc.ratings import histogram_bucket
+
+PERIODS = ("month", "term")
+
+
+def month_of(moment):
+    """First day of the (local) month of a datetime"""
+    return timezone.localtime(moment).date().replace(day=1)
+
+
+def term_of(month):
+    """
+    ``(label, sort key)`` of the teaching period a month falls in: semester 1
+    runs February to June, semester 2 July to November, and the summer
+    session December to January (labelled with the year it starts in).
+    """
+    if 2 <= month.month <= 6:
+        return f"{month.year} S1", (month.year, 1)
+    if 7 <= month.month <= 11:
+        return f"{month.year} S2", (month.year, 2)
+    year = month.year if month.month == 12 else month.year - 1
+    return f"{year} Summer", (year, 3)
+
+
+def record_review_change(review, old_rating=None, new_rating=None):
+    """
+    Append the delta of one review write: ``old_rating`` is the value being
+    replaced or removed (None for a new review) and ``new_rating`` the value
+    being stored (None for a deletion). Must run inside the transaction that
+    writes the review.
+    """
+    if old_rating == new_rating:
+        return
+    key = {
+        "course_id": review.course_id,
+        "month": month_of(review.created_at),
+        "program": review.reviewer_program,
+    }
+    count = 0
+    total = Decimal(0)
+    histogram = empty_rating_histogram()
+    if old_rating is not None:
+        count -= 1
+        total -= Decimal(old_rating)
+        histogram[histogram_bucket(old_rating)] -= 1
+    if new_rating is not None:
+        count += 1
+        total += Decimal(new_rating)
+        histogram[histogram_bucket(new_rating)] += 1
+
+    if new_rating is not None:
+        CourseReviewRollup.objects.create(**key, review_count=count, review_sum=total, histogram=histogram)
+        return
+
+    # Removals never create a row (the course itself may be going away)
+    with transaction.atomic(savepoint=False):
+        row = CourseReviewRollup.objects.select_for_update().filter(**key).order_by("id").first()
+        if row is None:
+            return
+        row.review_count += count
+        row.review_sum += total
+        row.histogram = [a + b for a, b in zip(row.histogram, histogram)]
+        row.save(update_fields=["review_count", "review_sum", "histogram"])
+
+
+class _Totals:
+    __slots__ = ("count", "total", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total = Decimal(0)
+        self.histogram = empty_rating_histogram()
+
+    def add(self, count, total, histogram):
+        self.count += count
+        self.total += Decimal(total)
+        self.histogram = [a + b for a, b in zip(self.histogram, histogram)]
+
+    def data(self):
+        return {
+            "total_reviews": self.count,
+            "average_rating": round(float(self.total) / self.count, 2),
+            "histogram": self.histogram,
+        }
+
+
+def trends(rollups, period="month"):
+    """
+    Rating series of a rollup queryset: ``series`` per month or term, oldest
+    first, and ``by_program`` across all time, largest first. Periods and
+    programs left without reviews are omitted.
+    """
+    by_period = defaultdict(_Totals)
+    by_program = defaultdict(_Totals)
+    rows = rollups.values_list("month", "program", "review_count", "review_sum", "histogram")
+    for month, program, count, total, histogram in rows:
+        key = (month.strftime("%Y-%m"), (month.year, month.month)) if period == "month" else term_of(month)
+        by_period[key].add(count, total, histogram)
+        by_program[program].add(count, total, histogram)
+
+    return {
+        "period": period,
+        "series": [
+            {"period": label, **totals.data()}
+            for (label, _), totals in sorted(by_period.items(), key=lambda item: item[0][1])
+            if totals.count > 0
+        ],
+        "by_program": [
+            {"program": program or None, **totals.data()}
+            for program, totals in sorted(by_program.items(), key=lambda item: (-item[1].count, item[0]))
+            if totals.count > 0
+        ],
+    }
+
+
+def build_rollups(reviews, rollup_model=CourseReviewRollup):
+    """Aggregate a CourseReview queryset into unsaved, compacted rollup rows"""
+    grouped = (
+        reviews.annotate(month=TruncMonth("created_at"))
+        .values("course_id", "month", "reviewer_program", "review")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    totals = defaultdict(_Totals)
+    for row in grouped.iterator():
+        histogram = empty_rating_histogram()
+        histogram[histogram_bucket(row["review"])] = row["n"]
+        month = row["month"]
+        if hasattr(month, "date"):
+            month = month.date()
+        key = (row["course_id"], month, row["reviewer_program"])
+        totals[key].add(row["n"], row["review"] * row["n"], histogram)
+
+    return [
+        rollup_model(
+            course_id=course_id,
+            month=month,
+            program=program,
+            review_count=entry.count,
+            review_sum=entry.total,
+            histogram=entry.histogram,
+        )
+        for (course_id, month, program), entry in totals.items()
+    ]
+
+
+def rebuild():
+    """Recompute every rollup from ``CourseReview``; returns the row count"""
+    with transaction.atomic():
+        # Removals update a row in place: lock the rows first, so one either
+        # finished before the reviews are read or waits for the new rows
+        list(CourseReviewRollup.objects.select_for_update().values_list("id", flat=True))
+        rollups = build_rollups(CourseReview.objects.all())
+        CourseReviewRollup.objects.all().delete()
+        CourseReviewRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
+
+
+def compact(batch_size=200):
+    """
+    Fold the rows of each (course, month, program) into one and drop keys
+    whose reviews have all gone; returns the number of rows removed. Rows are
+    replaced by primary key, so deltas appended meanwhile are left for the
+    next run.
+    """
+    duplicated = (
+        CourseReviewRollup.objects.values("course_id", "month", "program")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("course_id", flat=True)
+    )
+    empty = CourseReviewRollup.objects.filter(review_count=0).values_list("course_id", flat=True)
+    course_ids = sorted(set(duplicated) | set(empty))
+
+    removed = 0
+    for start in range(0, len(course_ids), batch_size):
+        with transaction.atomic():
+            # Locked as read: a removal, which updates a row in place, either
+            # finished before or waits for the merged row
+            rows = (
+                CourseReviewRollup.objects.select_for_update()
+                .filter(course_id__in=course_ids[start:start + batch_size])
+                .order_by("id")
+                .values_list("id", "course_id", "month", "program", "review_count", "review_sum", "histogram")
+            )
+            keys = defaultdict(list)
+            for row in rows:
+                keys[row[1:4]].append(row)
+
+            stale = []
+            merged = []
+            for (course_id, month, program), group in keys.items():
+                if len(group) == 1 and group[0][4] != 0:
+                    continue
+                entry = _Totals()
+                for row in group:
+                    stale.append(row[0])
+                    entry.add(*row[4:])
+                if entry.count != 0 or any(entry.histogram):
+                    merged.append(CourseReviewRollup(
+                        course_id=course_id,
+                        month=month,
+                        program=program,
+                        review_count=entry.count,
+                        review_sum=entry.total,
+                        histogram=entry.histogram,
+                    ))
+
+            CourseReviewRollup.objects.filter(id__in=stale).delete()
+            CourseReviewRollup.objects.bulk_create(merged)
+        removed += len(stale) - len(merged)
+    return removed
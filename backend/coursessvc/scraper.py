@@ -0,0 +1,171 @@
+"""
+Course page scraping for the ``scrape_courses`` command.
+
+Each course takes two requests: its course page on programs-courses.uq.edu.au
+(name, units, summary, offerings and prerequisites) and, when the page links
+one, its current course profile (the assessment table). ``crawl`` runs the
+courses on a thread pool over one shared ``backend.scraping.Fetcher``, which
+rate-limits and retries every request, and yields results as they finish.
+The parsed records have the shape ``coursessvc.loader`` reads from files, so
+scraped courses go through the same bulk upsert path as loaded ones.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from coursessvc.models import Assessment
+
+BASE_URL = "https://programs-courses.uq.edu.au"
+COURSE_PATH = "/course.html?course_code={code}"
+
+CODE_RE = re.compile(r"\b[A-Z]{4}\d{4}\b")
+NUMBER_RE = re.compile(r"\d+")
+
+# Assessment table headers, lowercased, to Assessment fields
+ASSESSMENT_HEADERS = {
+    "category": "category",
+    "assessment task": "task",
+    "task": "task",
+    "mode": "mode",
+    "weight": "weight",
+}
+
+
+class ParseError(Exception):
+    """A course page without something every course record needs"""
+
+
+@dataclass
+class ScrapedCourse:
+    code: str
+    url: str
+    # Loader records; ``course`` is None when the site has no such course
+    course: dict = None
+    # None when no course profile was linked, so existing assessments stay;
+    # an empty list removes them
+    assessments: list = None
+    error: str = ""
+    # Pages fetched
+    fetched: int = 0
+
+
+def _text(soup, selector):
+    element = soup.select_one(selector)
+    return " ".join(element.get_text(" ", strip=True).split()) if element else ""
+
+
+def course_level(code):
+    """Year level from the first digit of a course code (COMP3506 is level 3)"""
+    digits = NUMBER_RE.search(code)
+    return int(digits.group()[0]) if digits else None
+
+
+def parse_course(code, html):
+    """
+    ``(course record, profile URL or None)``, or ``(None, None)`` for a
+    missing course. Raises ``ParseError`` for a page without units.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title = _text(soup, "#course-title")
+    if not title:
+        return None, None
+    offerings = _text(soup, "#course-current-offerings").lower()
+    record = {
+        "code": code,
+        # "Algorithms & Data Structures (COMP3506)"
+        "name": re.sub(r"\s*\(\s*" + re.escape(code) + r"\s*\)\s*$", "", title),
+        "level": course_level(code),
+        "description": _text(soup, "#course-summary"),
+        "offered_sem_1": "semester 1" in offerings,
+        "offered_sem_2": "semester 2" in offerings,
+        "offered_summer": "summer" in offerings,
+        "prerequisites": [
+            prereq for prereq in dict.fromkeys(CODE_RE.findall(_text(soup, "#course-prerequisite")))
+            if prereq != code
+        ],
+    }
+    units = NUMBER_RE.search(_text(soup, "#course-units"))
+    if not units:
+        raise ParseError(f"{code}: no units on the course page")
+    record["credits"] = int(units.group())
+
+    profile = soup.select_one("a.profile-available[href]")
+    return record, profile["href"] if profile else None
+
+
+def _weight(text):
+    """``(grading type, weight)`` from a weight cell such as "30%" or "Pass/Fail\""""
+    if "pass/fail" in text.lower():
+        return Assessment.GradingType.PASS_FAIL, None
+    # "20 - 30%" ranges count at their upper bound
+    numbers = [int(number) for number in NUMBER_RE.findall(text)]
+    return Assessment.GradingType.PERCENTAGE, min(max(numbers), 100) if numbers else None
+
+
+def parse_assessments(code, html):
+    """Assessment records from the first course profile table headed by an assessment task column"""
+    soup = BeautifulSoup(html, "html.parser")
+    for table in soup.select("table"):
+        headers = [
+            ASSESSMENT_HEADERS.get(" ".join(cell.get_text(" ", strip=True).lower().split()))
+            for cell in table.select("thead th") or table.select("tr:first-child > *")
+        ]
+        if "task" not in headers:
+            continue
+        records = []
+        for row in table.select("tbody tr") or table.select("tr")[1:]:
+            cells = row.find_all(["td", "th"])
+            values = {
+                name: " ".join(cell.get_text(" ", strip=True).split())
+                for name, cell in zip(headers, cells) if name
+            }
+            if not values.get("task"):
+                continue
+            hurdle = "hurdle" in row.get_text(" ", strip=True).lower()
+            grading_type, weight = _weight(values.pop("weight", ""))
+            records.append({
+                "course": code,
+                "category": values.get("category", "")[:255],
+                "task": re.sub(r"\s*\bhurdle\b\s*", " ", values["task"], flags=re.I).strip()[:255],
+                "mode": values.get("mode", "")[:255],
+                "grading_type": grading_type,
+                "weight": weight,
+                "description": "",
+                "hurdle": hurdle,
+            })
+        return records
+    return []
+
+
+def scrape_course(fetcher, base_url, code):
+    url = urljoin(base_url, COURSE_PATH.format(code=code))
+    page = ScrapedCourse(code=code, url=url)
+    try:
+        response = fetcher.get(url)
+        page.fetched += 1
+        if response.status_code == 404:
+            return page
+        response.raise_for_status()
+        page.course, profile_url = parse_course(code, response.text)
+        if page.course is None or profile_url is None:
+            return page
+
+        response = fetcher.get(urljoin(url, profile_url))
+        page.fetched += 1
+        response.raise_for_status()
+        page.assessments = parse_assessments(code, response.text)
+    except (requests.RequestException, ParseError) as exc:
+        page.error = str(exc)
+    return page
+
+
+def crawl(fetcher, codes, base_url=BASE_URL, workers=8):
+    """Yield a ``ScrapedCourse`` per code, in completion order"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(scrape_course, fetcher, base_url, code) for code in dict.fromkeys(codes)]
+        for future in as_completed(futures):
+            yield future.result()
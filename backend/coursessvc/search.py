@@ -0,0 +1,196 @@
+"""
+Full-text course search backed by an inverted index stored in the database.
+
+Each course is tokenized into ``CourseSearchPosting`` rows (term, course,
+weighted term frequency). A query only touches the postings of its own terms
+through the ``(term, course)`` index and is ranked with BM25 in SQL, so the
+``Course`` table is never scanned. Postings are rewritten whenever a course is
+saved, from whichever process performs the write.
+"""
+import math
+import re
+import time
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Avg, Case, Count, F, FloatField, Sum, Value, When
+
+from coursessvc.models import Course, CourseSearchDocument, CourseSearchPosting
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Term-frequency multiplier per field: a hit in the code or name matters more
+# than one buried in the description.
+FIELD_WEIGHTS = {
+    "code": 8.0,
+    "name": 3.0,
+    "aim": 1.0,
+    "description": 1.0,
+}
+
+# Score multiplier for terms that only matched a query token as a prefix
+PREFIX_WEIGHT = 0.6
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 50
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+STATS_TTL = 300
+
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has in is it its of on or that the this
+    to will with students course courses
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+CODE_PREFIX_RE = re.compile(r"^([a-z]+)\d")
+
+_stats = {"expires": 0.0, "count": 0, "avg_length": 1.0}
+
+
+def tokenize(text):
+    """Lowercase ``text`` and split it into indexable terms"""
+    return [
+        token[:64]
+        for token in TOKEN_RE.findall((text or "").lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _course_terms(course):
+    """Return ``(weighted term frequencies, document length)`` for a course"""
+    weighted = Counter()
+    length = 0
+    for field, weight in FIELD_WEIGHTS.items():
+        tokens = tokenize(getattr(course, field))
+        if field == "code" and tokens:
+            # Also index the subject prefix so "comp" finds every COMPxxxx
+            match = CODE_PREFIX_RE.match(tokens[0])
+            if match:
+                tokens.append(match.group(1))
+        length += len(tokens)
+        for token in tokens:
+            weighted[token] += weight
+    return weighted, max(length, 1)
+
+
+def index_courses(courses):
+    """(Re)build the postings of the given courses in a single transaction"""
+    courses = list(courses)
+    if not courses:
+        return
+    documents = []
+    postings = []
+    for course in courses:
+        weighted, length = _course_terms(course)
+        documents.append(CourseSearchDocument(course=course, length=length))
+        postings.extend(
+            CourseSearchPosting(term=term, course=course, tf=tf, doc_length=length)
+            for term, tf in weighted.items()
+        )
+
+    ids = [course.pk for course in courses]
+    with transaction.atomic():
+        CourseSearchPosting.objects.filter(course_id__in=ids).delete()
+        CourseSearchDocument.objects.filter(course_id__in=ids).delete()
+        CourseSearchDocument.objects.bulk_create(documents)
+        CourseSearchPosting.objects.bulk_create(postings, batch_size=1000)
+    _stats["expires"] = 0.0
+
+
+def index_course(course):
+    index_courses([course])
+
+
+def rebuild_index(batch_size=500):
+    """Reindex the whole catalog; returns the number of courses indexed"""
+    total = 0
+    fields = ["id", *FIELD_WEIGHTS]
+    batch = []
+    for course in Course.objects.only(*fields).order_by("id").iterator(chunk_size=batch_size):
+        batch.append(course)
+        if len(batch) >= batch_size:
+            index_courses(batch)
+            total += len(batch)
+            batch = []
+    index_courses(batch)
+    total += len(batch)
+    return total
+
+
+def _corpus_stats():
+    """Document count and average length, cached per process for a few minutes"""
+    now = time.monotonic()
+    if now >= _stats["expires"]:
+        stats = CourseSearchDocument.objects.aggregate(count=Count("course"), avg_length=Avg("length"))
+        _stats.update(
+            count=stats["count"] or 0,
+            avg_length=stats["avg_length"] or 1.0,
+            expires=now + STATS_TTL,
+        )
+    return _stats["count"], _stats["avg_length"]
+
+
+def _idf(df, count):
+    return math.log(1 + (count - df + 0.5) / (df + 0.5))
+
+
+def _expand_query(query):
+    """
+    Map a raw query onto index terms with a weight each. Every token matches
+    exactly; the last token also matches as a prefix so results update while
+    the user is still typing.
+    """
+    tokens = tokenize(query)
+    weights = {token: 1.0 for token in tokens}
+    if tokens and len(tokens[-1]) >= MIN_PREFIX_LENGTH:
+        expansions = (
+            CourseSearchPosting.objects.filter(term__startswith=tokens[-1])
+            .values_list("term", flat=True)
+            .distinct()
+            .order_by("term")[:MAX_PREFIX_EXPANSIONS]
+        )
+        for term in expansions:
+            weights.setdefault(term, PREFIX_WEIGHT)
+    return weights
+
+
+def search(query, limit=DEFAULT_LIMIT):
+    """Return ``[(course_id, score), ...]`` for the best matches, best first"""
+    weights = _expand_query(query)
+    if not weights:
+        return []
+
+    count, avg_length = _corpus_stats()
+    if not count:
+        return []
+
+    postings = CourseSearchPosting.objects.filter(term__in=list(weights))
+    doc_freqs = dict(
+        postings.values("term").annotate(df=Count("course")).values_list("term", "df")
+    )
+    if not doc_freqs:
+        return []
+
+    # BM25 idf, with the prefix discount folded in
+    idf = {
+        term: weights[term] * _idf(df, count)
+        for term, df in doc_freqs.items()
+    }
+    term_weight = Case(
+        *[When(term=term, then=Value(value)) for term, value in idf.items()],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    saturation = (F("tf") * (K1 + 1)) / (
+        F("tf") + K1 * (1 - B + B * F("doc_length") / Value(float(avg_length)))
+    )
+    ranked = (
+        postings.values("course_id")
+        .annotate(score=Sum(term_weight * saturation, output_field=FloatField()))
+        .order_by("-score", "course_id")[:limit]
+    )
+    return [(row["course_id"], row["score"]) for row in ranked]
@@ -1,11 +1,213 @@
+from functools import lru_cache
+
 from rest_framework import serializers
-from coursessvc.models import Course, CourseReview
+from backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.rows import RowMapper
+from coursessvc import plan_validation, ratings, rollups, search
+from coursessvc.models import Assessment, Course, CourseRatingStats, CourseReview
+
+# Upper bound on the ids or codes of one CourseBatch request
+MAX_BATCH_SIZE = 300
+
+# Upper bound on the courses of one plan validated by PlanValidation
+MAX_PLAN_COURSES = 200
+
+
+def rating_stats_for(course):
+    """The course's CourseRatingStats, or None if it has never been reviewed"""
+    try:
+        return course.rating_stats
+    except CourseRatingStats.DoesNotExist:
+        return None
 
 
 class CourseSerializer(serializers.ModelSerializer):
+    # Read from the denormalized stats row; select_related("rating_stats")
+    # when serializing many courses.
+    average_rating = serializers.SerializerMethodField()
+    total_reviews = serializers.SerializerMethodField()
+
     class Meta:
         model = Course
-        fields = "__all__"
+        # Scraper bookkeeping, not part of the course
+        exclude = ["content_hash"]
+
+    def get_average_rating(self, course):
+        return ratings.summary(rating_stats_for(course))["average_rating"]
+
+    def get_total_reviews(self, course):
+        return ratings.summary(rating_stats_for(course))["total_reviews"]
+
+
+# Fast path for bulk reads: CourseSerializer's output minus the rating fields
+COURSE_ROWS = RowMapper(Course, [
+    field.name for field in [*Course._meta.concrete_fields, *Course._meta.many_to_many]
+    if field.name not in CourseSerializer.Meta.exclude
+])
+
+
+@lru_cache(maxsize=64)
+def course_rows(fields):
+    """``RowMapper`` over a tuple of Course fields, compiled once per field list"""
+    return RowMapper(Course, fields)
+
+
+class CourseFilterSerializer(serializers.Serializer):
+    """Validates the filter query parameters of CourseList and CourseExport"""
+    study_area = serializers.ChoiceField(choices=Course.StudyArea.choices, required=False)
+    level = serializers.IntegerField(min_value=0, required=False)
+    credits = serializers.IntegerField(min_value=0, required=False)
+    assessment_type = serializers.ChoiceField(choices=Course.AssessmentType.choices, required=False)
+    offered_sem_1 = serializers.BooleanField(required=False, default=None, allow_null=True)
+    offered_sem_2 = serializers.BooleanField(required=False, default=None, allow_null=True)
+    offered_summer = serializers.BooleanField(required=False, default=None, allow_null=True)
+    code_prefix = serializers.CharField(max_length=32, required=False, trim_whitespace=True)
+    # Code of a course that must appear among the transitive prerequisites
+    requires = serializers.CharField(max_length=32, required=False, trim_whitespace=True)
+    # Assessment mix, from the course's assessment profile; shares and
+    # weights are percentages
+    max_exam_weight = serializers.IntegerField(min_value=0, max_value=100, required=False)
+    max_exam_share = serializers.IntegerField(min_value=0, max_value=100, required=False)
+    max_hurdles = serializers.IntegerField(min_value=0, required=False)
+    min_pass_fail_share = serializers.IntegerField(min_value=0, max_value=100, required=False)
+    max_pass_fail_share = serializers.IntegerField(min_value=0, max_value=100, required=False)
+    min_tasks = serializers.IntegerField(min_value=0, required=False)
+    max_tasks = serializers.IntegerField(min_value=0, required=False)
+
+
+class CommaSeparatedListField(serializers.ListField):
+    """List query parameter given as ``?ids=1,2,3``, repeated keys, or both"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        items = [item.strip() for value in data for item in str(value).split(",")]
+        return super().to_internal_value([item for item in items if item])
+
+
+# Course fields a client can select with ?fields= / ?exclude=. "card" is
+# what a course card shows; the long text columns are only read from the
+# database when asked for.
+TEXT_FIELDS = ("aim", "description")
+RATING_FIELDS = ("average_rating", "total_reviews")
+CARD_FIELDS = (
+    "id",
+    "code",
+    "name",
+    "level",
+    "credits",
+    "study_area",
+    "assessment_type",
+    "offered_sem_1",
+    "offered_sem_2",
+    "offered_summer",
+    "prerequisites",
+    *RATING_FIELDS,
+)
+COURSE_FIELDS = CARD_FIELDS + TEXT_FIELDS
+
+# Columns held in memory by the catalog snapshot: all but the long text
+CATALOG_ROWS = RowMapper(Course, [name for name in CARD_FIELDS if name not in RATING_FIELDS])
+
+
+class CourseFieldsetSerializer(serializers.Serializer):
+    """
+    Sparse fieldsets. ``fields`` names fields or projections ("card", or
+    "full" for every field) and defaults to ``DEFAULT_PROJECTION``;
+    ``exclude`` removes fields from that. The outcome is ``selected``, in
+    ``FIELDS`` order.
+    """
+    FIELDS = COURSE_FIELDS
+    DEFAULT_PROJECTION = "card"
+
+    fields = CommaSeparatedListField(child=serializers.CharField(max_length=32), required=False)
+    exclude = CommaSeparatedListField(child=serializers.CharField(max_length=32), required=False, default=list)
+
+    def projections(self):
+        return {"card": CARD_FIELDS, "full": self.FIELDS}
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        projections = self.projections()
+        chosen = set()
+        for name in attrs.get("fields") or [self.DEFAULT_PROJECTION]:
+            chosen.update(projections.get(name, [name]))
+        unknown = sorted((chosen | set(attrs["exclude"])) - set(self.FIELDS))
+        if unknown:
+            raise serializers.ValidationError({"fields": [f"Unknown field: {name}." for name in unknown]})
+        chosen -= set(attrs["exclude"])
+        attrs["selected"] = tuple(name for name in self.FIELDS if name in chosen)
+        return attrs
+
+
+class CourseExportQuerySerializer(CourseFieldsetSerializer, CourseFilterSerializer):
+    """CourseExport takes the filters and a fieldset, without pagination"""
+
+
+class CourseListQuerySerializer(CourseFieldsetSerializer, CourseFilterSerializer):
+    """Adds CourseList's pagination parameters"""
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
+
+
+class CourseDetailQuerySerializer(CourseFieldsetSerializer):
+    FIELDS = COURSE_FIELDS + ("assessments", "rating_histogram", "reviews", "reviews_next_cursor")
+    DEFAULT_PROJECTION = "full"
+
+
+class CourseBatchQuerySerializer(CourseFieldsetSerializer):
+    # Shorthands for groups of fields, kept from before ?fields=; only
+    # assessments are not fields
+    INCLUDES = {
+        "text": TEXT_FIELDS,
+        "assessments": (),
+        "prerequisites": ("prerequisites",),
+        "ratings": RATING_FIELDS,
+    }
+
+    ids = CommaSeparatedListField(
+        child=serializers.IntegerField(min_value=1), required=False, max_length=MAX_BATCH_SIZE
+    )
+    codes = CommaSeparatedListField(
+        child=serializers.CharField(max_length=32), required=False, max_length=MAX_BATCH_SIZE
+    )
+    include = CommaSeparatedListField(
+        child=serializers.ChoiceField(choices=list(INCLUDES)), required=False, default=list
+    )
+
+    def validate(self, attrs):
+        if bool(attrs.get("ids")) == bool(attrs.get("codes")):
+            raise serializers.ValidationError("Pass exactly one of ids or codes.")
+        attrs = super().validate(attrs)
+        included = {name for include in attrs["include"] for name in self.INCLUDES[include]}
+        attrs["selected"] = tuple(name for name in self.FIELDS if name in attrs["selected"] or name in included)
+        return attrs
+
+
+class CourseSearchQuerySerializer(CourseFieldsetSerializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=search.MAX_LIMIT, default=search.DEFAULT_LIMIT
+    )
+
+
+class PlanEntrySerializer(serializers.Serializer):
+    course_id = serializers.IntegerField(min_value=1)
+    semester = serializers.IntegerField(min_value=1)
+
+
+class PlanValidationSerializer(serializers.Serializer):
+    courses = PlanEntrySerializer(many=True, max_length=MAX_PLAN_COURSES)
+    # Defaults to the year_intake claim of the caller's token
+    year_intake = serializers.ChoiceField(choices=plan_validation.INTAKES, required=False)
+
+    def validate_courses(self, courses):
+        course_ids = [course["course_id"] for course in courses]
+        if len(set(course_ids)) != len(course_ids):
+            raise serializers.ValidationError("A course may appear only once in a plan.")
+        return courses
 
 
 class CourseReviewSerializer(serializers.ModelSerializer):
@@ -15,3 +217,35 @@ class CourseReviewSerializer(serializers.ModelSerializer):
         model = CourseReview
         fields = ["id", "review", "description", "created_at", "user"]
         read_only_fields = ["user", "created_at"]
+
+
+class CourseReviewQuerySerializer(serializers.Serializer):
+    """Validates the sort and pagination parameters of CourseReviews"""
+    # Keyset orderings, each ending in ``id`` and backed by a CourseReview index
+    SORTS = {
+        "newest": ["-created_at", "-id"],
+        "highest": ["-review", "-id"],
+        "lowest": ["review", "id"],
+    }
+
+    sort = serializers.ChoiceField(choices=list(SORTS), default="newest")
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
+
+
+class CourseReviewTrendsQuerySerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=rollups.PERIODS, default="month")
+
+
+# Assessment fields embedded in course responses, plus the course for grouping
+ASSESSMENT_ROWS = RowMapper(
+    Assessment,
+    ["course", "id", "category", "task", "mode", "grading_type", "weight", "description", "hurdle", "hurdle_description"],
+)
+
+# Same output as CourseReviewSerializer
+REVIEW_ROWS = RowMapper(
+    CourseReview, ["id", "review", "description", "created_at"], extra={"user": "user__username"}
+)
@@ -0,0 +1,103 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from coursessvc.models import Assessment, CatalogVersion, Course, CoursePrerequisite, CourseRatingStats, CourseReview
+from coursessvc import assessment_profiles, closure, documents, ratings, rollups, search
+
+
+@receiver(post_save, sender=Course)
+def reindex_course(sender, instance, **kwargs):
+    """Keep the full-text search postings of a course in step with its text"""
+    search.index_course(instance)
+
+
+@receiver(post_delete, sender=CourseReview)
+def remove_review_rating(sender, instance, **kwargs):
+    """Reviews removed outside CourseReviews.post (e.g. account deletion)"""
+    ratings.record_review_change(instance.course_id, old_rating=instance.review)
+    rollups.record_review_change(instance, old_rating=instance.review)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+@receiver(post_save, sender=CoursePrerequisite)
+@receiver(post_delete, sender=CoursePrerequisite)
+def bump_catalog_version(sender, **kwargs):
+    CatalogVersion.bump(CatalogVersion.CATALOG)
+
+
+@receiver(m2m_changed, sender=Course.prerequisites.through)
+def bump_catalog_version_on_m2m(sender, action, **kwargs):
+    # course.prerequisites.add() bulk-inserts links without post_save
+    if action.startswith("post_"):
+        CatalogVersion.bump(CatalogVersion.CATALOG)
+
+
+@receiver(post_save, sender=CourseReview)
+@receiver(post_delete, sender=CourseReview)
+def bump_reviews_version(sender, **kwargs):
+    CatalogVersion.bump(CatalogVersion.REVIEWS)
+
+
+@receiver(post_save, sender=Course)
+def refresh_course_documents(sender, instance, **kwargs):
+    # Courses listing this one as a prerequisite embed its code
+    dependents = instance.unlocking_courses.values_list("id", flat=True)
+    documents.refresh([instance.pk, *dependents])
+
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+@receiver(post_save, sender=CoursePrerequisite)
+@receiver(post_delete, sender=CoursePrerequisite)
+@receiver(post_save, sender=CourseReview)
+@receiver(post_delete, sender=CourseReview)
+@receiver(post_save, sender=CourseRatingStats)
+def refresh_course_document(sender, instance, **kwargs):
+    documents.refresh([instance.course_id])
+
+
+@receiver(m2m_changed, sender=Course.prerequisites.through)
+def refresh_course_documents_on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    # add() bypasses post_save on the through model; remove() and clear()
+    # delete through rows with post_delete, handled above.
+    if action == "post_add":
+        documents.refresh(pk_set if reverse else [instance.pk])
+
+
+@receiver(post_save, sender=CoursePrerequisite)
+def extend_prerequisite_closure(sender, instance, created, **kwargs):
+    if created:
+        closure.add(instance.course_id, instance.prereq_id)
+    else:
+        closure.refresh(instance.course_id)
+
+
+@receiver(post_delete, sender=CoursePrerequisite)
+def refresh_prerequisite_closure(sender, instance, **kwargs):
+    closure.refresh(instance.course_id)
+
+
+@receiver(m2m_changed, sender=Course.prerequisites.through)
+def extend_prerequisite_closure_on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    # As for the documents: only add() bypasses the through model's signals
+    if action == "post_add":
+        for pk in pk_set:
+            if reverse:
+                closure.add(pk, instance.pk)
+            else:
+                closure.add(instance.pk, pk)
+
+
+@receiver(post_save, sender=Course)
+def create_assessment_profile(sender, instance, created, **kwargs):
+    if created:
+        assessment_profiles.refresh([instance.pk])
+
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+def refresh_assessment_profile(sender, instance, **kwargs):
+    assessment_profiles.refresh([instance.course_id])
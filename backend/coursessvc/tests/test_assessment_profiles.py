@@ -0,0 +1,29 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from coursessvc import assessment_profiles
+from coursessvc.models import Assessment, Course, CourseAssessmentProfile
+
+
+class RenderTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(code="COMP3506", name="Algorithms & Data Structures", level=3, credits=2)
+        Assessment.objects.create(
+            course=self.course, category="Examination", task="Final", mode="Written", weight=60, description="",
+        )
+        CourseAssessmentProfile.objects.all().delete()
+
+    def test_profile_written_concurrently_is_replaced(self):
+        bulk_create = CourseAssessmentProfile.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # A concurrent flush stores the profile just before this write
+            CourseAssessmentProfile.objects.create(course=self.course)
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(CourseAssessmentProfile.objects, "bulk_create", racing_bulk_create):
+            assessment_profiles.render([self.course.pk])
+        profile = CourseAssessmentProfile.objects.get(course=self.course)
+        self.assertEqual((profile.task_count, profile.max_exam_weight, profile.exam_share), (1, 60, 100))
+
@@ -0,0 +1,61 @@
+import random
+
+from django.test import TestCase
+
+from coursessvc import closure
+from coursessvc.models import Course, CoursePrerequisite, CoursePrerequisiteClosure
+
+
+class ClosureMaintenanceTests(TestCase):
+    """Signal-driven closure updates must match a rebuild from all links"""
+
+    def setUp(self):
+        Course.objects.bulk_create(
+            Course(code=f"TEST{n:04d}", name=f"Course {n}", level=1, credits=2) for n in range(30)
+        )
+        self.courses = list(Course.objects.order_by("code"))
+
+    def assertClosureCurrent(self):
+        stored = set(CoursePrerequisiteClosure.objects.values_list("ancestor_id", "descendant_id", "depth"))
+        expected = set(closure.closure_rows(CoursePrerequisite.objects.values_list("course_id", "prereq_id")))
+        self.assertEqual(stored, expected)
+
+    def test_random_inserts_and_deletes(self):
+        rng = random.Random(7)
+        for step in range(120):
+            course, prereq = rng.sample(self.courses, 2)
+            if step % 3 == 2 and CoursePrerequisite.objects.exists():
+                CoursePrerequisite.objects.order_by("?").first().delete()
+            elif step % 2:
+                # Cycles included: the data does not forbid them
+                CoursePrerequisite.objects.get_or_create(course=course, prereq=prereq)
+            else:
+                course.prerequisites.add(prereq)
+            self.assertClosureCurrent()
+
+    def test_shorter_chain_lowers_depth(self):
+        a, b, c, d = self.courses[:4]
+        d.prerequisites.add(c)
+        c.prerequisites.add(b)
+        b.prerequisites.add(a)
+        self.assertEqual(CoursePrerequisiteClosure.objects.get(ancestor=a, descendant=d).depth, 3)
+        d.prerequisites.add(a)
+        self.assertEqual(CoursePrerequisiteClosure.objects.get(ancestor=a, descendant=d).depth, 1)
+        d.prerequisites.remove(a)
+        self.assertEqual(CoursePrerequisiteClosure.objects.get(ancestor=a, descendant=d).depth, 3)
+        self.assertClosureCurrent()
+
+    def test_refresh_many_after_bulk_changes(self):
+        a, b, c, d, e = self.courses[:5]
+        CoursePrerequisite.objects.bulk_create([
+            CoursePrerequisite(course=b, prereq=a),
+            CoursePrerequisite(course=d, prereq=c),
+            CoursePrerequisite(course=e, prereq=d),
+        ])
+        closure.rebuild()
+        # Bulk writes skip the signals: link c under b and drop e's link
+        CoursePrerequisite.objects.bulk_create([CoursePrerequisite(course=c, prereq=b)])
+        CoursePrerequisite.objects.filter(course=e).delete()
+        CoursePrerequisite.objects.bulk_create([CoursePrerequisite(course=e, prereq=a)])
+        closure.refresh_many([c.pk, e.pk])
+        self.assertClosureCurrent()
@@ -0,0 +1,26 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from coursessvc import documents
+from coursessvc.models import Course, CourseDetailDocument
+
+
+class RenderTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(code="COMP3506", name="Algorithms & Data Structures", level=3, credits=2)
+        CourseDetailDocument.objects.all().delete()
+
+    def test_document_written_concurrently_is_replaced(self):
+        bulk_create = CourseDetailDocument.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # Another request stores the document just before this write
+            CourseDetailDocument.objects.create(course=self.course, format_version=0, etag="stale", body=b"{}")
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(CourseDetailDocument.objects, "bulk_create", racing_bulk_create):
+            rendered = documents.get_document(self.course.pk)
+        stored = CourseDetailDocument.objects.get(course=self.course)
+        self.assertEqual((stored.format_version, stored.etag), (documents.FORMAT_VERSION, rendered.etag))
+        self.assertEqual(bytes(stored.body), rendered.body)
@@ -0,0 +1,50 @@
+import json
+import tracemalloc
+
+from django.test import TestCase
+from django.urls import reverse
+
+from coursessvc import catalog_cache
+from coursessvc.models import Course
+
+
+class CourseExportMemoryTests(TestCase):
+    """CourseExport streams the catalog in batches: memory must not grow with its size"""
+
+    def add_courses(self, start, count):
+        Course.objects.bulk_create(
+            Course(
+                code=f"TEST{n:05d}", name=f"Generated course {n}", level=1 + n % 7, credits=2, study_area="SCI",
+                aim="Understand the generated material " * 4, description="A generated course description. " * 8,
+                offered_sem_1=n % 2 == 0, offered_sem_2=n % 3 == 0,
+            )
+            for n in range(start, start + count)
+        )
+
+    def stream(self):
+        """``(rows, peak bytes allocated while streaming)`` of a full export"""
+        catalog_cache.clear()
+        tracemalloc.start()
+        try:
+            response = self.client.get(reverse("course-export"))
+            self.assertEqual(response.status_code, 200)
+            body = bytearray()
+            peak = 0
+            for chunk in response.streaming_content:
+                body += chunk
+                # The received body is the client's, not the server's memory
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - len(body))
+                tracemalloc.reset_peak()
+        finally:
+            tracemalloc.stop()
+        return len(json.loads(body)), peak
+
+    def test_peak_memory_is_flat(self):
+        self.add_courses(0, 2000)
+        small_rows, small_peak = self.stream()
+        self.add_courses(2000, 18000)
+        large_rows, large_peak = self.stream()
+
+        self.assertEqual((small_rows, large_rows), (2000, 20000))
+        # Ten times the rows, about the same memory: one batch at a time
+        self.assertLess(large_peak, small_peak * 1.5)
@@ -0,0 +1,52 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from coursessvc import catalog_cache
+from coursessvc.filters import candidate_rows, filter_courses
+from coursessvc.models import Course
+
+
+class CourseListFilterTests(TestCase):
+    def setUp(self):
+        catalog_cache.clear()
+        self.addCleanup(catalog_cache.clear)
+        Course.objects.bulk_create(
+            Course(
+                code=f"{subject}{n:04d}", name=f"Course {n}", level=1 + n % 4, credits=(1, 2, 4)[n % 3],
+                study_area=("SCI", "EAIT")[n % 2], offered_sem_1=n % 5 == 0,
+            )
+            for n, subject in enumerate(["COMP", "COMQ", "CSSE", "MATH"] * 30)
+        )
+
+    def pages(self, params):
+        codes, cursor = [], None
+        while True:
+            page = {**params, "limit": 7, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get(reverse("course-list"), page)
+            self.assertEqual(response.status_code, 200)
+            codes += [row["code"] for row in response.json()["results"]]
+            cursor = response.json()["next_cursor"]
+            if cursor is None:
+                return codes
+
+    def test_pages_match_the_database_filter(self):
+        for params, lookups in [
+            ({"code_prefix": "comp"}, {"code_prefix": "comp"}),
+            ({"level": 2, "study_area": "SCI"}, {"level": 2, "study_area": "SCI"}),
+            ({"code_prefix": "CS", "credits": 4}, {"code_prefix": "CS", "credits": 4}),
+            ({"offered_sem_1": "true", "code_prefix": "MATH"}, {"offered_sem_1": True, "code_prefix": "MATH"}),
+            ({"code_prefix": "ZZZZ"}, {"code_prefix": "ZZZZ"}),
+        ]:
+            with self.subTest(params=params):
+                expected = filter_courses(Course.objects.order_by("code"), lookups).values_list("code", flat=True)
+                self.assertEqual(self.pages(params), list(expected))
+
+    def test_candidates_are_bounded_by_prefix_and_index(self):
+        snapshot = catalog_cache.get_snapshot()
+        rows = candidate_rows(snapshot, {"code_prefix": "comp"}, after="COMP0040")
+        self.assertTrue(rows)
+        self.assertTrue(all(row["code"].startswith("COMP") and row["code"] > "COMP0040" for row in rows))
+        # The shorter list wins: 10 COMP rows of 1 credit against 30 COMP rows
+        rows = candidate_rows(snapshot, {"code_prefix": "COMP", "credits": 1})
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(candidate_rows(snapshot, {"code_prefix": "COMP", "level": 2}), [])
@@ -0,0 +1,38 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from coursessvc.models import Course, CourseAssessmentProfile, CourseSearchDocument
+
+
+class LoadCatalogTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write(self, name, records):
+        path = self.directory / name
+        path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+        return str(path)
+
+    def load(self, **files):
+        call_command("load_catalog", batch_size=1, stdout=StringIO(), **files)
+
+    def test_chunks_committed_before_a_failure_are_refreshed(self):
+        good = {"code": "AAA1001", "name": "Introductory Course", "level": 1, "credits": 2}
+        courses = self.write("courses.jsonl", [good, {"code": "AAA1002", "name": "No level"}])
+        with self.assertRaisesMessage(CommandError, "new course AAA1002 without level, credits"):
+            self.load(courses=courses)
+        course = Course.objects.get(code="AAA1001")
+        self.assertTrue(CourseAssessmentProfile.objects.filter(course=course).exists())
+        self.assertTrue(CourseSearchDocument.objects.filter(course=course).exists())
+
+        # The rerun finds AAA1001 unchanged
+        self.load(courses=self.write("fixed.jsonl", [good, {**good, "code": "AAA1002"}]))
+        self.assertEqual(CourseSearchDocument.objects.count(), 2)
@@ -0,0 +1,131 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.query_budget import QueryBudgetTestMixin
+from coursessvc import catalog_cache
+from coursessvc.models import Assessment, Course, CourseDetailDocument, CoursePrerequisite, CourseReview
+
+
+class CoursesQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """
+    Every budgeted courses-svc endpoint, with a Bearer token and cold
+    per-process caches: the most queries each can issue.
+    """
+
+    def setUp(self):
+        catalog_cache.clear()
+        self.addCleanup(catalog_cache.clear)
+        self.user = get_user_model().objects.create_user("student", "student@uq.edu.au", "password123")
+        token = AccessToken.for_user(self.user)
+        token["program"] = "Bachelor of Computer Science"
+        token["year_intake"] = "SEM1"
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        self.intro = Course.objects.create(
+            code="CSSE1001", name="Introduction to Software Engineering", level=1, credits=2,
+            aim="", description="Programming in Python", study_area="EAIT", offered_sem_1=True,
+        )
+        self.course = Course.objects.create(
+            code="COMP3506", name="Algorithms & Data Structures", level=3, credits=2,
+            aim="", description="Algorithm analysis and design", study_area="EAIT", offered_sem_2=True,
+        )
+        CoursePrerequisite.objects.create(course=self.course, prereq=self.intro)
+
+    def add_assessments(self, course, count):
+        Assessment.objects.bulk_create(
+            Assessment(
+                course=course, category="Assignment", task=f"Task {n}", mode="Written", weight=10, description="",
+            )
+            for n in range(count)
+        )
+
+    def add_reviews(self, course, count):
+        User = get_user_model()
+        start = CourseReview.objects.filter(course=course).count()
+        usernames = [f"reviewer-{course.pk}-{n}" for n in range(start, start + count)]
+        User.objects.bulk_create(User(username=username) for username in usernames)
+        # Read back: MySQL's bulk_create does not set primary keys
+        CourseReview.objects.bulk_create(
+            CourseReview(user=user, course=course, review=Decimal("4.0"), description="Good")
+            for user in User.objects.filter(username__in=usernames)
+        )
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertLess(response.status_code, 400, getattr(response, "data", None))
+        self.assertWithinQueryBudget(response)
+        return response
+
+    def test_catalog_reads(self):
+        self.add_assessments(self.course, 3)
+        course_id = self.course.pk
+        for url, params in [
+            (reverse("course-list"), {}),
+            (reverse("course-list"), {"max_tasks": 5}),
+            (reverse("course-export"), {}),
+            (reverse("course-batch"), {"ids": f"{course_id},{self.intro.pk}", "include": "text,ratings,assessments"}),
+            (reverse("course-search"), {"q": "algorithms"}),
+            (reverse("course-cache-stats"), {}),
+            (reverse("course-detail", args=[course_id]), {}),
+            (reverse("course-prerequisite-tree", args=[course_id]), {}),
+            (reverse("course-unlocks", args=[self.intro.pk]), {}),
+            (reverse("course-review-trends", args=[course_id]), {}),
+            (reverse("study-area-review-trends", args=["EAIT"]), {}),
+        ]:
+            with self.subTest(url=url, params=params):
+                catalog_cache.clear()
+                self.get(url, **params)
+
+    def test_plan_validation(self):
+        response = self.client.post(
+            reverse("course-plan-validate"),
+            {"courses": [{"course_id": self.intro.pk, "semester": 1}, {"course_id": self.course.pk, "semester": 2}]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
+
+    def test_review_writes(self):
+        url = reverse("course-reviews", args=[self.course.pk])
+        created = self.client.post(
+            url, {"review": "4.5", "description": "Hard but fair"}, content_type="application/json"
+        )
+        self.assertEqual(created.status_code, 201)
+        self.assertWithinQueryBudget(created)
+        updated = self.client.post(url, {"review": "3.5", "description": "Hard"}, content_type="application/json")
+        self.assertEqual(updated.status_code, 200)
+        self.assertWithinQueryBudget(updated)
+
+    def test_course_detail_queries_do_not_grow_with_the_course(self):
+        url = reverse("course-detail", args=[self.course.pk])
+        self.add_assessments(self.course, 1)
+        self.add_reviews(self.course, 1)
+        CourseDetailDocument.objects.all().delete()
+        small = self.get(url)
+
+        self.add_assessments(self.course, 30)
+        self.add_reviews(self.course, 60)
+        CourseDetailDocument.objects.all().delete()
+        large = self.get(url)
+        self.assertEqual(len(large.json()["assessments"]), 31)
+        self.assertEqual(large.db_queries, small.db_queries)
+
+        # Then served from the stored document
+        self.assertEqual(self.get(url).db_queries, 1)
+
+    def test_course_reviews_queries_do_not_grow_with_the_reviews(self):
+        url = reverse("course-reviews", args=[self.course.pk])
+        self.add_reviews(self.course, 2)
+        small = self.get(url, limit=50)
+
+        self.add_reviews(self.course, 80)
+        self.add_assessments(self.course, 20)
+        large = self.get(url, limit=50)
+        self.assertEqual(len(large.json()["results"]), 50)
+        self.assertEqual(large.db_queries, small.db_queries)
+
+        following = self.get(url, limit=50, cursor=large.json()["next_cursor"])
+        self.assertEqual(following.db_queries, small.db_queries)
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from coursessvc import rollups
+from coursessvc.models import Course, CourseReview, CourseReviewRollup
+
+
+class CompactTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(code="COMP3506", name="Algorithms & Data Structures", level=3, credits=2)
+        User = get_user_model()
+        self.reviews = []
+        for n, rating in enumerate(["4.0", "3.5", "5.0", "2.0"]):
+            review = CourseReview.objects.create(
+                user=User.objects.create(username=f"student{n}"), course=self.course,
+                review=Decimal(rating), description="", reviewer_program="BCompSc" if n % 2 else "",
+            )
+            rollups.record_review_change(review, new_rating=review.review)
+            self.reviews.append(review)
+
+    def stored(self):
+        return sorted(CourseReviewRollup.objects.values_list("month", "program", "review_count", "review_sum", "histogram"))
+
+    def test_compact_matches_rebuild(self):
+        removed = self.reviews.pop()
+        removed.delete()
+        self.assertEqual(rollups.compact(), 2)
+        compacted = self.stored()
+        rollups.rebuild()
+        self.assertEqual(compacted, self.stored())
+        self.assertEqual(rollups.compact(), 0)
@@ -0,0 +1,261 @@
+import hashlib
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from backend.scraping import Fetcher, RateLimiter
+from coursessvc import loader, scraper
+from coursessvc.models import Assessment, Course, CourseSearchDocument
+
+FIXTURES = Path(__file__).parent / "fixtures" / "scraper"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """
+    Serves ``course_<code>.html`` for ``/course.html?course_code=<code>`` and
+    ``profile_<code>.html`` for ``/course-profiles/<code>-...``, with ETags.
+    Paths in ``server.throttled`` answer 429 that many times first.
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.log.append((time.monotonic(), self.path, dict(self.headers)))
+            remaining = server.throttled.get(self.path, 0)
+            if remaining:
+                server.throttled[self.path] = remaining - 1
+        if remaining:
+            self.send_response(429)
+            self.send_header("Retry-After", server.retry_after)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        url = urlsplit(self.path)
+        if url.path == "/course.html":
+            name = "course_{}.html".format(parse_qs(url.query).get("course_code", [""])[0])
+        else:
+            match = re.match(r"/course-profiles/([A-Z]{4}\d{4})-", url.path)
+            name = f"profile_{match.group(1)}.html" if match else ""
+        path = FIXTURES / name
+        if not name or not path.is_file():
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = path.read_bytes()
+        etag = '"{}"'.format(hashlib.sha256(body).hexdigest()[:16])
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServerMixin:
+    def setUp(self):
+        super().setUp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        self.server.lock = threading.Lock()
+        self.server.log = []
+        self.server.throttled = {}
+        self.server.retry_after = "0"
+        self.base_url = "http://127.0.0.1:{}".format(self.server.server_address[1])
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+    def requested(self, path):
+        return [entry for entry in self.server.log if entry[1] == path]
+
+
+class ParseTests(SimpleTestCase):
+    def test_parse_course(self):
+        record, profile = scraper.parse_course("COMP3506", (FIXTURES / "course_COMP3506.html").read_text())
+        self.assertEqual(record["name"], "Algorithms & Data Structures")
+        self.assertEqual(record["level"], 3)
+        self.assertEqual(record["credits"], 2)
+        self.assertEqual(
+            (record["offered_sem_1"], record["offered_sem_2"], record["offered_summer"]), (False, True, False)
+        )
+        self.assertEqual(record["prerequisites"], ["CSSE2002", "CSSE7023", "MATH1061"])
+        self.assertEqual(profile, "/course-profiles/COMP3506-20202-7520")
+
+    def test_parse_course_without_units(self):
+        with self.assertRaises(scraper.ParseError):
+            scraper.parse_course("COMP9999", (FIXTURES / "course_COMP9999.html").read_text())
+
+    def test_parse_assessments(self):
+        records = scraper.parse_assessments("COMP3506", (FIXTURES / "profile_COMP3506.html").read_text())
+        self.assertEqual(
+            [(record["task"], record["grading_type"], record["weight"], record["hurdle"]) for record in records],
+            [
+                ("Programming Assignment 1", "percentage", 20, False),
+                ("Weekly Quizzes", "percentage", 15, False),
+                ("Final Examination", "percentage", 50, True),
+                ("Tutorial Attendance", "pass_fail", None, False),
+            ],
+        )
+
+    def test_parse_empty_assessment_table(self):
+        self.assertEqual(
+            scraper.parse_assessments("MATH1061", (FIXTURES / "profile_MATH1061.html").read_text()), []
+        )
+
+
+class FetcherTests(FixtureServerMixin, SimpleTestCase):
+    PATH = "/course.html?course_code=COMP3506"
+
+    def test_retries_429_after_retry_after(self):
+        self.server.throttled[self.PATH] = 2
+        fetcher = Fetcher(rate=0, backoff=0)
+        response = fetcher.get(self.base_url + self.PATH)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.requested(self.PATH)), 3)
+
+    def test_gives_up_after_retries(self):
+        self.server.throttled[self.PATH] = 10
+        fetcher = Fetcher(rate=0, retries=1, backoff=0)
+        with self.assertRaises(requests.HTTPError):
+            fetcher.get(self.base_url + self.PATH)
+        self.assertEqual(len(self.requested(self.PATH)), 2)
+
+    def test_retry_after_is_capped(self):
+        self.server.throttled[self.PATH] = 1
+        self.server.retry_after = "3600"
+        fetcher = Fetcher(rate=0, max_retry_after=0.05)
+        started = time.monotonic()
+        self.assertEqual(fetcher.get(self.base_url + self.PATH).status_code, 200)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_rate_limit_holds_across_workers(self):
+        rate = 20
+        fetcher = Fetcher(rate=rate, workers=4)
+        urls = [self.base_url + self.PATH + f"&n={n}" for n in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(fetcher.get, urls))
+        times = sorted(entry[0] for entry in self.server.log)
+        self.assertEqual(len(times), 8)
+        # Allow for scheduling jitter on arrival, not for a burst
+        self.assertGreaterEqual(times[-1] - times[0], 7 / rate * 0.8)
+
+    def test_rate_limiter_spacing(self):
+        limiter = RateLimiter(50)
+        started = time.monotonic()
+        for _ in range(6):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - started, 5 / 50 * 0.9)
+
+    def test_cache_revalidates_with_etag(self):
+        fetcher = Fetcher(rate=0, cache_dir=self.cache_dir.name)
+        first = fetcher.get(self.base_url + self.PATH)
+        second = fetcher.get(self.base_url + self.PATH)
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(self.requested(self.PATH)[1][2].get("If-None-Match"), first.headers["ETag"])
+        self.assertEqual(fetcher.stats, {"fetched": 1, "not_modified": 1})
+
+
+class ScrapeCoursesTests(FixtureServerMixin, TestCase):
+    def scrape(self, *codes):
+        out = StringIO()
+        call_command(
+            "scrape_courses", *codes, base_url=self.base_url, rate=0, workers=4,
+            cache_dir=self.cache_dir.name, stdout=out,
+        )
+        return out.getvalue()
+
+    def test_scrape_courses(self):
+        self.scrape("COMP3506", "CSSE2002", "MATH1061")
+        course = Course.objects.get(code="COMP3506")
+        self.assertEqual((course.name, course.level, course.credits), ("Algorithms & Data Structures", 3, 2))
+        self.assertTrue(course.offered_sem_2)
+        self.assertEqual(
+            set(course.prerequisites.values_list("code", flat=True)), {"CSSE2002", "MATH1061"}
+        )
+        self.assertEqual(
+            list(course.assessments.order_by("id").values_list("task", "weight", "hurdle")),
+            [
+                ("Programming Assignment 1", 20, False),
+                ("Weekly Quizzes", 15, False),
+                ("Final Examination", 50, True),
+                ("Tutorial Attendance", None, False),
+            ],
+        )
+        self.assertEqual(Course.objects.get(code="CSSE2002").assessments.count(), 0)
+
+    def test_page_without_units_fails_only_that_course(self):
+        out = self.scrape("COMP9999", "CSSE2002")
+        self.assertIn("Failed COMP9999", out)
+        self.assertFalse(Course.objects.filter(code="COMP9999").exists())
+        self.assertTrue(Course.objects.filter(code="CSSE2002").exists())
+
+    def test_missing_course_is_reported(self):
+        out = self.scrape("ABCD1234")
+        self.assertIn("Not found: ABCD1234", out)
+
+    def test_empty_profile_clears_assessments(self):
+        course = Course.objects.create(code="MATH1061", name="Discrete Mathematics", level=1, credits=2)
+        Assessment.objects.create(course=course, category="Exam", task="Final", mode="", description="")
+        self.scrape("MATH1061")
+        self.assertEqual(course.assessments.count(), 0)
+
+    def test_course_without_profile_keeps_assessments(self):
+        course = Course.objects.create(code="CSSE2002", name="Programming in the Large", level=2, credits=2)
+        Assessment.objects.create(course=course, category="Exam", task="Final", mode="", description="")
+        self.scrape("CSSE2002")
+        self.assertEqual(course.assessments.count(), 1)
+
+    def test_throttled_page_is_retried(self):
+        self.server.throttled["/course.html?course_code=COMP3506"] = 1
+        self.scrape("COMP3506")
+        self.assertTrue(Course.objects.filter(code="COMP3506").exists())
+        self.assertEqual(len(self.requested("/course.html?course_code=COMP3506")), 2)
+
+    def test_second_scrape_is_served_from_the_cache(self):
+        self.scrape("CSSE2002", "MATH1061")
+        version = Course.objects.get(code="MATH1061").content_hash
+        out = self.scrape("CSSE2002", "MATH1061")
+        # Two course pages and MATH1061's profile, all revalidated
+        self.assertIn("0 fetched, 3 not modified", out)
+        self.assertIn("0 changed, 2 unchanged", out)
+        self.assertEqual(Course.objects.get(code="MATH1061").content_hash, version)
+
+    def test_hash_is_stored_once_links_are_written(self):
+        with mock.patch("coursessvc.loader.load_prerequisites", side_effect=loader.LoadError("links failed")):
+            with self.assertRaisesMessage(CommandError, "links failed"):
+                self.scrape("MATH1061")
+        course = Course.objects.get(code="MATH1061")
+        self.assertEqual(course.content_hash, "")
+        self.assertTrue(CourseSearchDocument.objects.filter(course=course).exists())
+
+        self.scrape("MATH1061")
+        self.assertNotEqual(Course.objects.get(code="MATH1061").content_hash, "")
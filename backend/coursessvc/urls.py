@@ -4,6 +4,15 @@ import coursessvc.views
 urlpatterns = [
     path("courses/health/", coursessvc.views.HealthCheck.as_view(), name="courses-health"),
     path("courses/", coursessvc.views.CourseList.as_view(), name="course-list"),
+    path("courses/batch/", coursessvc.views.CourseBatch.as_view(), name="course-batch"),
+    path("courses/export/", coursessvc.views.CourseExport.as_view(), name="course-export"),
+    path("courses/plan/validate/", coursessvc.views.PlanValidation.as_view(), name="course-plan-validate"),
+    path("courses/search/", coursessvc.views.CourseSearch.as_view(), name="course-search"),
+    path("courses/areas/<str:study_area>/review-trends/", coursessvc.views.StudyAreaReviewTrends.as_view(), name="study-area-review-trends"),
+    path("courses/cache/stats/", coursessvc.views.CatalogCacheStats.as_view(), name="course-cache-stats"),
     path("courses/<int:course_id>/", coursessvc.views.CourseDetail.as_view(), name="course-detail"),
+    path("courses/<int:course_id>/prerequisites/tree/", coursessvc.views.PrerequisiteTree.as_view(), name="course-prerequisite-tree"),
+    path("courses/<int:course_id>/unlocks/", coursessvc.views.CourseUnlocks.as_view(), name="course-unlocks"),
     path("courses/<int:course_id>/reviews/", coursessvc.views.CourseReviews.as_view(), name="course-reviews"),
+    path("courses/<int:course_id>/reviews/trends/", coursessvc.views.CourseReviewTrends.as_view(), name="course-review-trends"),
 ]
@@ -1,11 +1,59 @@
+from collections import defaultdict
+from itertools import islice
+
+import orjson
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from django.db import models
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from coursessvc.models import Course, CourseReview
-from .serializers import CourseSerializer, CourseReviewSerializer
+from django.views.decorators.http import condition
+from backend.pagination import decode_cursor, encode_cursor
+from backend.query_budget import query_budget
+from backend.streaming import StreamingJSONResponse
+from coursessvc import catalog_cache, documents, plan_validation, ratings, rollups, search
+from coursessvc.models import Assessment, CatalogVersion, Course, CourseReview, CourseReviewRollup
+from .filters import candidate_rows, course_matches, filter_courses, uses_profile
+from .serializers import ASSESSMENT_ROWS, RATING_FIELDS, REVIEW_ROWS, TEXT_FIELDS, CourseBatchQuerySerializer, CourseDetailQuerySerializer, CourseExportQuerySerializer, CourseReviewQuerySerializer, CourseReviewSerializer, CourseReviewTrendsQuerySerializer, CourseListQuerySerializer, CourseSearchQuerySerializer, PlanValidationSerializer, course_rows
+
+# Rows fetched and rendered per step of a streamed response
+STREAM_BATCH_SIZE = 500
+
+
+def catalog_etag(request, *args, **kwargs):
+    """ETag for course representations: changes with the catalog or any review"""
+    catalog, reviews = CatalogVersion.current(CatalogVersion.CATALOG, CatalogVersion.REVIEWS)
+    catalog_cache.validate(catalog)
+    return f"catalog-{catalog}.{reviews}"
+
+
+def project(rows, selected):
+    """
+    Copies of course rows cut down to the ``selected`` fields. Text columns
+    missing from the rows are read for just these rows, and rating
+    summaries only looked up, when selected.
+    """
+    if not rows:
+        return []
+    ids = [row["id"] for row in rows]
+    text = [name for name in TEXT_FIELDS if name in selected and name not in rows[0]]
+    texts = {}
+    if text:
+        values = Course.objects.filter(id__in=ids).values_list("id", *text)
+        texts = {course_id: dict(zip(text, columns)) for course_id, *columns in values}
+    summaries = {}
+    if any(name in selected for name in RATING_FIELDS):
+        summaries = ratings.summaries(ids)
+
+    projected = []
+    for row in rows:
+        # A course deleted since the snapshot was built has no text left
+        full = {**row, **texts.get(row["id"], dict.fromkeys(text)), **summaries.get(row["id"], {})}
+        projected.append({name: full[name] for name in selected})
+    return projected
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -16,98 +64,371 @@ class HealthCheck(APIView):
         return Response({"status": "ok"})
 
 
+class CatalogCacheStats(APIView):
+    """Hit/miss counters of this worker's catalog cache"""
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    @query_budget(0)
+    def get(self, request):
+        return Response(catalog_cache.get_stats())
+
+
+def course_document_etag(request, course_id):
+    """ETag of the course's materialized document, which is kept on the request for the view"""
+    request.course_document = documents.get_document(course_id)
+    return request.course_document.etag if request.course_document else None
+
+
 class CourseDetail(APIView):
+    # Public and user-independent: skip the JWT user lookup
+    authentication_classes = []
+
+    # One primary-key read of the materialized document, or a render and
+    # store (course, assessments, reviews, prerequisites, delete, insert)
+    # when the course has no current document yet.
+    @query_budget(7)
+    @method_decorator(condition(etag_func=course_document_etag))
     def get(self, request, course_id):
-        try:
-            course = Course.objects.select_related().prefetch_related(
-                'assessments', 'reviews__user'
-            ).get(id=course_id)
-            
-            # Calculate average rating
-            reviews = course.reviews.all()
-            average_rating = reviews.aggregate(
-                avg_rating=models.Avg('review')
-            )['avg_rating'] or 0
-            
-            # Get prerequisites
-            prerequisites = course.prerequisites.values_list('code', flat=True)
-            
-            course_data = CourseSerializer(course).data
-            course_data['assessments'] = [
-                {
-                    'id': assessment.id,
-                    'category': assessment.category,
-                    'task': assessment.task,
-                    'mode': assessment.mode,
-                    'grading_type': assessment.grading_type,
-                    'weight': assessment.weight,
-                    'description': assessment.description,
-                    'hurdle': assessment.hurdle,
-                    'hurdle_description': assessment.hurdle_description,
-                }
-                for assessment in course.assessments.all()
-            ]
-            course_data['reviews'] = [
-                {
-                    'id': review.id,
-                    'review': float(review.review),
-                    'description': review.description,
-                    'created_at': review.created_at.isoformat(),
-                    'user': {'username': review.user.username}
-                }
-                for review in reviews
-            ]
-            course_data['average_rating'] = round(average_rating, 1)
-            course_data['total_reviews'] = reviews.count()
-            course_data['prerequisites'] = list(prerequisites)
-            
-            return Response(course_data)
-        except Course.DoesNotExist:
+        query = CourseDetailQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        document = request.course_document
+        if document is None:
             return Response(
                 {"detail": "Course not found"}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+        selected = query.validated_data["selected"]
+        if selected == CourseDetailQuerySerializer.FIELDS:
+            return HttpResponse(bytes(document.body), content_type="application/json")
+        # The document is stored whole; a fieldset is cut from it
+        data = orjson.loads(document.body)
+        return Response({name: data[name] for name in selected})
 
 
+# Course rows are read from the worker's catalog snapshot. The budgets below
+# include the three queries of a snapshot rebuild (version, courses,
+# prerequisites). Catalog reads are public and the same for every user, so
+# like CourseDetail they skip authentication and its JWT user lookup.
+
 class CourseList(APIView):
+    authentication_classes = []
+
+    # Catalog version, the rating summaries and text of the page, plus the
+    # snapshot's assessment profiles the first time a filter needs them
+    @query_budget(7)
+    @method_decorator(condition(etag_func=catalog_etag))
+    def get(self, request):
+        query = CourseListQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+
+        # Same cursor format as paginate_keyset(..., ["code"], ...)
+        after = None
+        if params.get("cursor"):
+            try:
+                (after,) = decode_cursor(params["cursor"])
+            except ValueError:
+                pass
+            if not isinstance(after, str):
+                return Response({"cursor": ["Invalid cursor."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        limit = params["limit"]
+        snapshot = catalog_cache.get_snapshot()
+        rows = candidate_rows(snapshot, params, after)
+        if params.get("requires"):
+            required = snapshot.by_code.get(params["requires"].upper())
+            unlocked = snapshot.graph.transitive_unlocks(required["id"]) if required else {}
+            rows = (row for row in rows if row["id"] in unlocked)
+        profiles = snapshot.assessment_profiles if uses_profile(params) else {}
+        matches = (row for row in rows if course_matches(row, params, profiles.get(row["id"])))
+        page = list(islice(matches, limit + 1))
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor([page[-1]["code"]])
+
+        return Response({"results": project(page, params["selected"]), "next_cursor": next_cursor})
+
+
+class CourseExport(APIView):
+    """The whole filtered catalog as one JSON array, streamed from the database in batches"""
+    authentication_classes = []
+
+    # Only the ETag's version read happens before streaming starts
+    @query_budget(1)
+    @method_decorator(condition(etag_func=catalog_etag))
+    def get(self, request):
+        query = CourseExportQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        selected = query.validated_data["selected"]
+
+        courses = filter_courses(Course.objects.all(), query.validated_data)
+        # Only the selected columns are read, plus the id and keyset code
+        columns = ("id", "code", *(name for name in selected if name not in RATING_FIELDS))
+        rows = course_rows(tuple(dict.fromkeys(columns)))
+        batches = rows.batches(courses, ["code"], STREAM_BATCH_SIZE)
+        return StreamingJSONResponse(project(batch, selected) for batch in batches)
+
+
+def graph_etag(request, *args, **kwargs):
+    """ETag for responses derived from the catalog alone"""
+    (catalog,) = CatalogVersion.current(CatalogVersion.CATALOG)
+    catalog_cache.validate(catalog)
+    return f"graph-{catalog}"
+
+
+def course_summary(snapshot, course_id):
+    row = snapshot.by_id[course_id]
+    return {"id": row["id"], "code": row["code"], "name": row["name"]}
+
+
+class PrerequisiteTree(APIView):
+    authentication_classes = []
+
+    # Catalog version, plus a snapshot rebuild
+    @query_budget(4)
+    @method_decorator(condition(etag_func=graph_etag))
+    def get(self, request, course_id):
+        snapshot = catalog_cache.get_snapshot()
+        if course_id not in snapshot.by_id:
+            return Response({"detail": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
+        graph = snapshot.graph
+
+        required = graph.transitive_prerequisites(course_id)
+        return Response({
+            "course": course_summary(snapshot, course_id),
+            "depth": graph.chain_depth(course_id),
+            "tree": graph.tree(course_id, lambda node: course_summary(snapshot, node)),
+            # Every transitive prerequisite, in an order they can be taken
+            "order": [course_summary(snapshot, node) for node in graph.topological_order(required)],
+        })
+
+
+class CourseUnlocks(APIView):
+    authentication_classes = []
+
+    # Catalog version, plus a snapshot rebuild
+    @query_budget(4)
+    @method_decorator(condition(etag_func=graph_etag))
+    def get(self, request, course_id):
+        snapshot = catalog_cache.get_snapshot()
+        if course_id not in snapshot.by_id:
+            return Response({"detail": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
+        graph = snapshot.graph
+
+        unlocks = graph.transitive_unlocks(course_id)
+        return Response({
+            "course": course_summary(snapshot, course_id),
+            "direct": [
+                course_summary(snapshot, node)
+                for node in sorted(graph.direct_unlocks(course_id), key=lambda node: snapshot.by_id[node]["code"])
+            ],
+            "transitive": [
+                {**course_summary(snapshot, node), "distance": distance}
+                for node, distance in sorted(
+                    unlocks.items(), key=lambda item: (item[1], snapshot.by_id[item[0]]["code"])
+                )
+            ],
+        })
+
+
+class CourseBatch(APIView):
+    """Course records (the card fieldset by default) for up to MAX_BATCH_SIZE courses given by ``ids`` or ``codes``"""
+    authentication_classes = []
+
+    # Catalog version and a snapshot rebuild, then at most one query each
+    # for text, ratings and assessments whatever the batch size
+    @query_budget(7)
+    @method_decorator(condition(etag_func=catalog_etag))
+    def get(self, request):
+        query = CourseBatchQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        include = set(params["include"])
+
+        snapshot = catalog_cache.get_snapshot()
+        if params.get("ids"):
+            requested, lookup = params["ids"], snapshot.by_id
+        else:
+            requested, lookup = [code.upper() for code in params["codes"]], snapshot.by_code
+        requested = list(dict.fromkeys(requested))
+        rows = [lookup[key] for key in requested if key in lookup]
+
+        results = project(rows, params["selected"])
+        if "prerequisites" in params["selected"]:
+            for result in results:
+                result["prerequisites"] = [
+                    snapshot.by_id[prereq]["code"] for prereq in result["prerequisites"] if prereq in snapshot.by_id
+                ]
+        if "assessments" in include and results:
+            assessments = defaultdict(list)
+            course_assessments = Assessment.objects.filter(
+                course_id__in=[result["id"] for result in results]
+            ).order_by("id")
+            for assessment in ASSESSMENT_ROWS.rows(course_assessments):
+                assessments[assessment.pop("course")].append(assessment)
+            for result in results:
+                result["assessments"] = assessments[result["id"]]
+
+        return Response({
+            "results": results,
+            # Requested ids or codes with no course, instead of a 404
+            "missing": [key for key in requested if key not in lookup],
+        })
+
+
+class PlanValidation(APIView):
+    """Every prerequisite, offering and credit load violation of a degree plan"""
+    # JWT user, then the catalog version check and a snapshot rebuild
+    @query_budget(5)
+    def post(self, request):
+        serializer = PlanValidationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        year_intake = params.get("year_intake") or (request.auth.get("year_intake") if request.auth else None)
+        if year_intake not in plan_validation.INTAKES:
+            year_intake = plan_validation.INTAKES[0]
+
+        violations, semesters = plan_validation.validate_plan(
+            catalog_cache.get_snapshot(),
+            params["courses"],
+            year_intake,
+            getattr(settings, "PLAN_MAX_SEMESTER_CREDITS", plan_validation.DEFAULT_MAX_SEMESTER_CREDITS),
+        )
+        return Response({
+            "valid": not violations,
+            "year_intake": year_intake,
+            "semesters": semesters,
+            "violations": violations,
+        })
+
+
+class CourseSearch(APIView):
+    authentication_classes = []
+
+    # Ranking, plus a snapshot revalidation, the rating summaries and text
+    @query_budget(10)
     def get(self, request):
-        queryset = Course.objects.all().order_by("code")
-        data = CourseSerializer(queryset, many=True).data
-        return Response(data)
+        query = CourseSearchQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        ranked = search.search(query.validated_data["q"], query.validated_data["limit"])
+        snapshot = catalog_cache.get_snapshot()
+
+        ranked = [(course_id, score) for course_id, score in ranked if course_id in snapshot.by_id]
+        results = project([snapshot.by_id[course_id] for course_id, _ in ranked], query.validated_data["selected"])
+        for row, (_, score) in zip(results, ranked):
+            row["score"] = round(score, 4)
+        return Response({"results": results})
 
 
 class CourseReviews(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    # JWT user, course lookup and one index range scan for the page
+    @query_budget(3)
     def get(self, request, course_id):
-        try:
-            course = Course.objects.get(id=course_id)
-            reviews = CourseReview.objects.filter(course=course).select_related('user')
-            serializer = CourseReviewSerializer(reviews, many=True)
-            return Response(serializer.data)
-        except Course.DoesNotExist:
+        query = CourseReviewQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+
+        if not Course.objects.filter(id=course_id).exists():
             return Response({"detail": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
+        reviews = CourseReview.objects.filter(course_id=course_id)
+        try:
+            page, next_cursor = REVIEW_ROWS.page(
+                reviews,
+                CourseReviewQuerySerializer.SORTS[params["sort"]],
+                params.get("cursor"),
+                params["limit"],
+            )
+        except ValueError:
+            return Response({"cursor": ["Invalid cursor."]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": page, "next_cursor": next_cursor})
 
+    # Worst case is a course's first review: creating its stats row, the
+    # rollup delta and re-rendering the detail document after commit
+    @query_budget(15)
     def post(self, request, course_id):
         try:
             course = Course.objects.get(id=course_id)
             serializer = CourseReviewSerializer(data=request.data)
             if serializer.is_valid():
-                # Check if user already reviewed this course
-                existing_review = CourseReview.objects.filter(
-                    user=request.user, course=course
-                ).first()
-                
-                if existing_review:
-                    # Update existing review
-                    existing_review.review = serializer.validated_data['review']
-                    existing_review.description = serializer.validated_data.get('description', '')
-                    existing_review.save()
-                    return Response(CourseReviewSerializer(existing_review).data)
-                else:
-                    # Create new review
-                    review = serializer.save(user=request.user, course=course)
-                    return Response(CourseReviewSerializer(review).data, status=status.HTTP_201_CREATED)
+                with transaction.atomic():
+                    # Check if user already reviewed this course
+                    existing_review = CourseReview.objects.select_for_update().filter(
+                        user=request.user, course=course
+                    ).first()
+                    
+                    if existing_review:
+                        # Update existing review
+                        old_rating = existing_review.review
+                        existing_review.review = serializer.validated_data['review']
+                        existing_review.description = serializer.validated_data.get('description', '')
+                        existing_review.save()
+                        ratings.record_review_change(course.id, old_rating, existing_review.review)
+                        rollups.record_review_change(existing_review, old_rating, existing_review.review)
+                        return Response(CourseReviewSerializer(existing_review).data)
+                    else:
+                        # Create new review
+                        review = serializer.save(
+                            user=request.user,
+                            course=course,
+                            reviewer_program=request.auth.get("program", "") if request.auth else "",
+                        )
+                        ratings.record_review_change(course.id, new_rating=review.review)
+                        rollups.record_review_change(review, new_rating=review.review)
+                        return Response(CourseReviewSerializer(review).data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Course.DoesNotExist:
             return Response({"detail": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
+
+
+class CourseReviewTrends(APIView):
+    authentication_classes = []
+
+    # Catalog and reviews versions, the course's rollup rows, plus a
+    # snapshot rebuild
+    @query_budget(5)
+    @method_decorator(condition(etag_func=catalog_etag))
+    def get(self, request, course_id):
+        query = CourseReviewTrendsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        snapshot = catalog_cache.get_snapshot()
+        if course_id not in snapshot.by_id:
+            return Response({"detail": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        rows = CourseReviewRollup.objects.filter(course_id=course_id)
+        return Response({
+            "course": course_summary(snapshot, course_id),
+            **rollups.trends(rows, query.validated_data["period"]),
+        })
+
+
+class StudyAreaReviewTrends(APIView):
+    authentication_classes = []
+
+    # Catalog and reviews versions and the area's rollup rows
+    @query_budget(2)
+    @method_decorator(condition(etag_func=catalog_etag))
+    def get(self, request, study_area):
+        if study_area not in Course.StudyArea.values:
+            return Response({"detail": "Study area not found"}, status=status.HTTP_404_NOT_FOUND)
+        query = CourseReviewTrendsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = CourseReviewRollup.objects.filter(course__study_area=study_area)
+        return Response({
+            "study_area": study_area,
+            **rollups.trends(rows, query.validated_data["period"]),
+        })
@@ -0,0 +1,217 @@
+"""
+Authoritative course data for planner responses, from courses-svc.
+
+The planner stores only the ``course_code`` and ``course_name`` a client
+sent. ``enrich`` adds the current catalog record of each planned course to
+response rows, read through ``CoursesClient``:
+
+- ids are looked up in a per-process ``CourseCache`` first, and the rest
+  fetched with one ``/courses/batch/`` call per ``BATCH_SIZE`` ids over a
+  pooled keep-alive connection (``backend.service_client``);
+- cache entries belong to the catalog version named in the batch
+  response's ETag. Before cached entries are served, and at most once
+  every ``COURSE_CACHE_CHECK_INTERVAL`` seconds, one batch request for a
+  single cached id carrying that ETag in ``If-None-Match`` confirms the
+  version with a 304. Any response from a newer version drops every older
+  entry at once;
+- at most ``COURSE_CACHE_SIZE`` entries are kept, least recently used
+  evicted first, each for at most ``COURSE_CACHE_TTL`` seconds. That bounds
+  how stale the records served while courses-svc cannot be asked get;
+- when courses-svc is slow, failing or behind an open circuit, cached
+  records are served unconfirmed, and other rows keep their stored code
+  and name and carry ``"course": None``.
+"""
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from backend.service_client import CircuitBreaker, ServiceClient, ServiceUnavailable
+
+logger = logging.getLogger(__name__)
+
+# Catalog fields only: ratings change with every review and are not cached
+FIELDS = (
+    "id", "code", "name", "level", "credits", "study_area", "assessment_type",
+    "offered_sem_1", "offered_sem_2", "offered_summer", "prerequisites",
+)
+# Most ids courses-svc's CourseBatch accepts in one call
+BATCH_SIZE = 300
+# CourseBatch ETags are "catalog-<catalog version>.<reviews version>"
+VERSION_RE = re.compile(r"catalog-(\d+)")
+
+DEFAULT_URL = "http://localhost:8002/api"
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_CACHE_TTL = 300.0
+DEFAULT_CACHE_SIZE = 5000
+DEFAULT_CHECK_INTERVAL = 5.0
+
+_lock = threading.Lock()
+_state = {"client": None}
+
+
+class CourseCache:
+    """
+    Course records by id for the newest catalog version seen, with a TTL and
+    LRU eviction, and the ETag to revalidate them with
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL, check_interval=DEFAULT_CHECK_INTERVAL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.version = None
+        self.etag = None
+        self.checked_at = 0.0
+        # id -> (expires at, record, or None for an id with no course)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, ids):
+        """``({id: record or None}, [ids not cached])``"""
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for course_id in ids:
+                entry = self._entries.get(course_id)
+                if entry is None or entry[0] <= now:
+                    missing.append(course_id)
+                    continue
+                self._entries.move_to_end(course_id)
+                found[course_id] = entry[1]
+        return found, missing
+
+    def needs_check(self):
+        """Whether the cached version is due to be confirmed"""
+        with self._lock:
+            return self.etag is not None and time.monotonic() - self.checked_at >= self.check_interval
+
+    def confirm(self):
+        """Record that courses-svc confirmed the cached version"""
+        with self._lock:
+            self.checked_at = time.monotonic()
+
+    def put_many(self, version, etag, records):
+        """Store ``{id: record or None}`` read at catalog ``version``, under ``etag``"""
+        now = time.monotonic()
+        with self._lock:
+            if self.version is not None and version is not None:
+                if version < self.version:
+                    # A response that raced a newer one: serve it, don't keep it
+                    return
+                if version > self.version:
+                    self._entries.clear()
+            if version is not None:
+                self.version = version
+                self.etag = etag
+                self.checked_at = now
+            for course_id, record in records.items():
+                self._entries[course_id] = (now + self.ttl, record)
+                self._entries.move_to_end(course_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.version = None
+            self.etag = None
+            self.checked_at = 0.0
+
+
+class CoursesClient:
+    def __init__(self, service, cache):
+        self.service = service
+        self.cache = cache
+
+    def _fetch(self, ids, etag=None):
+        """
+        ``{id: record or None}`` for ``ids``, straight from courses-svc, or
+        None when ``etag`` is given and still current
+        """
+        response = self.service.get(
+            "/courses/batch/",
+            {"ids": ",".join(map(str, ids)), "fields": ",".join(FIELDS)},
+            headers={"If-None-Match": etag} if etag else None,
+        )
+        if etag and response.status_code == 304:
+            self.cache.confirm()
+            return None
+        try:
+            data = response.json()
+            records = dict.fromkeys(ids)
+            records.update((record["id"], record) for record in data["results"])
+        except (ValueError, KeyError, TypeError) as exc:
+            raise ServiceUnavailable(f"Unexpected course batch response: {exc}") from exc
+        etag = response.headers.get("ETag", "")
+        match = VERSION_RE.search(etag)
+        self.cache.put_many(int(match.group(1)) if match else None, etag, records)
+        return records
+
+    def _revalidate(self, course_id):
+        """Confirm the cached version, or replace it with a newer one"""
+        try:
+            self._fetch([course_id], self.cache.etag)
+        except ServiceUnavailable as exc:
+            logger.info("Serving cached course data unconfirmed: %s", exc)
+
+    def courses(self, ids):
+        """
+        ``{id: record}`` of the ``ids`` courses-svc knows. Ids it could not
+        be asked about are left out, like ids without a course.
+        """
+        ids = list(dict.fromkeys(ids))
+        found, missing = self.cache.get_many(ids)
+        if found and self.cache.needs_check():
+            self._revalidate(next(iter(found)))
+            # Entries of an older version are gone now
+            found, missing = self.cache.get_many(ids)
+        for start in range(0, len(missing), BATCH_SIZE):
+            try:
+                found.update(self._fetch(missing[start:start + BATCH_SIZE]))
+            except ServiceUnavailable as exc:
+                logger.info("Serving planned courses without course data: %s", exc)
+                break
+        return {course_id: record for course_id, record in found.items() if record is not None}
+
+
+def get_client():
+    """This process's client, built from settings on first use"""
+    with _lock:
+        if _state["client"] is None:
+            service = ServiceClient(
+                "courses",
+                getattr(settings, "COURSES_SERVICE_URL", DEFAULT_URL),
+                read_timeout=getattr(settings, "COURSES_SERVICE_TIMEOUT", DEFAULT_TIMEOUT),
+                breaker=CircuitBreaker("courses"),
+            )
+            cache = CourseCache(
+                getattr(settings, "COURSE_CACHE_SIZE", DEFAULT_CACHE_SIZE),
+                getattr(settings, "COURSE_CACHE_TTL", DEFAULT_CACHE_TTL),
+                getattr(settings, "COURSE_CACHE_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL),
+            )
+            _state["client"] = CoursesClient(service, cache)
+        return _state["client"]
+
+
+def enrich(rows):
+    """Planned course rows with the current code, name and ``course`` record where known"""
+    courses = get_client().courses(row["course_id"] for row in rows) if rows else {}
+    for row in rows:
+        course = courses.get(row["course_id"])
+        if course is not None:
+            row["course_code"] = course["code"]
+            row["course_name"] = course["name"]
+        row["course"] = course
+    return rows
+
+
+def clear():
+    with _lock:
+        if _state["client"] is not None:
+            _state["client"].service.close()
+        _state["client"] = None
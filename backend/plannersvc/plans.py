@@ -0,0 +1,137 @@
+"""
+Whole-plan updates for ``PUT /planned-courses/bulk/``.
+
+``update_plan`` reads a user's ``PlannedCourse`` rows (and, when asked to
+sync them, ``Semester`` rows) once, works out the plan the request wants,
+either given outright or as add/move/remove operations on the stored one,
+and writes only the difference: one ``DELETE``, one ``bulk_update`` and one
+``bulk_create`` per table, all in a single transaction.
+
+A plan holds a course once, as the single-course endpoints assume. Rows
+left over from before that (one course in several semesters) are merged
+into the row already in the wanted semester, or the first one.
+"""
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from plannersvc.models import PlannedCourse, Semester
+
+COURSE_FIELDS = ("semester", "course_code", "course_name")
+
+
+class PlanError(Exception):
+    """The requested plan cannot be applied to the stored one"""
+
+
+@dataclass
+class PlanChanges:
+    added: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    semesters_added: list = field(default_factory=list)
+    semesters_removed: list = field(default_factory=list)
+
+    @property
+    def changed(self):
+        return any((self.added, self.updated, self.removed, self.semesters_added, self.semesters_removed))
+
+
+def apply_operations(plan, operations):
+    """
+    The ``{course_id: values}`` plan after applying ``operations`` in order.
+    ``add`` of a planned course moves it, as a single-course POST does.
+    """
+    plan = {course_id: dict(values) for course_id, values in plan.items()}
+    for index, operation in enumerate(operations):
+        course_id = operation["course_id"]
+        if operation["op"] == "add":
+            values = plan.setdefault(course_id, {"course_code": "", "course_name": ""})
+            values.update(
+                (name, operation[name]) for name in COURSE_FIELDS if name in operation
+            )
+        elif course_id not in plan:
+            raise PlanError(f"Operation {index}: course {course_id} is not in the plan.")
+        elif operation["op"] == "move":
+            plan[course_id]["semester"] = operation["semester"]
+        else:
+            del plan[course_id]
+    return plan
+
+
+def _desired(stored, courses):
+    """``{course_id: values}`` for a whole plan, keeping stored code and name where left out"""
+    plan = {}
+    for course in courses:
+        current = stored.get(course["course_id"], {"course_code": "", "course_name": ""})
+        plan[course["course_id"]] = {name: course.get(name, current.get(name)) for name in COURSE_FIELDS}
+    return plan
+
+
+def update_plan(user, courses=None, operations=None, semesters=None):
+    """
+    Make ``user``'s plan match ``courses``, or the stored plan after
+    ``operations``, and their semester rows match ``semesters`` unless it is
+    None. Raises ``PlanError`` without writing if the result is invalid.
+    """
+    changes = PlanChanges()
+    with transaction.atomic():
+        rows = {}
+        duplicates = []
+        for pk, course_id, *values in (
+            PlannedCourse.objects.filter(user=user)
+            .order_by("pk")
+            .values_list("pk", "course_id", *COURSE_FIELDS)
+        ):
+            rows.setdefault(course_id, []).append((pk, dict(zip(COURSE_FIELDS, values))))
+        stored = {course_id: versions[0][1] for course_id, versions in rows.items()}
+
+        if operations is not None:
+            desired = apply_operations(stored, operations)
+        else:
+            desired = _desired(stored, courses)
+
+        if semesters is not None:
+            outside = sorted({values["semester"] for values in desired.values()} - set(semesters))
+            if outside:
+                raise PlanError(f"Semesters {outside} have courses but are not in the plan's semesters.")
+
+        new = []
+        changed = []
+        for course_id, values in desired.items():
+            versions = rows.get(course_id)
+            if not versions:
+                new.append(PlannedCourse(user=user, course_id=course_id, **values))
+                changes.added.append(course_id)
+                continue
+            # Keep the row already in the wanted semester so the merge moves nothing
+            keep = next(
+                (version for version in versions if version[1]["semester"] == values["semester"]), versions[0]
+            )
+            duplicates += [pk for pk, _ in versions if pk != keep[0]]
+            if keep[1] != values:
+                changed.append(PlannedCourse(pk=keep[0], user=user, course_id=course_id, **values))
+                changes.updated.append(course_id)
+        changes.removed = sorted(rows.keys() - desired.keys())
+        removed = duplicates + [pk for course_id in changes.removed for pk, _ in rows[course_id]]
+
+        # Deletes go first so moves and inserts never collide with a row on
+        # its way out on (user, course_id, semester)
+        if removed:
+            PlannedCourse.objects.filter(pk__in=removed).delete()
+        if changed:
+            PlannedCourse.objects.bulk_update(changed, COURSE_FIELDS)
+        if new:
+            PlannedCourse.objects.bulk_create(new)
+
+        if semesters is not None:
+            existing = set(Semester.objects.filter(user=user).values_list("semester_number", flat=True))
+            changes.semesters_added = sorted(set(semesters) - existing)
+            changes.semesters_removed = sorted(existing - set(semesters))
+            if changes.semesters_removed:
+                Semester.objects.filter(user=user, semester_number__in=changes.semesters_removed).delete()
+            if changes.semesters_added:
+                Semester.objects.bulk_create(
+                    Semester(user=user, semester_number=number) for number in changes.semesters_added
+                )
+    return changes
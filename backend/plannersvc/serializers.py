@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from backend.rows import RowMapper
 from plannersvc.models import PlannedCourse, Semester
 
 
@@ -14,3 +15,54 @@ class PlannedCourseSerializer(serializers.ModelSerializer):
     class Meta:
         model = PlannedCourse
         fields = ["id", "course_id", "course_code", "course_name", "semester"]
+
+
+# Fast path for bulk reads, same output as PlannedCourseSerializer
+PLANNED_COURSE_ROWS = RowMapper(PlannedCourse, PlannedCourseSerializer.Meta.fields)
+
+
+# Most courses, operations or semesters one bulk plan update may carry
+MAX_PLAN_COURSES = 200
+
+
+class PlanCourseSerializer(serializers.Serializer):
+    # Code and name may be left out for courses already in the plan
+    course_id = serializers.IntegerField(min_value=1)
+    semester = serializers.IntegerField(min_value=1)
+    course_code = serializers.CharField(max_length=32, required=False, allow_blank=True)
+    course_name = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+
+class PlanOperationSerializer(serializers.Serializer):
+    OPS = ("add", "move", "remove")
+
+    op = serializers.ChoiceField(choices=OPS)
+    course_id = serializers.IntegerField(min_value=1)
+    semester = serializers.IntegerField(min_value=1, required=False)
+    course_code = serializers.CharField(max_length=32, required=False, allow_blank=True)
+    course_name = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        if attrs["op"] != "remove" and "semester" not in attrs:
+            raise serializers.ValidationError({"semester": f"This field is required to {attrs['op']} a course."})
+        return attrs
+
+
+class BulkPlanSerializer(serializers.Serializer):
+    """Body of ``PUT /planned-courses/bulk/``: the whole plan, or operations on the stored one"""
+    courses = PlanCourseSerializer(many=True, required=False, max_length=MAX_PLAN_COURSES)
+    operations = PlanOperationSerializer(many=True, required=False, max_length=MAX_PLAN_COURSES)
+    # The semesters the plan should have; left out, semester rows are not touched
+    semesters = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, max_length=MAX_PLAN_COURSES
+    )
+
+    def validate(self, attrs):
+        if ("courses" in attrs) == ("operations" in attrs):
+            raise serializers.ValidationError("Pass exactly one of courses or operations.")
+        course_ids = [course["course_id"] for course in attrs.get("courses", ())]
+        if len(set(course_ids)) != len(course_ids):
+            raise serializers.ValidationError({"courses": ["A course may appear only once in a plan."]})
+        if len(set(attrs.get("semesters", ()))) != len(attrs.get("semesters", ())):
+            raise serializers.ValidationError({"semesters": ["Semesters must be unique."]})
+        return attrs
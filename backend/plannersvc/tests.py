@@ -0,0 +1,149 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.query_budget import QueryBudgetTestMixin
+from backend.service_client import ServiceUnavailable
+from plannersvc import courses_client
+from plannersvc.models import PlannedCourse, Semester
+
+
+# Course records come from courses-svc over HTTP, which issues no queries here
+@mock.patch.object(courses_client.CoursesClient, "courses", return_value={})
+class PlannerQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Every budgeted planner endpoint, on its most expensive path"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("student", "student@uq.edu.au", "password123")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.user)}"
+
+    def request(self, method, name, data=None, status=200):
+        response = getattr(self.client, method)(reverse(name), data, content_type="application/json")
+        self.assertEqual(response.status_code, status, getattr(response, "data", None))
+        self.assertWithinQueryBudget(response)
+        return response
+
+    def plan(self, count, semester=1):
+        PlannedCourse.objects.bulk_create(
+            PlannedCourse(user=self.user, course_id=n, course_code=f"COMP{n:04d}", course_name="", semester=semester)
+            for n in range(1, count + 1)
+        )
+
+    def test_semesters(self, courses):
+        # The first read creates the default semesters
+        self.assertEqual(len(self.request("get", "semesters").json()), 4)
+        self.request("get", "semesters")
+        self.plan(3, semester=4)
+        self.assertEqual(self.request("post", "semesters", status=201).json()["semester_number"], 5)
+        self.request("delete", "semesters", status=204)
+        # Semester 4 has courses
+        self.request("delete", "semesters", status=400)
+
+    def test_planned_courses(self, courses):
+        course = {"course_id": 1, "semester": 1, "course_code": "CSSE1001", "course_name": "Introduction to SE"}
+        self.request("post", "planned-courses", course, 201)
+        self.request("post", "planned-courses", {**course, "semester": 2}, 201)
+        self.request("patch", "planned-courses", {"course_id": 1, "semester": 3})
+        self.request("patch", "planned-courses", {"course_id": 9, "semester": 3}, 404)
+        self.request("delete", "planned-courses", {"course_id": 1}, 204)
+
+    def test_planned_courses_read_does_not_grow_with_the_plan(self, courses):
+        self.plan(2)
+        small = self.request("get", "planned-courses")
+        PlannedCourse.objects.all().delete()
+        self.plan(150)
+        large = self.request("get", "planned-courses")
+        self.assertEqual(len(large.json()), 150)
+        self.assertEqual(large.db_queries, small.db_queries)
+
+    def test_bulk_update(self, courses):
+        self.plan(40)
+        Semester.objects.bulk_create(Semester(user=self.user, semester_number=n) for n in (1, 2, 3))
+        # Adds, moves, renames and removes courses, and adds and removes semesters
+        plan = [
+            {"course_id": n, "semester": 1 + n % 4, "course_name": f"Course {n}"} for n in range(20, 80)
+        ]
+        response = self.request("put", "planned-courses-bulk", {"courses": plan, "semesters": [1, 2, 3, 4]})
+        self.assertEqual(len(response.json()["courses"]), 60)
+        self.assertEqual([row["semester_number"] for row in response.json()["semesters"]], [1, 2, 3, 4])
+
+        response = self.request("put", "planned-courses-bulk", {"operations": [
+            {"op": "add", "course_id": 100, "semester": 4},
+            {"op": "move", "course_id": 20, "semester": 2},
+            {"op": "remove", "course_id": 21},
+        ]})
+        self.assertEqual(len(response.json()["courses"]), 60)
+
+
+class FakeCoursesService:
+    """courses-svc's CourseBatch at catalog ``version``, answering If-None-Match with 304"""
+
+    def __init__(self):
+        self.version = 1
+        self.names = {}
+        self.requests = []
+        self.down = False
+
+    def get(self, path, params=None, headers=None):
+        if self.down:
+            raise ServiceUnavailable("courses-svc is down")
+        ids = [int(course_id) for course_id in params["ids"].split(",")]
+        self.requests.append((ids, (headers or {}).get("If-None-Match")))
+        etag = f'"catalog-{self.version}.7"'
+        response = mock.Mock(headers={"ETag": etag})
+        if headers and headers.get("If-None-Match") == etag:
+            response.status_code = 304
+        else:
+            response.status_code = 200
+            response.json.return_value = {"results": [
+                {"id": course_id, "code": f"COMP{course_id:04d}", "name": self.names.get(course_id, "Course")}
+                for course_id in ids if course_id < 100
+            ]}
+        return response
+
+
+class CoursesClientTests(SimpleTestCase):
+    def setUp(self):
+        self.service = FakeCoursesService()
+        self.client = courses_client.CoursesClient(
+            self.service, courses_client.CourseCache(maxsize=100, ttl=300, check_interval=0)
+        )
+
+    def test_cached_records_are_confirmed_with_a_conditional_request(self):
+        self.assertEqual(set(self.client.courses([1, 2, 3, 100])), {1, 2, 3})
+        self.assertEqual(self.service.requests, [([1, 2, 3, 100], None)])
+
+        self.assertEqual(set(self.client.courses([1, 2, 3, 100])), {1, 2, 3})
+        self.assertEqual(self.service.requests[1:], [([1], '"catalog-1.7"')])
+
+    def test_newer_version_replaces_every_cached_record(self):
+        self.client.courses([1, 2, 3])
+        self.service.version = 2
+        self.service.names[2] = "Renamed"
+        courses = self.client.courses([1, 2])
+        self.assertEqual(courses[2]["name"], "Renamed")
+        # The conditional request for course 1 came back with version 2, so
+        # only course 2 had to be fetched again
+        self.assertEqual(self.service.requests[1:], [([1], '"catalog-1.7"'), ([2], None)])
+        self.assertEqual(self.client.cache.get_many([3]), ({}, [3]))
+
+    def test_checks_wait_for_the_interval(self):
+        self.client.cache.check_interval = 60
+        self.client.courses([1])
+        self.client.courses([1])
+        self.assertEqual(len(self.service.requests), 1)
+
+    def test_cached_records_are_served_while_courses_svc_is_down(self):
+        self.client.courses([1])
+        self.service.down = True
+        self.assertEqual(set(self.client.courses([1, 2])), {1})
+
+    def test_older_response_is_not_cached(self):
+        cache = self.client.cache
+        cache.put_many(5, '"catalog-5.0"', {1: {"id": 1}})
+        cache.put_many(4, '"catalog-4.0"', {2: {"id": 2}})
+        self.assertEqual(cache.get_many([1, 2]), ({1: {"id": 1}}, [2]))
+        self.assertEqual(cache.etag, '"catalog-5.0"')
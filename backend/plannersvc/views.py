@@ -1,11 +1,13 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from django.db import models
+from django.db import IntegrityError, models
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from backend.query_budget import query_budget
+from plannersvc import courses_client, plans
 from plannersvc.models import PlannedCourse, Semester
-from .serializers import PlannedCourseSerializer, SemesterSerializer
+from .serializers import BulkPlanSerializer, PLANNED_COURSE_ROWS, PlannedCourseSerializer, SemesterSerializer
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -19,19 +21,22 @@ class HealthCheck(APIView):
 class SemestersView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @query_budget(4)
     def get(self, request):
         """Get all semesters for the user"""
-        semesters = Semester.objects.filter(user=request.user)
+        semesters = list(Semester.objects.filter(user=request.user))
         
         # If no semesters exist, create default ones (1-4)
-        if not semesters.exists():
-            for i in range(1, 5):
-                Semester.objects.create(user=request.user, semester_number=i)
+        if not semesters:
+            Semester.objects.bulk_create(
+                Semester(user=request.user, semester_number=i) for i in range(1, 5)
+            )
             semesters = Semester.objects.filter(user=request.user)
         
         data = SemesterSerializer(semesters, many=True).data
         return Response(data)
 
+    @query_budget(4)
     def post(self, request):
         """Add a new semester"""
         # Get the highest semester number from both Semester model and PlannedCourse
@@ -57,6 +62,7 @@ class SemestersView(APIView):
             status=status.HTTP_201_CREATED
         )
 
+    @query_budget(4)
     def delete(self, request):
         """Delete the latest semester if it has no courses"""
         # Get the highest semester number for this user
@@ -87,15 +93,17 @@ class SemestersView(APIView):
 class PlannedCoursesView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    # Course records come from courses-svc, or its cache, not the database
+    @query_budget(2)
     def get(self, request):
         qs = PlannedCourse.objects.filter(user=request.user)
-        data = PlannedCourseSerializer(qs, many=True).data
-        return Response(data)
+        return Response(courses_client.enrich(PLANNED_COURSE_ROWS.rows(qs)))
 
+    @query_budget(4)
     def post(self, request):
         serializer = PlannedCourseSerializer(data=request.data)
         if serializer.is_valid():
-            PlannedCourse.objects.update_or_create(
+            planned_course, _ = PlannedCourse.objects.update_or_create(
                 user=request.user,
                 course_id=serializer.validated_data["course_id"],
                 defaults={
@@ -104,16 +112,13 @@ class PlannedCoursesView(APIView):
                     "course_name": serializer.validated_data.get("course_name", ""),
                 },
             )
-            qs = PlannedCourse.objects.filter(
-                user=request.user, 
-                course_id=serializer.validated_data["course_id"]
-            )
             return Response(
-                PlannedCourseSerializer(qs.first()).data, 
+                PlannedCourseSerializer(planned_course).data, 
                 status=status.HTTP_201_CREATED
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @query_budget(3)
     def patch(self, request):
         # Update semester for an existing planned course
         course_id = request.data.get("course_id")
@@ -134,6 +139,7 @@ class PlannedCoursesView(APIView):
         pc.save()
         return Response(PlannedCourseSerializer(pc).data)
 
+    @query_budget(2)
     def delete(self, request):
         course_id = request.data.get("course_id")
         if not course_id:
@@ -148,3 +154,29 @@ class PlannedCoursesView(APIView):
         if deleted == 0:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PlannedCoursesBulkView(APIView):
+    """Replace the whole plan, or apply a list of operations to it, in one transaction"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    # User, plan and semester reads, a delete, update and insert per table,
+    # then the plan and semesters as stored
+    @query_budget(10)
+    def put(self, request):
+        serializer = BulkPlanSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            plans.update_plan(request.user, **serializer.validated_data)
+        except plans.PlanError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            return Response(
+                {"detail": "The plan was changed by another request. Reload it and try again."},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response({
+            "courses": courses_client.enrich(PLANNED_COURSE_ROWS.rows(PlannedCourse.objects.filter(user=request.user))),
+            "semesters": SemesterSerializer(Semester.objects.filter(user=request.user), many=True).data,
+        })
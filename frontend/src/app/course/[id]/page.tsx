@@ -33,6 +33,9 @@ type Assessment = {
   hurdle_description?: string | null;
 };
 
+// Newest reviews shown on the page
+const REVIEWS_SHOWN = 4;
+
 type ReviewItem = {
   id: number;
   review: number;            // 1–5
@@ -142,7 +145,7 @@ export default function CourseProfilePage() {
         const c = await fetchCourseDetails(courseId);
         setCourse(c);
         try {
-          setReviews(await fetchCourseReviews(courseId));
+          setReviews((await fetchCourseReviews(courseId, { limit: REVIEWS_SHOWN })).results);
         } catch (e) {
           console.warn("reviews fetch failed", e);
         }
@@ -161,10 +164,10 @@ export default function CourseProfilePage() {
       setSubmittingReview(true);
       await submitCourseReview(courseId, reviewRating, reviewDescription);
       const [updatedReviews, updatedCourse] = await Promise.all([
-        fetchCourseReviews(courseId),
+        fetchCourseReviews(courseId, { limit: REVIEWS_SHOWN }),
         fetchCourseDetails(courseId),
       ]);
-      setReviews(updatedReviews);
+      setReviews(updatedReviews.results);
       setCourse(updatedCourse);
       setReviewDialogOpen(false);
       setReviewDescription("");
@@ -434,7 +437,7 @@ export default function CourseProfilePage() {
               <CardContent className="space-y-4">
                 {reviews.length > 0 ? (
                   <>
-                    {reviews.slice(0, 4).map((r) => (
+                    {reviews.map((r) => (
                       <div key={r.id} className="rounded-md border p-3">
                          <div className="mb-1 flex items-center justify-between">
                            <div className="flex items-center gap-2">
@@ -448,8 +451,8 @@ export default function CourseProfilePage() {
                         )}
                       </div>
                     ))}
-                    {reviews.length > 4 && (
-                      <p className="text-xs text-muted-foreground">+{reviews.length - 4} more review(s)</p>
+                    {course.total_reviews > reviews.length && (
+                      <p className="text-xs text-muted-foreground">+{course.total_reviews - reviews.length} more review(s)</p>
                     )}
                   </>
                 ) : (
@@ -10,7 +10,7 @@ import SearchBar from "@/components/SearchBar";
 import CourseFilters from "@/components/CourseFilters";
 import CourseCard from "@/components/CourseCard";
 import DegreePlanner from "@/components/DegreePlanner";
-import { fetchCourses, getSemesters, getArea, getAssessment, fetchPlannedCourses, addOrUpdatePlannedCourse, updatePlannedCourseSemester, deletePlannedCourse, fetchSemesters, addSemester, deleteSemester } from "@/lib/api";
+import { fetchCourses, searchCourses, getSemesters, getArea, getAssessment, fetchCourseBatch, CourseQuery, fetchPlannedCourses, addOrUpdatePlannedCourse, updatePlannedCourseSemester, deletePlannedCourse, fetchSemesters, addSemester, deleteSemester } from "@/lib/api";
 import { Course, PlannedCourse } from "@/types/course";
 import { useToast } from "@/hooks/use-toast";
 
@@ -25,7 +25,10 @@ const Index = () => {
   const [pendingCourse, setPendingCourse] = useState<Course | null>(null);
   const [activeTab, setActiveTab] = useState("catalog");
   const [courses, setCourses] = useState<Course[]>([]);
+  const [searchResults, setSearchResults] = useState<Course[] | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const { toast } = useToast();
 
@@ -53,54 +56,25 @@ const Index = () => {
 
   const [availableSemesters, setAvailableSemesters] = useState<string[]>([]);
 
-  // Fetch courses and user planned courses on mount
+  // Translate the filter dropdowns into server-side query parameters
+  const buildCourseQuery = (): CourseQuery => ({
+    assessment_type: assessmentFilter === "all" ? undefined : assessmentFilter,
+    level: levelFilter === "all" ? undefined : levelFilter,
+    study_area: areaFilter === "all" ? undefined : areaFilter,
+    offered_sem_1: semesterFilter === "Semester 1" ? true : undefined,
+    offered_sem_2: semesterFilter === "Semester 2" ? true : undefined,
+    offered_summer: semesterFilter === "Summer Semester" ? true : undefined,
+  });
+
+  // Fetch the first page of courses whenever the filters change
   useEffect(() => {
-    const load = async () => {
+    const loadCourses = async () => {
       try {
         setLoading(true);
         setError(null);
-        const fetchedCourses = await fetchCourses();
-        setCourses(fetchedCourses);
-        const token = typeof globalThis !== "undefined" && (globalThis as any).localStorage ? localStorage.getItem("accessToken") : null;
-        if (token) {
-          try {
-            // Fetch semesters (backend will auto-create 1-4 if none exist)
-            const semestersData = await fetchSemesters();
-            const semesterStrings = semestersData.map(s => `Semester ${s.semester_number}`);
-            setAvailableSemesters(semesterStrings);
-            
-            // Fetch planned courses
-            const pcs = await fetchPlannedCourses();
-            const transformed = await Promise.all(
-              pcs.map(async (pc) => {
-                // Find the full course data from the courses list
-                const course = fetchedCourses.find(c => c.id === pc.course_id);
-                if (course) {
-                  return { ...course, plannedSemester: `Semester ${pc.semester}` } as PlannedCourse;
-                }
-                // If not found in current list, create minimal course object
-                return {
-                  id: pc.course_id,
-                  code: pc.course_code,
-                  name: pc.course_name,
-                  plannedSemester: `Semester ${pc.semester}`,
-                } as PlannedCourse;
-              })
-            );
-            setPlannedCourses(transformed.filter(Boolean));
-          } catch (err: any) {
-            console.error("Error loading planner data:", err);
-            if (err.message === "unauthorized") {
-              handleUnauthorized();
-            } else {
-              // Show default semesters if error
-              setAvailableSemesters(["Semester 1", "Semester 2", "Semester 3", "Semester 4"]);
-            }
-          }
-        } else {
-          // Not logged in, show default semesters
-          setAvailableSemesters(["Semester 1", "Semester 2", "Semester 3", "Semester 4"]);
-        }
+        const page = await fetchCourses(buildCourseQuery());
+        setCourses(page.courses);
+        setNextCursor(page.nextCursor);
       } catch (err) {
         setError("Failed to load courses. Please try again later.");
         console.error("Error fetching courses:", err);
@@ -108,25 +82,97 @@ const Index = () => {
         setLoading(false);
       }
     };
+    loadCourses();
+  }, [assessmentFilter, levelFilter, areaFilter, semesterFilter]);
+
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchCourses({ ...buildCourseQuery(), cursor: nextCursor });
+      setCourses([...courses, ...page.courses]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error("Error fetching more courses:", err);
+      toast({ title: "Failed to load more courses", description: "Please try again.", variant: "destructive" });
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Fetch user planned courses on mount
+  useEffect(() => {
+    const load = async () => {
+      const token = typeof globalThis !== "undefined" && (globalThis as any).localStorage ? localStorage.getItem("accessToken") : null;
+      if (token) {
+        try {
+          // Fetch semesters (backend will auto-create 1-4 if none exist)
+          const semestersData = await fetchSemesters();
+          const semesterStrings = semestersData.map(s => `Semester ${s.semester_number}`);
+          setAvailableSemesters(semesterStrings);
+          
+          // Fetch planned courses
+          const pcs = await fetchPlannedCourses();
+          const { courses } = await fetchCourseBatch(pcs.map((pc) => pc.course_id)).catch(() => ({ courses: [] as Course[] }));
+          const byId = new Map(courses.map((course) => [course.id, course]));
+          const transformed = pcs.map((pc) => {
+            const course = byId.get(pc.course_id);
+            if (course) {
+              return { ...course, plannedSemester: `Semester ${pc.semester}` } as PlannedCourse;
+            }
+            // If the course can no longer be fetched, create minimal course object
+            return {
+              id: pc.course_id,
+              code: pc.course_code,
+              name: pc.course_name,
+              plannedSemester: `Semester ${pc.semester}`,
+            } as PlannedCourse;
+          });
+          setPlannedCourses(transformed);
+        } catch (err: any) {
+          console.error("Error loading planner data:", err);
+          if (err.message === "unauthorized") {
+            handleUnauthorized();
+          } else {
+            // Show default semesters if error
+            setAvailableSemesters(["Semester 1", "Semester 2", "Semester 3", "Semester 4"]);
+          }
+        }
+      } else {
+        // Not logged in, show default semesters
+        setAvailableSemesters(["Semester 1", "Semester 2", "Semester 3", "Semester 4"]);
+      }
+    };
     load();
   }, []);
 
-  const filteredCourses = courses.filter((course) => {
-    const matchesSearch =
-      course.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-      course.code.toLowerCase().includes(searchQuery.toLowerCase());
-    
+  // Run ranked full-text search on the server once the user stops typing
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!query) {
+      setSearchResults(null);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        setSearchResults(await searchCourses(query));
+      } catch (err) {
+        console.error("Error searching courses:", err);
+      }
+    }, 250);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  // The catalog pages are filtered by the server; search results (a short
+  // ranked list) are narrowed by the same dropdowns here
+  const filteredCourses = searchResults === null ? courses : searchResults.filter((course) => {
     const matchesAssessment =
       assessmentFilter === "all" || getAssessment(course) === assessmentFilter;
-    
     const matchesLevel = levelFilter === "all" || course.level.toString() === levelFilter;
-    
     const matchesArea = areaFilter === "all" || getArea(course) === areaFilter;
-    
     const matchesSemester =
       semesterFilter === "all" || getSemesters(course).includes(semesterFilter as "Semester 1" | "Semester 2" | "Summer Semester");
-
-    return matchesSearch && matchesAssessment && matchesLevel && matchesArea && matchesSemester;
+    return matchesAssessment && matchesLevel && matchesArea && matchesSemester;
   });
 
   const handleAddCourse = (course: Course) => {
@@ -344,6 +390,15 @@ const Index = () => {
                     ))}
                   </div>
 
+                  {nextCursor && searchResults === null && (
+                    <div className="flex justify-center mt-8">
+                      <Button variant="outline" onClick={handleLoadMore} disabled={loadingMore}>
+                        {loadingMore && <Loader2 className="h-4 w-4 mr-2 animate-spin" />}
+                        Load more courses
+                      </Button>
+                    </div>
+                  )}
+
                   {filteredCourses.length === 0 && (
                     <div className="text-center py-12">
                       <p className="text-lg text-muted-foreground">
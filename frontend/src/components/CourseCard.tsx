@@ -1,6 +1,6 @@
 "use client";
 
-import { Plus, BookOpen, Award, Calendar } from "lucide-react";
+import { Plus, BookOpen, Award, Calendar, Star } from "lucide-react";
 import Link from "next/link";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card";
@@ -39,7 +39,9 @@ const CourseCard = ({ course, onAdd, isAdded }: CourseCardProps) => {
           <CardTitle className="text-xl group-hover:text-primary transition-colors">
             {course.name}
           </CardTitle>
-          <CardDescription className="line-clamp-2">{course.description}</CardDescription>
+          {course.description && (
+            <CardDescription className="line-clamp-2">{course.description}</CardDescription>
+          )}
         </CardHeader>
         
         <CardContent className="space-y-3">
@@ -58,6 +60,13 @@ const CourseCard = ({ course, onAdd, isAdded }: CourseCardProps) => {
             <span>{getSemesters(course).join(", ")}</span>
           </div>
 
+          {!!course.total_reviews && (
+            <div className="flex items-center gap-2 text-sm text-muted-foreground">
+              <Star className="h-4 w-4 text-yellow-400 fill-current" />
+              <span>{course.average_rating?.toFixed(1)} ({course.total_reviews} {course.total_reviews === 1 ? "review" : "reviews"})</span>
+            </div>
+          )}
+
           {course.prerequisites && course.prerequisites.length > 0 && (
             <div className="pt-2 border-t border-border">
               <p className="text-xs text-muted-foreground">
@@ -10,7 +10,7 @@ import {
   SelectTrigger,
   SelectValue,
 } from "@/components/ui/select";
-import { fetchAssessmentTypes, fetchStudyAreas, DropdownOption } from "@/lib/api";
+import { fetchBootstrap, DropdownOption } from "@/lib/api";
 
 interface CourseFiltersProps {
   assessment: string;
@@ -37,18 +37,18 @@ const CourseFilters = ({
 }: CourseFiltersProps) => {
   const [assessmentTypes, setAssessmentTypes] = useState<DropdownOption[]>([]);
   const [studyAreas, setStudyAreas] = useState<DropdownOption[]>([]);
+  const [courseLevels, setCourseLevels] = useState<number[]>([1, 2, 3, 4, 5, 6, 7]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     const loadDropdownData = async () => {
       try {
         setLoading(true);
-        const [assessmentData, studyAreaData] = await Promise.all([
-          fetchAssessmentTypes(),
-          fetchStudyAreas()
-        ]);
-        setAssessmentTypes(assessmentData);
-        setStudyAreas(studyAreaData);
+        const bootstrap = await fetchBootstrap();
+        setAssessmentTypes(bootstrap.assessment_types);
+        setStudyAreas(bootstrap.study_areas);
+        const { min, max } = bootstrap.course_levels;
+        setCourseLevels(Array.from({ length: max - min + 1 }, (_, i) => min + i));
       } catch (error) {
         console.error("Failed to load dropdown data:", error);
       } finally {
@@ -92,13 +92,11 @@ const CourseFilters = ({
             </SelectTrigger>
             <SelectContent>
               <SelectItem value="all">All Levels</SelectItem>
-              <SelectItem value="1">Level 1</SelectItem>
-              <SelectItem value="2">Level 2</SelectItem>
-              <SelectItem value="3">Level 3</SelectItem>
-              <SelectItem value="4">Level 4</SelectItem>
-              <SelectItem value="5">Level 5</SelectItem>
-              <SelectItem value="6">Level 6</SelectItem>
-              <SelectItem value="7">Level 7</SelectItem>
+              {courseLevels.map((courseLevel) => (
+                <SelectItem key={courseLevel} value={String(courseLevel)}>
+                  Level {courseLevel}
+                </SelectItem>
+              ))}
             </SelectContent>
           </Select>
         </div>
@@ -38,9 +38,11 @@ export function transformApiCourse(apiCourse: ApiCourse): Course {
     offered_sem_1: apiCourse.offered_sem_1,
     offered_sem_2: apiCourse.offered_sem_2,
     offered_summer: apiCourse.offered_summer,
-    description: apiCourse.description,
-    aim: apiCourse.aim,
-    prerequisites: apiCourse.prerequisites
+    description: apiCourse.description ?? "",
+    aim: apiCourse.aim ?? "",
+    prerequisites: apiCourse.prerequisites,
+    average_rating: apiCourse.average_rating,
+    total_reviews: apiCourse.total_reviews
   };
 }
 
@@ -63,22 +65,76 @@ export function getAssessment(course: Course): AssessmentType {
   return course.assessment_type;
 }
 
-export async function fetchCourses(): Promise<Course[]> {
+export interface CourseQuery {
+  study_area?: string;
+  level?: string;
+  credits?: string;
+  assessment_type?: string;
+  offered_sem_1?: boolean;
+  offered_sem_2?: boolean;
+  offered_summer?: boolean;
+  code_prefix?: string;
+  // Assessment mix; weights and shares are percentages
+  max_exam_weight?: number;
+  max_exam_share?: number;
+  max_hurdles?: number;
+  min_pass_fail_share?: number;
+  max_pass_fail_share?: number;
+  min_tasks?: number;
+  max_tasks?: number;
+  cursor?: string | null;
+  limit?: number;
+}
+
+export interface CoursePage {
+  courses: Course[];
+  nextCursor: string | null;
+}
+
+export async function fetchCourses(query: CourseQuery = {}): Promise<CoursePage> {
   try {
-    const response = await fetch(`${API_BASE_URL}/courses/`);
+    const params = new URLSearchParams();
+    Object.entries(query).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== "") params.set(key, String(value));
+    });
+    const queryString = params.toString();
+    const response = await fetch(`${API_BASE_URL}/courses/${queryString ? `?${queryString}` : ''}`);
     
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
     
-    const apiCourses: ApiCourse[] = await response.json();
-    return apiCourses.map(transformApiCourse);
+    const data: { results: ApiCourse[]; next_cursor: string | null } = await response.json();
+    return { courses: data.results.map(transformApiCourse), nextCursor: data.next_cursor };
   } catch (error) {
     console.error("Failed to fetch courses:", error);
     throw error;
   }
 }
 
+export async function searchCourses(q: string, limit = 50): Promise<Course[]> {
+  const params = new URLSearchParams({ q, limit: String(limit) });
+  const res = await fetch(`${API_BASE_URL}/courses/search/?${params.toString()}`);
+  if (!res.ok) throw new Error(`Search courses failed: ${res.status}`);
+  const data: { results: ApiCourse[] } = await res.json();
+  return data.results.map(transformApiCourse);
+}
+
+export interface CourseBatch {
+  courses: Course[];
+  missing: number[];
+}
+
+// Full course cards for specific courses in one request
+export async function fetchCourseBatch(ids: number[]): Promise<CourseBatch> {
+  if (ids.length === 0) return { courses: [], missing: [] };
+  const params = new URLSearchParams({ ids: ids.join(","), include: "text,prerequisites,ratings" });
+  const res = await fetch(`${API_BASE_URL}/courses/batch/?${params.toString()}`);
+  if (!res.ok) throw new Error(`Fetch course batch failed: ${res.status}`);
+  const data: { results: ApiCourse[]; missing: number[] } = await res.json();
+  return { courses: data.results.map(transformApiCourse), missing: data.missing };
+}
+
 export async function fetchCourseDetails(courseId: number): Promise<any> {
   try {
     const response = await fetch(`${API_BASE_URL}/courses/${courseId}/`);
@@ -99,15 +155,93 @@ export interface DropdownOption {
   label: string;
 }
 
+// ===== Bootstrap bundle =====
+export interface NumberRange {
+  min: number;
+  max: number;
+}
+
+export interface CatalogBootstrap {
+  assessment_types: DropdownOption[];
+  study_areas: DropdownOption[];
+  program_levels: DropdownOption[];
+  course_levels: NumberRange;
+  course_credits: NumberRange;
+  programs_version: number;
+}
+
+const BOOTSTRAP_POINTER = `${API_BASE_URL}/catalog/bootstrap/`;
+const BOOTSTRAP_URL_KEY = "catalogBootstrapUrl";
+const BOOTSTRAP_CHECKED_KEY = "catalogBootstrapCheckedAt";
+// How long the pointer's answer holds, as the server's BOOTSTRAP_MAX_AGE
+const BOOTSTRAP_MAX_AGE_MS = 5 * 60 * 1000;
+
+function storage(): Storage | null {
+  return typeof globalThis !== "undefined" && (globalThis as any).localStorage ? localStorage : null;
+}
+
+async function loadBootstrap(url: string): Promise<Response> {
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`Bootstrap failed: ${res.status}`);
+  // The final, content-hashed URL after the redirect
+  storage()?.setItem(BOOTSTRAP_URL_KEY, res.url);
+  if (url === BOOTSTRAP_POINTER) storage()?.setItem(BOOTSTRAP_CHECKED_KEY, String(Date.now()));
+  return res;
+}
+
+function bootstrapIsFresh(): boolean {
+  const checkedAt = Number(storage()?.getItem(BOOTSTRAP_CHECKED_KEY));
+  return checkedAt > 0 && Date.now() - checkedAt < BOOTSTRAP_MAX_AGE_MS;
+}
+
+let bootstrapPromise: Promise<CatalogBootstrap> | null = null;
+let revalidation: Promise<void> | null = null;
+
+// Ask the pointer for the current bundle, and serve that from now on
+function revalidateBootstrap(): Promise<void> {
+  if (!revalidation) {
+    revalidation = loadBootstrap(BOOTSTRAP_POINTER)
+      .then((res) => res.json())
+      .then((bundle: CatalogBootstrap) => { bootstrapPromise = Promise.resolve(bundle); })
+      .catch(() => { storage()?.removeItem(BOOTSTRAP_URL_KEY); })
+      .finally(() => { revalidation = null; });
+  }
+  return revalidation;
+}
+
+// Static catalog metadata, fetched once per page load. The bundle lives at an
+// immutable content-hashed URL, so a repeat visit reads it from the browser
+// cache. The pointer to it is asked again only once the stored answer is
+// older than its max-age, or when an API response shows a newer version.
+export function fetchBootstrap(): Promise<CatalogBootstrap> {
+  if (!bootstrapPromise) {
+    const known = storage()?.getItem(BOOTSTRAP_URL_KEY);
+    const stale = !bootstrapIsFresh();
+    const load = known
+      ? loadBootstrap(known).then((res) => {
+          if (stale) revalidateBootstrap();
+          return res;
+        }, () => loadBootstrap(BOOTSTRAP_POINTER))
+      : loadBootstrap(BOOTSTRAP_POINTER);
+    bootstrapPromise = load.then((res) => res.json());
+    bootstrapPromise.catch(() => { bootstrapPromise = null; });
+  }
+  return bootstrapPromise;
+}
+
+// Revalidate the bundle when a "programs-<version>" ETag is newer than it
+function noteProgramsVersion(res: Response) {
+  const match = /programs-(\d+)/.exec(res.headers.get("ETag") ?? "");
+  if (!match || !bootstrapPromise) return;
+  const version = Number(match[1]);
+  bootstrapPromise.then((bundle) => {
+    if (version > bundle.programs_version) revalidateBootstrap();
+  }, () => {});
+}
+
 export async function fetchAssessmentTypes(): Promise<DropdownOption[]> {
   try {
-    const response = await fetch(`${API_BASE_URL}/catalog/assessment-types/`);
-    
-    if (!response.ok) {
-      throw new Error(`HTTP error! status: ${response.status}`);
-    }
-    
-    return await response.json();
+    return (await fetchBootstrap()).assessment_types;
   } catch (error) {
     console.error("Failed to fetch assessment types:", error);
     throw error;
@@ -116,13 +250,7 @@ export async function fetchAssessmentTypes(): Promise<DropdownOption[]> {
 
 export async function fetchStudyAreas(): Promise<DropdownOption[]> {
   try {
-    const response = await fetch(`${API_BASE_URL}/catalog/study-areas/`);
-    
-    if (!response.ok) {
-      throw new Error(`HTTP error! status: ${response.status}`);
-    }
-    
-    return await response.json();
+    return (await fetchBootstrap()).study_areas;
   } catch (error) {
     console.error("Failed to fetch study areas:", error);
     throw error;
@@ -169,11 +297,7 @@ export async function me() {
 }
 
 export async function fetchProgramLevels(): Promise<DropdownOption[]> {
-  const res = await fetch(`${API_BASE_URL}/catalog/program-levels/`);
-  console.log(API_BASE_URL);
-  if (!res.ok) throw new Error(`Program levels failed: ${res.status}`);
-  console.log(res.json);
-  return res.json();
+  return (await fetchBootstrap()).program_levels;
 }
 
 export interface ProgramOption extends DropdownOption { id: number; }
@@ -186,8 +310,10 @@ export async function fetchPrograms(level?: string, search?: string): Promise<Pr
   const url = `${API_BASE_URL}/catalog/programs/${queryString ? `?${queryString}` : ''}`;
   const res = await fetch(url);
   if (!res.ok) throw new Error(`Programs failed: ${res.status}`);
-  const data = await res.json();
-  return data.map((p: any) => ({ id: p.id, value: String(p.id), label: `${p.name} (${p.level_label})` }));
+  noteProgramsVersion(res);
+  // Ranked typeahead matches; the first page is enough for the picker
+  const data: { results: any[]; next_cursor: string | null } = await res.json();
+  return data.results.map((p: any) => ({ id: p.id, value: String(p.id), label: `${p.name} (${p.level_label})` }));
 }
 
 // ===== Planned courses =====
@@ -197,6 +323,20 @@ export interface PlannedCourseDTO {
   course_code: string;
   course_name: string;
   semester: number;
+  // The catalog record, or null when the courses service could not be reached
+  course: {
+    id: number;
+    code: string;
+    name: string;
+    level: number;
+    credits: number;
+    study_area: string | null;
+    assessment_type: string | null;
+    offered_sem_1: boolean;
+    offered_sem_2: boolean;
+    offered_summer: boolean;
+    prerequisites: string[];
+  } | null;
 }
 
 export async function fetchPlannedCourses(): Promise<PlannedCourseDTO[]> {
@@ -250,6 +390,64 @@ export async function deletePlannedCourse(courseId: number) {
   if (!res.ok && res.status !== 204) throw new Error(`Delete planned course failed: ${res.status}`);
 }
 
+export type PlanOperation =
+  | { op: "add"; course_id: number; semester: number; course_code?: string; course_name?: string }
+  | { op: "move"; course_id: number; semester: number }
+  | { op: "remove"; course_id: number };
+
+export interface PlanUpdate {
+  // Exactly one of courses (the whole plan) or operations (on the stored plan)
+  courses?: { course_id: number; semester: number; course_code?: string; course_name?: string }[];
+  operations?: PlanOperation[];
+  // The semesters the plan should have; left out, they are not changed
+  semesters?: number[];
+}
+
+// Apply many plan changes in one request and one transaction
+export async function savePlan(update: PlanUpdate): Promise<{ courses: PlannedCourseDTO[]; semesters: SemesterDTO[] }> {
+  const res = await fetch(`${API_BASE_URL}/planned-courses/bulk/`, {
+    method: "PUT",
+    headers: { "Content-Type": "application/json", ...authHeaders() },
+    body: JSON.stringify(update),
+  });
+  if (res.status === 401) throw new Error("unauthorized");
+  if (res.status === 400 || res.status === 409) {
+    const data = await res.json();
+    throw new Error(data.detail || "Invalid plan");
+  }
+  if (!res.ok) throw new Error(`Save plan failed: ${res.status}`);
+  return res.json();
+}
+
+export interface PlanViolation {
+  rule: "unknown_course" | "prerequisite" | "offering" | "credit_load";
+  semester: number;
+  course_id: number | null;
+  code: string | null;
+  detail: string;
+}
+
+export interface PlanValidation {
+  valid: boolean;
+  year_intake: "SEM1" | "SEM2";
+  semesters: { semester: number; type: "SEM1" | "SEM2"; credits: number }[];
+  violations: PlanViolation[];
+}
+
+// Check the whole plan's prerequisites, offerings and credit loads at once
+export async function validatePlan(
+  courses: { course_id: number; semester: number }[],
+  yearIntake?: "SEM1" | "SEM2"
+): Promise<PlanValidation> {
+  const res = await fetch(`${API_BASE_URL}/courses/plan/validate/`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", ...authHeaders() },
+    body: JSON.stringify(yearIntake ? { courses, year_intake: yearIntake } : { courses }),
+  });
+  if (!res.ok) throw new Error(`Validate plan failed: ${res.status}`);
+  return res.json();
+}
+
 // ===== Semesters =====
 export interface SemesterDTO {
   id: number;
@@ -298,8 +496,23 @@ export interface CourseReview {
   user: string;
 }
 
-export async function fetchCourseReviews(courseId: number): Promise<CourseReview[]> {
-  const res = await fetch(`${API_BASE_URL}/courses/${courseId}/reviews/`, {
+export interface CourseReviewPage {
+  results: CourseReview[];
+  next_cursor: string | null;
+}
+
+export type ReviewSort = "newest" | "highest" | "lowest";
+
+export async function fetchCourseReviews(
+  courseId: number,
+  opts: { sort?: ReviewSort; cursor?: string | null; limit?: number } = {}
+): Promise<CourseReviewPage> {
+  const params = new URLSearchParams();
+  if (opts.sort) params.set("sort", opts.sort);
+  if (opts.cursor) params.set("cursor", opts.cursor);
+  if (opts.limit) params.set("limit", String(opts.limit));
+  const query = params.toString();
+  const res = await fetch(`${API_BASE_URL}/courses/${courseId}/reviews/${query ? `?${query}` : ""}`, {
     headers: { ...authHeaders() },
   });
   if (res.status === 401) throw new Error("unauthorized");
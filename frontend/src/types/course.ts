@@ -17,6 +17,8 @@ export interface Course {
   description: string;
   aim: string;
   prerequisites: string[];
+  average_rating?: number;
+  total_reviews?: number;
 }
 
 // API response type
@@ -26,14 +28,17 @@ export interface ApiCourse {
   code: string;
   level: number;
   credits: number;
-  aim: string;
+  // Only present when requested (?fields=full or include=text)
+  aim?: string;
   assessment_type: string;
   study_area: string;
   offered_sem_1: boolean;
   offered_sem_2: boolean;
   offered_summer: boolean;
-  description: string;
+  description?: string;
   prerequisites: string[];
+  average_rating?: number;
+  total_reviews?: number;
 }
 
 export interface PlannedCourse extends Course {